@@ -0,0 +1,31 @@
+"""add_workflow_run_progress
+
+Revision ID: 2a7c9e4b6d31
+Revises: 7e1f3a9c5d28
+Create Date: 2026-10-18 16:02:44.731905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "2a7c9e4b6d31"
+down_revision: Union[str, None] = "7e1f3a9c5d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workflow_runs",
+        sa.Column("progress", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workflow_runs", "progress")
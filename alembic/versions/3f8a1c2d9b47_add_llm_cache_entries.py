@@ -0,0 +1,48 @@
+"""add_llm_cache_entries
+
+Revision ID: 3f8a1c2d9b47
+Revises: c6b3cc257d3c
+Create Date: 2026-10-18 10:12:41.204118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a1c2d9b47"
+down_revision: Union[str, None] = "c6b3cc257d3c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("key", sa.String(length=64), primary_key=True),
+        sa.Column("agent_name", sa.String(length=255), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("response", postgresql.JSONB(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_llm_cache_entries_expires_at", "llm_cache_entries", ["expires_at"]
+    )
+    op.create_index(
+        "ix_llm_cache_entries_last_accessed_at",
+        "llm_cache_entries",
+        ["last_accessed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_entries_last_accessed_at", "llm_cache_entries")
+    op.drop_index("ix_llm_cache_entries_expires_at", "llm_cache_entries")
+    op.drop_table("llm_cache_entries")
@@ -0,0 +1,36 @@
+"""add_document_index_manifest
+
+Revision ID: 5b2e7d4a1f93
+Revises: 3f8a1c2d9b47
+Create Date: 2026-10-18 11:03:27.518342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e7d4a1f93"
+down_revision: Union[str, None] = "3f8a1c2d9b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_index_manifest",
+        sa.Column("file_hash", sa.String(length=64), primary_key=True),
+        sa.Column("collection_id", sa.String(length=255), nullable=False),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("embedding_model", sa.String(length=255), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("chunk_overlap", sa.Integer(), nullable=False),
+        sa.Column("indexed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_index_manifest")
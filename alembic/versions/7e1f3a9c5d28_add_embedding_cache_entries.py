@@ -0,0 +1,43 @@
+"""add_embedding_cache_entries
+
+Revision ID: 7e1f3a9c5d28
+Revises: 9d4c6e2b8a15
+Create Date: 2026-10-18 14:21:07.518302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "7e1f3a9c5d28"
+down_revision: Union[str, None] = "9d4c6e2b8a15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache_entries",
+        sa.Column("model", sa.String(length=255), primary_key=True),
+        sa.Column("text_hash", sa.String(length=64), primary_key=True),
+        sa.Column("dtype", sa.String(length=16), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_embedding_cache_entries_last_accessed_at",
+        "embedding_cache_entries",
+        ["last_accessed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_embedding_cache_entries_last_accessed_at", "embedding_cache_entries"
+    )
+    op.drop_table("embedding_cache_entries")
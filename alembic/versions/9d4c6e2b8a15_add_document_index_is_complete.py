@@ -0,0 +1,32 @@
+"""add_document_index_is_complete
+
+Revision ID: 9d4c6e2b8a15
+Revises: 5b2e7d4a1f93
+Create Date: 2026-10-18 11:48:09.731256
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4c6e2b8a15"
+down_revision: Union[str, None] = "5b2e7d4a1f93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_index_manifest",
+        sa.Column(
+            "is_complete", sa.Boolean(), nullable=False, server_default=sa.text("true")
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("document_index_manifest", "is_complete")
@@ -0,0 +1,41 @@
+"""document_index_is_complete_default_false
+
+Revision ID: b7d2f4e9a031
+Revises: 4a77870af619
+Create Date: 2026-10-18 17:02:41.518307
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2f4e9a031"
+down_revision: Union[str, None] = "4a77870af619"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows existing when the column was added were backfilled as complete, new
+    # manifests are incomplete until all their chunks are stored
+    op.alter_column(
+        "document_index_manifest",
+        "is_complete",
+        existing_type=sa.Boolean(),
+        existing_nullable=False,
+        server_default=sa.text("false"),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "document_index_manifest",
+        "is_complete",
+        existing_type=sa.Boolean(),
+        existing_nullable=False,
+        server_default=sa.text("true"),
+    )
@@ -22,6 +22,7 @@ async def build_config_from_form(
     document_publication_date: Optional[str] = Form(default=None),
     agents_to_run: Optional[str] = Form(default=None),
     session_id: Optional[str] = Form(default=None),
+    previous_workflow_run_id: Optional[str] = Form(default=None),
 ) -> SubstantiationWorkflowConfig:
     """
     Build SubstantiationWorkflowConfig from individual form fields.
@@ -39,6 +40,8 @@ async def build_config_from_form(
         document_publication_date: Publication date of the document (optional)
         agents_to_run: Comma-separated agent names to run (optional)
         session_id: Session ID for Langfuse tracing (optional)
+        previous_workflow_run_id: Workflow run of the previous revision of the
+            document, to only analyze the chunks that changed (optional)
 
     Returns:
         Configured SubstantiationWorkflowConfig instance
@@ -91,4 +94,5 @@ async def build_config_from_form(
         document_publication_date=parsed_publication_date,
         agents_to_run=parsed_agents_to_run,
         session_id=session_id,
+        previous_workflow_run_id=previous_workflow_run_id,
     )
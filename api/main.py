@@ -5,19 +5,59 @@ This module sets up the FastAPI application, middleware, and registers routers.
 Business logic is organized in separate routers under api/routers/.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.routers import analysis, evaluation, feedback, health, workflows, files
+from api.routers import (
+    analysis,
+    evaluation,
+    feedback,
+    files,
+    health,
+    metrics,
+    workflows,
+)
 from lib.config.logger import setup_logger
+from lib.services.analysis_worker import EMBEDDED_WORKER_CONCURRENCY, AnalysisWorker
+from lib.services.converters.process_pool import conversion_pool
+from lib.services.workflow_events import workflow_event_listener
+from lib.workflows.claim_substantiation.checkpointer import (
+    close_checkpointer_pool,
+    open_checkpointer_pool,
+)
 
 setup_logger()
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Analyst API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared connection pools on startup and close them on shutdown"""
+    await open_checkpointer_pool()
+
+    # Single-process deployments run analyses in the API; scaled deployments set
+    # EMBEDDED_WORKER_CONCURRENCY=0 and run `worker.py` separately
+    worker, worker_task = None, None
+    if EMBEDDED_WORKER_CONCURRENCY > 0:
+        worker = AnalysisWorker(concurrency=EMBEDDED_WORKER_CONCURRENCY)
+        worker_task = asyncio.create_task(worker.run())
+
+    yield
+
+    if worker is not None:
+        worker.stop()
+        await worker_task
+    await workflow_event_listener.close()
+    await close_checkpointer_pool()
+    conversion_pool.shutdown()
+
+
+app = FastAPI(title="AI Analyst API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -35,3 +75,4 @@ app.include_router(evaluation.router)
 app.include_router(workflows.router)
 app.include_router(files.router)
 app.include_router(feedback.router)
+app.include_router(metrics.router)
@@ -6,22 +6,26 @@ import logging
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from pydantic import BaseModel
 
 from api.auth import get_current_user
 from api.dependencies import build_config_from_form
-from api.services.workflow_runner import run_workflow_background
 from api.upload import convert_uploaded_files_to_file_document
 from lib.agents.registry import agent_registry
-from lib.config.database import get_db
+from lib.config.database import get_async_db
 from lib.models.user import User
 from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.services.chunk_reevaluation import reevaluate_workflow_run_chunk
+from lib.services.job_queue import enqueue_analysis
+from lib.services.workflow_runs import get_owned_workflow_run
 from lib.workflows.claim_substantiation.runner import reevaluate_single_chunk
 from lib.workflows.claim_substantiation.state import (
+    ChunkReevaluationDelta,
     ChunkReevaluationRequest,
     ChunkReevaluationResponse,
     SubstantiationWorkflowConfig,
+    WorkflowRunChunkReevaluationRequest,
 )
 
 logger = logging.getLogger(__name__)
@@ -39,7 +43,6 @@ class StartAnalysisResponse(BaseModel):
 
 @router.post("/api/start-analysis", response_model=StartAnalysisResponse)
 async def start_analysis(
-    background_tasks: BackgroundTasks,
     main_document: UploadFile = File(...),
     supporting_documents: Optional[list[UploadFile]] = File(default=None),
     config: SubstantiationWorkflowConfig = Depends(build_config_from_form),
@@ -52,19 +55,25 @@ async def start_analysis(
     1. Uploads and converts documents to markdown
     2. Creates a workflow run record in the database
     3. Returns the workflow_run_id immediately
-    4. Starts the analysis workflow in the background
+    4. Queues the analysis, which is run by the next free analysis worker
 
     The client can poll /api/workflow-run/{workflow_run_id} to check progress.
 
     Args:
-        background_tasks: FastAPI background tasks
         main_document: The main document to analyze for claims
         supporting_documents: Optional supporting documents for substantiation
         config: Workflow configuration built from form fields
 
+    With `previous_workflow_run_id`, the document is analyzed as a revision of that
+    run: results of unchanged chunks are carried over and only the changed chunks are
+    analyzed.
+
     Returns:
         workflow_run_id and session_id to track the analysis
     """
+    if config.previous_workflow_run_id:
+        await get_owned_workflow_run(config.previous_workflow_run_id, current_user)
+
     try:
         logger.info("Converting uploaded files to markdown...")
         [main_file, *supporting_files] = await convert_uploaded_files_to_file_document(
@@ -75,7 +84,7 @@ async def start_analysis(
         if not config.session_id:
             config.session_id = str(uuid.uuid4())
 
-        with get_db() as db:
+        async with get_async_db() as db:
             workflow_run = WorkflowRun(
                 langgraph_thread_id=config.session_id,
                 title=main_file.file_name,
@@ -83,20 +92,15 @@ async def start_analysis(
                 user_id=current_user.id,
             )
             db.add(workflow_run)
-            db.commit()
-            db.refresh(workflow_run)
+            await db.commit()
+            await db.refresh(workflow_run)
             workflow_run_id = str(workflow_run.id)
 
         logger.info(
             f"Created workflow run {workflow_run_id} for session {config.session_id}"
         )
 
-        background_tasks.add_task(
-            run_workflow_background,
-            main_file,
-            supporting_files,
-            config,
-        )
+        await enqueue_analysis(workflow_run_id, main_file, supporting_files, config)
 
         return StartAnalysisResponse(
             workflow_run_id=workflow_run_id,
@@ -162,3 +166,29 @@ async def reevaluate_chunk(
         raise HTTPException(
             status_code=500, detail=f"Error re-evaluating chunk: {str(e)}"
         )
+
+
+@router.post(
+    "/api/workflow-run/{workflow_run_id}/chunk/{chunk_index}/reevaluate",
+    response_model=ChunkReevaluationDelta,
+)
+async def reevaluate_workflow_run_chunk_endpoint(
+    workflow_run_id: str,
+    chunk_index: int,
+    request: WorkflowRunChunkReevaluationRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Re-evaluate a chunk of a completed workflow run with selected agents.
+
+    The state is loaded from the run, and the re-evaluated chunk is written back into
+    it. Only the chunk and its errors are returned.
+    """
+    try:
+        agent_registry.validate_agents(request.agents_to_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await reevaluate_workflow_run_chunk(
+        workflow_run_id, chunk_index, request.agents_to_run, user=current_user
+    )
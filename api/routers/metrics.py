@@ -0,0 +1,57 @@
+"""
+Runtime metrics endpoints used for capacity planning and autoscaling
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter
+
+from lib.services.conversion_cache import ConversionCacheStats, conversion_cache
+from lib.services.embedding_cache import EmbeddingCacheStats, embedding_cache
+from lib.services.job_queue import JobQueueStats, get_job_queue_stats
+from lib.services.llm_cache import LLMCacheStats, llm_cache
+from lib.services.llm_governor import ModelGovernorStats, llm_governor
+from lib.workflows.claim_substantiation.checkpointer import (
+    CheckpointerPoolStats,
+    get_checkpointer_pool_stats,
+)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/api/metrics/llm-governor", response_model=list[ModelGovernorStats])
+async def get_llm_governor_metrics():
+    """Live per-model concurrency, queue depth and wait times of the LLM governor"""
+    return llm_governor.stats()
+
+
+@router.get("/api/metrics/llm-cache", response_model=list[LLMCacheStats])
+async def get_llm_cache_metrics():
+    """Per-agent hit/miss counters of the LLM response cache"""
+    return llm_cache.stats()
+
+
+@router.get("/api/metrics/embedding-cache", response_model=list[EmbeddingCacheStats])
+async def get_embedding_cache_metrics():
+    """Per-model hit/miss counters of the embedding cache"""
+    return embedding_cache.stats()
+
+
+@router.get("/api/metrics/conversion-cache", response_model=list[ConversionCacheStats])
+async def get_conversion_cache_metrics():
+    """Per-converter hit/miss counters of the markdown conversion cache"""
+    return conversion_cache.stats()
+
+
+@router.get(
+    "/api/metrics/checkpointer-pool", response_model=Optional[CheckpointerPoolStats]
+)
+async def get_checkpointer_pool_metrics():
+    """Size, availability and wait times of the checkpointer connection pool"""
+    return get_checkpointer_pool_stats()
+
+
+@router.get("/api/metrics/job-queue", response_model=JobQueueStats)
+async def get_job_queue_metrics():
+    """Depth of the analysis job queue (`depth` = queued + running, for autoscaling)"""
+    return await get_job_queue_stats()
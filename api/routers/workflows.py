@@ -2,7 +2,9 @@
 Workflow run management endpoints
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from xxhash import xxh128
 
 from api.auth import get_current_user
 from lib.models.user import User
@@ -12,10 +14,16 @@ from lib.services.workflow_runs import (
     WorkflowRunDetailed,
     delete_workflow_run,
     get_chunk_details,
+    get_owned_workflow_run,
     get_workflow_run_detailed,
     get_workflow_runs,
     update_workflow_run,
 )
+from lib.services.workflow_events import iter_workflow_run_events
+from lib.services.workflow_resume import (
+    get_unfinished_workflow_runs,
+    resume_workflow_run,
+)
 from lib.workflows.claim_substantiation.state import DocumentChunk
 
 router = APIRouter(tags=["workflows"])
@@ -27,12 +35,71 @@ async def list_workflow_runs(current_user: User = Depends(get_current_user)):
     return await get_workflow_runs(user=current_user)
 
 
+@router.get("/api/workflow-runs/unfinished", response_model=list[WorkflowRun])
+async def list_unfinished_workflow_runs(
+    current_user: User = Depends(get_current_user),
+):
+    """List workflow runs that stopped before finishing and can be resumed"""
+    return await get_unfinished_workflow_runs(user=current_user)
+
+
 @router.get("/api/workflow-run/{workflow_run_id}", response_model=WorkflowRunDetailed)
 async def get_workflow_run(
+    workflow_run_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get detailed workflow run information including state. Responses carry an ETag,
+    a request with a matching If-None-Match gets a 304 without a body.
+    """
+    content = await get_workflow_run_detailed(workflow_run_id, user=current_user)
+    etag = f'"{xxh128(content.encode()).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=content, media_type="application/json", headers={"ETag": etag}
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
+
+
+@router.get("/api/workflow-run/{workflow_run_id}/events")
+async def stream_workflow_run_events(
+    workflow_run_id: str, current_user: User = Depends(get_current_user)
+):
+    """
+    Stream progress of a workflow run as Server-Sent Events: a `snapshot` of the run,
+    then `node_started`, `node_finished`, `chunk_completed` and `error` events until
+    `completed`
+    """
+    run = await get_owned_workflow_run(workflow_run_id, user=current_user)
+    return StreamingResponse(
+        iter_workflow_run_events(run.langgraph_thread_id),
+        media_type="text/event-stream",
+        # Disable proxy buffering so events are delivered as they happen
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/api/workflow-run/{workflow_run_id}/resume")
+async def resume_workflow_run_endpoint(
     workflow_run_id: str, current_user: User = Depends(get_current_user)
 ):
-    """Get detailed workflow run information including state"""
-    return await get_workflow_run_detailed(workflow_run_id, user=current_user)
+    """Resume an unfinished workflow run from its last checkpoint"""
+    job = await resume_workflow_run(workflow_run_id, user=current_user)
+    return {
+        "message": "Workflow run resumed",
+        "id": workflow_run_id,
+        "job_id": str(job.id),
+    }
 
 
 @router.patch("/api/workflow-run/{workflow_run_id}", response_model=WorkflowRun)
@@ -51,7 +118,11 @@ async def update_workflow_run_endpoint(
 )
 async def get_chunk_details_endpoint(workflow_run_id: str, chunk_index: int):
     """Get detailed analysis for a specific chunk (lazy loading)"""
-    return await get_chunk_details(workflow_run_id, chunk_index)
+    # Stored pre-serialized, returned without validating it into a model again
+    return Response(
+        content=await get_chunk_details(workflow_run_id, chunk_index),
+        media_type="application/json",
+    )
 
 
 @router.delete("/api/workflow-run/{workflow_run_id}")
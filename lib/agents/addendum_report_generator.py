@@ -7,6 +7,7 @@ from langchain_core.runnables import RunnableConfig
 
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 from pydantic import BaseModel, Field
 
 
@@ -191,7 +192,13 @@ class AddendumReportGeneratorAgent(AgentProtocol):
         self, prompt_kwargs: dict, config: RunnableConfig = None
     ) -> ReportOutput:
         messages = _addendum_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ReportOutput,
+            config=config,
+        )
 
 
 addendum_report_generator_agent = AddendumReportGeneratorAgent()
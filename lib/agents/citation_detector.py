@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_mini_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol, QCResult
+from lib.services.llm_cache import llm_cache
 
 
 class CitationType(str, Enum):
@@ -137,7 +138,13 @@ class CitationDetectorAgent(AgentProtocol):
         self, prompt_kwargs: dict, config: RunnableConfig = None
     ) -> CitationResponse:
         messages = _citation_detector_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=CitationResponse,
+            config=config,
+        )
 
 
 citation_detector_agent = CitationDetectorAgent()
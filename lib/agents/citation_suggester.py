@@ -9,6 +9,7 @@ from lib.agents.literature_review import ReferenceType
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import AgentProtocol
 from lib.services.openai import ensure_structured_output_response, get_openai_client
+from lib.services.llm_governor import llm_governor
 
 
 class RecommendedAction(str, Enum):
@@ -195,17 +196,18 @@ class CitationSuggesterAgent(AgentProtocol):
         prompt = _citation_suggester_agent_prompt.invoke(prompt_kwargs)
         input = [{"role": "user", "content": prompt.text}]
 
-        response = await self.client.responses.parse(
-            model=gpt_5_model.name,
-            tools=[{"type": "web_search"}],
-            max_tool_calls=20,
-            # reasoning={
-            #     "effort": "low",  # "minimal", "low", "medium", "high"
-            #     "summary": "auto",
-            # },
-            text_format=CitationSuggestionResponse,
-            input=input,
-        )
+        async with llm_governor.limit(gpt_5_model.name, input):
+            response = await self.client.responses.parse(
+                model=gpt_5_model.name,
+                tools=[{"type": "web_search"}],
+                max_tool_calls=20,
+                # reasoning={
+                #     "effort": "low",  # "minimal", "low", "medium", "high"
+                #     "summary": "auto",
+                # },
+                text_format=CitationSuggestionResponse,
+                input=input,
+            )
 
         return ensure_structured_output_response(response, CitationSuggestionResponse)
 
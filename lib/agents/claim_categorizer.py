@@ -30,6 +30,7 @@ from pydantic import BaseModel, Field
 from lib.agents.models import ClaimCategory
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 # =========================
 #  Pydantic data contracts
@@ -207,7 +208,13 @@ class ClaimCategorizerAgent(AgentProtocol):
         self, prompt_kwargs: dict, config: RunnableConfig = None
     ) -> ClaimCategorizationResponse:
         messages = _claim_categorizer_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ClaimCategorizationResponse,
+            config=config,
+        )
 
 
 claim_categorizer_agent = ClaimCategorizerAgent()
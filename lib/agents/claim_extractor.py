@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from lib.config.llm_models import gpt_5_mini_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class Claim(BaseModel):
@@ -129,7 +130,13 @@ class ClaimExtractorAgent(AgentProtocol):
         config: RunnableConfig = None,
     ) -> ClaimResponse:
         messages = _claim_extractor_prompt_claimify.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ClaimResponse,
+            config=config,
+        )
 
 
 claim_extractor_agent = ClaimExtractorAgent()
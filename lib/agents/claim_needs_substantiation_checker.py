@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class ClaimCommonKnowledgeResult(BaseModel):
@@ -115,7 +116,13 @@ class ClaimNeedsSubstantiationCheckerAgent(AgentProtocol):
         messages = _claim_needs_substantiation_checker_prompt.format_messages(
             **prompt_kwargs
         )
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ClaimCommonKnowledgeResult,
+            config=config,
+        )
 
 
 claim_needs_substantiation_checker_agent = ClaimNeedsSubstantiationCheckerAgent()
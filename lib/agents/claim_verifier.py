@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class EvidenceAlignmentLevel(StrEnum):
@@ -135,7 +136,13 @@ class ClaimVerifierAgent(AgentProtocol):
         config: RunnableConfig = None,
     ) -> ClaimSubstantiationResult:
         messages = _claim_verifier_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ClaimSubstantiationResult,
+            config=config,
+        )
 
 
 claim_verifier_agent = ClaimVerifierAgent()
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from lib.agents.models import ValidatedDocument
 from lib.config.llm_models import gpt_4_1_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class Paragraph(BaseModel):
@@ -89,7 +90,13 @@ class DocumentChunkerAgent(AgentProtocol):
             ]
         )
         messages = template.invoke(prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=DocumentChunkerResponse,
+            config=config,
+        )
 
 
 document_chunker_agent = DocumentChunkerAgent()
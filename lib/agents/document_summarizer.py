@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_mini_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class DocumentSummary(BaseModel):
@@ -65,7 +66,13 @@ class DocumentSummarizerAgent(AgentProtocol):
         config: RunnableConfig = None,
     ) -> DocumentSummarizerResponse:
         messages = _document_summarizer_agent_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=DocumentSummarizerResponse,
+            config=config,
+        )
 
 
 document_summarizer_agent = DocumentSummarizerAgent()
@@ -22,6 +22,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class WarrantExpression(str, Enum):
@@ -216,7 +217,13 @@ class InferenceValidatorAgent(AgentProtocol):
         config: RunnableConfig = None,
     ) -> InferenceValidationResponse:
         messages = _inference_validation_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=InferenceValidationResponse,
+            config=config,
+        )
 
 
 inference_validator_agent = InferenceValidatorAgent()
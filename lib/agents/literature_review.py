@@ -14,6 +14,7 @@ from lib.services.openai import (
     get_openai_client,
     wait_for_response,
 )
+from lib.services.llm_governor import llm_governor
 
 logger = logging.getLogger(__name__)
 
@@ -192,18 +193,19 @@ class LiteratureReviewAgent(AgentProtocol):
         prompt = _literature_review_agent_prompt.invoke(prompt_kwargs)
         input = [{"role": "user", "content": prompt.text}]
 
-        response = await self.client.responses.parse(
-            model=gpt_5_model.name,
-            tools=[{"type": "web_search"}],
-            max_tool_calls=20,
-            reasoning={
-                "effort": "low",  # "minimal", "low", "medium", "high"
-                "summary": "auto",
-            },
-            text_format=LiteratureReviewResponse,
-            background=True,
-            input=input,
-        )
+        async with llm_governor.limit(gpt_5_model.name, input):
+            response = await self.client.responses.parse(
+                model=gpt_5_model.name,
+                tools=[{"type": "web_search"}],
+                max_tool_calls=20,
+                reasoning={
+                    "effort": "low",  # "minimal", "low", "medium", "high"
+                    "summary": "auto",
+                },
+                text_format=LiteratureReviewResponse,
+                background=True,
+                input=input,
+            )
 
         response = await wait_for_response(
             self.client, response, log_info="Literature Review Researcher"
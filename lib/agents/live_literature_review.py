@@ -11,6 +11,7 @@ from lib.agents.literature_review import (
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import AgentProtocol
 from lib.services.openai import ensure_structured_output_response, get_openai_client
+from lib.services.llm_governor import llm_governor
 
 
 class ClaimReferenceFactors(BaseModel):
@@ -175,17 +176,18 @@ class LiveLiteratureReviewAgent(AgentProtocol):
         prompt = _live_literature_review_agent_prompt.invoke(prompt_kwargs)
         input = [{"role": "user", "content": prompt.text}]
 
-        response = await self.client.responses.parse(
-            model=gpt_5_model.name,
-            tools=[{"type": "web_search"}],
-            max_tool_calls=20,
-            # reasoning={
-            #     "effort": "low",  # "minimal", "low", "medium", "high"
-            #     "summary": "auto",
-            # },
-            text_format=LiveLiteratureReviewResponse,
-            input=input,
-        )
+        async with llm_governor.limit(gpt_5_model.name, input):
+            response = await self.client.responses.parse(
+                model=gpt_5_model.name,
+                tools=[{"type": "web_search"}],
+                max_tool_calls=20,
+                # reasoning={
+                #     "effort": "low",  # "minimal", "low", "medium", "high"
+                #     "summary": "auto",
+                # },
+                text_format=LiveLiteratureReviewResponse,
+                input=input,
+            )
 
         return ensure_structured_output_response(response, LiveLiteratureReviewResponse)
 
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_mini_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class BibliographyItem(BaseModel):
@@ -68,7 +69,13 @@ class ReferenceExtractorAgent(AgentProtocol):
         config: RunnableConfig = None,
     ) -> ReferenceExtractorResponse:
         messages = _reference_extractor_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ReferenceExtractorResponse,
+            config=config,
+        )
 
 
 reference_extractor_agent = ReferenceExtractorAgent()
@@ -18,6 +18,7 @@ from lib.services.openai import (
     wait_for_response,
     ensure_structured_output_response,
 )
+from lib.services.llm_governor import llm_governor
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import AgentProtocol
 from lib.agents.reference_extractor import (
@@ -127,18 +128,19 @@ class ReferenceValidatorAgent(AgentProtocol):
         prompt = _reference_validator_prompt.invoke(prompt_kwargs)
         input = [{"role": "user", "content": prompt.text}]
 
-        response = await self.client.responses.parse(
-            model=gpt_5_model.name,
-            tools=[{"type": "web_search"}],
-            max_tool_calls=20,
-            reasoning={
-                "effort": "low",  # "minimal", "low", "medium", "high"
-                "summary": "auto",
-            },
-            text_format=BibliographyValidationResponse,
-            background=True,
-            input=input,
-        )
+        async with llm_governor.limit(gpt_5_model.name, input):
+            response = await self.client.responses.parse(
+                model=gpt_5_model.name,
+                tools=[{"type": "web_search"}],
+                max_tool_calls=20,
+                reasoning={
+                    "effort": "low",  # "minimal", "low", "medium", "high"
+                    "summary": "auto",
+                },
+                text_format=BibliographyValidationResponse,
+                background=True,
+                input=input,
+            )
 
         response = await wait_for_response(
             self.client, response, log_info="Reference Validator"
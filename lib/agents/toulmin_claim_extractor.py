@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 
 from lib.config.llm_models import gpt_5_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT, AgentProtocol
+from lib.services.llm_cache import llm_cache
 
 
 class ToulminClaim(BaseModel):
@@ -137,7 +138,13 @@ class ToulminClaimExtractorAgent(AgentProtocol):
         config: RunnableConfig = None,
     ) -> ToulminClaimResponse:
         messages = _toulmin_claim_extractor_prompt.format_messages(**prompt_kwargs)
-        return await self.llm.ainvoke(messages, config=config)
+        return await llm_cache.ainvoke(
+            self.llm,
+            messages,
+            agent_name=self.name,
+            output_schema=ToulminClaimResponse,
+            config=config,
+        )
 
 
 toulmin_claim_extractor_agent = ToulminClaimExtractorAgent()
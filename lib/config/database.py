@@ -1,10 +1,20 @@
-from contextlib import contextmanager
+import os
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .env import config
 
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_POOL_TIMEOUT_SECONDS = float(os.getenv("DATABASE_POOL_TIMEOUT_SECONDS", "30"))
+
 # SQLAlchemy engine
 engine = create_engine(
     config.DATABASE_URL,
@@ -14,6 +24,37 @@ engine = create_engine(
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_url(database_url: str) -> str:
+    """Use the psycopg (v3) async driver for postgresql:// URLs."""
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return database_url
+
+
+# Async engine shared by API handlers, workflow status updates and the vector store,
+# so database calls never block the event loop driving the LLM calls
+async_engine = create_async_engine(
+    get_async_database_url(config.DATABASE_URL),
+    echo=False,
+    pool_size=DATABASE_POOL_SIZE,
+    max_overflow=DATABASE_MAX_OVERFLOW,
+    pool_timeout=DATABASE_POOL_TIMEOUT_SECONDS,
+    pool_pre_ping=True,
+)
+
+# Objects are used after their session is closed (e.g. returned by API handlers),
+# and async sessions cannot lazily reload expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Connections holding session-level advisory locks across long operations (e.g. LLM
+# calls) are opened outside of the shared pool, and closing them releases the locks
+lock_engine = create_async_engine(
+    get_async_database_url(config.DATABASE_URL), echo=False, poolclass=NullPool
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -26,3 +67,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get an async database session from the shared pool."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,5 +1,25 @@
 from .workflow_run import WorkflowRun
 from .user import User
 from .feedback import Feedback
+from .llm_cache_entry import LLMCacheEntry
+from .document_index import DocumentIndex
+from .embedding_cache_entry import EmbeddingCacheEntry
+from .analysis_job import AnalysisJob
+from .chunk_task_result import ChunkTaskResult
+from .conversion_cache_entry import ConversionCacheEntry
+from .chunk_result import ChunkResult
+from .workflow_run_summary import WorkflowRunSummary
 
-__all__ = ["WorkflowRun", "User", "Feedback"]
+__all__ = [
+    "WorkflowRun",
+    "User",
+    "Feedback",
+    "LLMCacheEntry",
+    "DocumentIndex",
+    "EmbeddingCacheEntry",
+    "AnalysisJob",
+    "ChunkTaskResult",
+    "ConversionCacheEntry",
+    "ChunkResult",
+    "WorkflowRunSummary",
+]
@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlmodel import Field, SQLModel, String, Enum as SQLModelEnum
+
+
+class AnalysisJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisJob(SQLModel, table=True):
+    """
+    Durable queue entry of an analysis run, executed by the analysis workers.
+
+    A worker claims a job with `FOR UPDATE SKIP LOCKED` and holds it for a lease that
+    it keeps extending while the analysis runs. If the worker dies, the lease expires
+    and another worker claims the job again, resuming from the last checkpoint.
+    """
+
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_available_at", "status", "available_at"),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    )
+    workflow_run_id: uuid.UUID = Field(
+        sa_column=Column(
+            UUID(as_uuid=True),
+            ForeignKey("workflow_runs.id", ondelete="CASCADE"),
+            nullable=False,
+        )
+    )
+    session_id: str = Field(sa_column=Column(String(255), nullable=False))
+    payload: dict = Field(
+        sa_column=Column(JSONB, nullable=False),
+        description="Serialized AnalysisJobPayload (input files and workflow config)",
+    )
+    status: AnalysisJobStatus = Field(
+        sa_column=Column(
+            SQLModelEnum(AnalysisJobStatus),
+            nullable=False,
+            default=AnalysisJobStatus.QUEUED,
+        )
+    )
+    attempts: int = Field(default=0, sa_column=Column(Integer, nullable=False))
+    max_attempts: int = Field(sa_column=Column(Integer, nullable=False))
+    locked_by: Optional[str] = Field(
+        default=None, sa_column=Column(String(255), nullable=True)
+    )
+    locked_until: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    available_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    started_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    finished_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    last_error: Optional[str] = Field(
+        default=None, sa_column=Column(Text, nullable=True)
+    )
+
+    def __repr__(self):
+        return f"<AnalysisJob(id={self.id}, status={self.status})>"
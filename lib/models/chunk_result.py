@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlmodel import Field, SQLModel
+
+
+class ChunkResult(SQLModel, table=True):
+    """
+    Latest analysis of a chunk of a workflow run, written by the runner whenever the
+    chunk changes, so that chunk details are read without loading the whole state
+    from the checkpoint.
+    """
+
+    __tablename__ = "chunk_results"
+
+    workflow_run_id: uuid.UUID = Field(
+        sa_column=Column(
+            UUID(as_uuid=True),
+            ForeignKey("workflow_runs.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    chunk_index: int = Field(sa_column=Column(Integer, primary_key=True))
+    chunk_json: str = Field(
+        sa_column=Column(Text, nullable=False),
+        description="DocumentChunk serialized to JSON, as returned by the API",
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<ChunkResult(workflow_run_id={self.workflow_run_id}, chunk_index={self.chunk_index})>"
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel, String
+
+
+class ChunkTaskResult(SQLModel, table=True):
+    """
+    Result of a chunk function, recorded as soon as the chunk completes.
+
+    LangGraph only checkpoints a node once all its chunks are done. Task ids are
+    deterministic, so when an interrupted node is resumed from its checkpoint it gets
+    the same task id and reuses the chunks recorded here instead of running them again.
+    Rows of a thread are deleted when its run finishes.
+    """
+
+    __tablename__ = "chunk_task_results"
+
+    thread_id: str = Field(sa_column=Column(String(255), primary_key=True))
+    task_id: str = Field(sa_column=Column(String(255), primary_key=True))
+    step: str = Field(
+        sa_column=Column(String(255), primary_key=True),
+        description="Name of the chunk function",
+    )
+    chunk_index: int = Field(sa_column=Column(Integer, primary_key=True))
+    result: dict = Field(
+        sa_column=Column(JSONB, nullable=False), description="Serialized DocumentChunk"
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<ChunkTaskResult(thread_id={self.thread_id}, step={self.step}, chunk_index={self.chunk_index})>"
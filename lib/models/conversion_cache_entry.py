@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, Text
+from sqlmodel import Field, SQLModel, String
+
+
+class ConversionCacheEntry(SQLModel, table=True):
+    """Markdown conversion of a file, keyed by file hash, converter and options."""
+
+    __tablename__ = "conversion_cache_entries"
+    __table_args__ = (
+        Index("ix_conversion_cache_entries_last_accessed_at", "last_accessed_at"),
+    )
+
+    key: str = Field(sa_column=Column(String(64), primary_key=True))
+    file_hash: str = Field(sa_column=Column(String(32), nullable=False))
+    converter: str = Field(sa_column=Column(String(64), nullable=False))
+    markdown: str = Field(sa_column=Column(Text, nullable=False))
+    size_bytes: int = Field(sa_column=Column(Integer, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    last_accessed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<ConversionCacheEntry(key={self.key}, converter={self.converter})>"
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, text
+from sqlmodel import Field, SQLModel, String
+
+
+class DocumentIndex(SQLModel, table=True):
+    """
+    Manifest of supporting documents indexed in the vector store.
+
+    Keyed by the xxh128 hash of the uploaded file, so checking whether a document is
+    already indexed is a primary-key lookup. The indexing settings are recorded to
+    detect indexes built with a different embedding model or chunking, and
+    `is_complete` is only set once all chunks are stored so that interrupted
+    indexing can be resumed.
+    """
+
+    __tablename__ = "document_index_manifest"
+
+    file_hash: str = Field(sa_column=Column(String(64), primary_key=True))
+    collection_id: str = Field(sa_column=Column(String(255), nullable=False))
+    chunk_count: int = Field(sa_column=Column(Integer, nullable=False))
+    embedding_model: str = Field(sa_column=Column(String(255), nullable=False))
+    chunk_size: int = Field(sa_column=Column(Integer, nullable=False))
+    chunk_overlap: int = Field(sa_column=Column(Integer, nullable=False))
+    indexed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    is_complete: bool = Field(
+        default=False,
+        sa_column=Column(Boolean, nullable=False, server_default=text("false")),
+    )
+
+    def __repr__(self):
+        return f"<DocumentIndex(file_hash={self.file_hash}, collection_id={self.collection_id})>"
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, LargeBinary
+from sqlmodel import Field, SQLModel, String
+
+
+class EmbeddingCacheEntry(SQLModel, table=True):
+    """Cached embedding of a text, keyed by model and a hash of the text."""
+
+    __tablename__ = "embedding_cache_entries"
+    __table_args__ = (
+        Index("ix_embedding_cache_entries_last_accessed_at", "last_accessed_at"),
+    )
+
+    model: str = Field(sa_column=Column(String(255), primary_key=True))
+    text_hash: str = Field(sa_column=Column(String(64), primary_key=True))
+    dtype: str = Field(sa_column=Column(String(16), nullable=False))
+    embedding: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    last_accessed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<EmbeddingCacheEntry(model={self.model}, text_hash={self.text_hash})>"
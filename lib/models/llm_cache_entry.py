@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel, String
+
+
+class LLMCacheEntry(SQLModel, table=True):
+    """Cached structured response of an agent LLM call, keyed by a content hash."""
+
+    __tablename__ = "llm_cache_entries"
+    __table_args__ = (
+        Index("ix_llm_cache_entries_expires_at", "expires_at"),
+        Index("ix_llm_cache_entries_last_accessed_at", "last_accessed_at"),
+    )
+
+    key: str = Field(sa_column=Column(String(64), primary_key=True))
+    agent_name: str = Field(sa_column=Column(String(255), nullable=False))
+    model: str = Field(sa_column=Column(String(255), nullable=False))
+    response: dict = Field(sa_column=Column(JSONB, nullable=False))
+    size_bytes: int = Field(sa_column=Column(Integer, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    last_accessed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<LLMCacheEntry(key={self.key}, agent_name={self.agent_name})>"
@@ -1,10 +1,11 @@
 from enum import Enum
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional
 
+from pydantic import BaseModel
 from sqlalchemy import Column, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlmodel import Field, SQLModel, String, Enum as SQLModelEnum
 
 
@@ -12,6 +13,21 @@ class WorkflowRunStatus(str, Enum):
     PENDING = "pending"
     RUNNING = "running"
     COMPLETED = "completed"
+    # Stopped before the graph finished, can be resumed from its last checkpoint
+    FAILED = "failed"
+
+
+class NodeProgress(BaseModel):
+    chunks_done: int = 0
+    chunks_total: Optional[int] = None
+    completed: bool = False
+
+
+class WorkflowRunProgress(BaseModel):
+    """Per-node progress of a running workflow, stored in `workflow_runs.progress`."""
+
+    current_node: Optional[str] = None
+    nodes: Dict[str, NodeProgress] = {}
 
 
 class WorkflowRun(SQLModel, table=True):
@@ -50,6 +66,11 @@ class WorkflowRun(SQLModel, table=True):
             default=WorkflowRunStatus.PENDING,
         )
     )
+    progress: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSONB, nullable=True),
+        description="WorkflowRunProgress of the latest execution",
+    )
 
     def __repr__(self):
         return f"<WorkflowRun(id={self.id}, langgraph_thread_id={self.langgraph_thread_id})>"
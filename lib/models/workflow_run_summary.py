@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlmodel import Field, SQLModel
+
+
+class WorkflowRunSummary(SQLModel, table=True):
+    """
+    Summary state of a completed workflow run, materialized when the run finishes so
+    that the run details are served without loading its checkpoint.
+    """
+
+    __tablename__ = "workflow_run_summaries"
+
+    workflow_run_id: uuid.UUID = Field(
+        sa_column=Column(
+            UUID(as_uuid=True),
+            ForeignKey("workflow_runs.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    summary_json: str = Field(
+        sa_column=Column(Text, nullable=False),
+        description="ClaimSubstantiatorStateSummary serialized to JSON, as returned by the API",
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<WorkflowRunSummary(workflow_run_id={self.workflow_run_id})>"
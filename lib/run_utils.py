@@ -10,14 +10,21 @@ logger = logging.getLogger(__name__)
 MAX_CONCURRENT_TASKS = int(os.getenv("MAX_CONCURRENT_TASKS", "15"))
 
 
-async def run_tasks(tasks, desc="Processing tasks", max_concurrent=None):
+async def run_tasks(
+    tasks, desc="Processing tasks", max_concurrent=None, on_progress=None
+):
     """
     Run tasks with concurrency limit to avoid overwhelming systems.
 
+    This only bounds the fan-out of a single call. Provider-level limits shared by
+    all runs in the process are enforced by `lib.services.llm_governor`.
+
     Args:
         tasks: List of coroutines to run
         desc: Description for progress bar
         max_concurrent: Maximum number of concurrent tasks (default: MAX_CONCURRENT_TASKS env var or 15)
+        on_progress: Optional callback called after every task with (completed, total,
+            task index, error or None)
 
     Returns:
         Tuple of (results, errors) lists
@@ -56,6 +63,8 @@ async def run_tasks(tasks, desc="Processing tasks", max_concurrent=None):
         logger.info(
             f"{desc}: Completed {completed_count} / {len(tasks)} (Task #{original_index} completed)"
         )
+        if on_progress is not None:
+            on_progress(completed_count, len(tasks), original_index, error)
 
     task_results = []
     task_errors = []
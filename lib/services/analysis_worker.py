@@ -0,0 +1,132 @@
+"""
+Analysis worker executing queued analysis jobs.
+
+Runs standalone (`python worker.py`) so that analyses are spread over worker pods
+instead of competing with request handling in the API, or embedded in the API process
+for single-process deployments (EMBEDDED_WORKER_CONCURRENCY).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Dict, Optional
+
+from lib.models.analysis_job import AnalysisJob
+from lib.services.job_queue import (
+    JOB_VISIBILITY_TIMEOUT_SECONDS,
+    AnalysisJobPayload,
+    claim_job,
+    complete_job,
+    extend_lease,
+    fail_abandoned_jobs,
+    fail_job,
+    release_job,
+)
+from lib.workflows.claim_substantiation.runner import (
+    has_unfinished_checkpoint,
+    run_claim_substantiator,
+)
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_WORKER_CONCURRENCY = int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", "2"))
+EMBEDDED_WORKER_CONCURRENCY = int(os.getenv("EMBEDDED_WORKER_CONCURRENCY", "1"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+
+
+class AnalysisWorker:
+    def __init__(self, concurrency: int = ANALYSIS_WORKER_CONCURRENCY):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self._jobs: Dict[uuid.UUID, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        """Claim and run jobs until `stop()` is called."""
+        logger.info(
+            f"Analysis worker {self.worker_id} started "
+            f"(concurrency {self.concurrency})"
+        )
+        while not self._stopping.is_set():
+            if len(self._jobs) >= self.concurrency:
+                await self._sleep(JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            job: Optional[AnalysisJob] = None
+            try:
+                await fail_abandoned_jobs()
+                job = await claim_job(self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}", exc_info=True)
+
+            if job is None:
+                await self._sleep(JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            self._jobs[job.id] = task
+            task.add_done_callback(lambda _, job_id=job.id: self._jobs.pop(job_id))
+
+        await self._shutdown()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _shutdown(self) -> None:
+        # Running analyses are handed back to the queue and resumed from their last
+        # checkpoint by another worker, instead of holding up the shutdown
+        tasks = list(self._jobs.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Analysis worker {self.worker_id} stopped")
+
+    async def _process(self, job: AnalysisJob) -> None:
+        payload = AnalysisJobPayload.model_validate(job.payload)
+        heartbeat = asyncio.create_task(self._keep_lease(job, asyncio.current_task()))
+        try:
+            # A job claimed again after a crash or shutdown continues from the
+            # checkpoints of the interrupted attempt
+            await run_claim_substantiator(
+                file=payload.main_file,
+                supporting_files=payload.supporting_files,
+                config=payload.config,
+                resume=True,
+            )
+            # A failed analysis keeps its checkpoints: retry it from where it stopped
+            if await has_unfinished_checkpoint(payload.config.session_id):
+                raise RuntimeError("Analysis stopped before the workflow finished")
+        except asyncio.CancelledError:
+            if not self._stopping.is_set():
+                # Lease lost: another worker owns the job now
+                raise
+            await asyncio.shield(release_job(job))
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+            await fail_job(job, str(e))
+        else:
+            await complete_job(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _keep_lease(self, job: AnalysisJob, job_task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(JOB_VISIBILITY_TIMEOUT_SECONDS / 3)
+            try:
+                owned = await extend_lease(job, self.worker_id)
+            except Exception as e:
+                logger.warning(f"Failed to extend the lease of job {job.id}: {e}")
+                continue
+            if not owned:
+                logger.error(f"Lost the lease of job {job.id}, cancelling it")
+                job_task.cancel()
+                return
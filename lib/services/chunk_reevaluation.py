@@ -0,0 +1,85 @@
+"""
+Re-evaluation of a chunk of a stored workflow run.
+
+Unlike `POST /api/reevaluate-chunk`, which receives and returns the whole state, the
+state is loaded from the run's checkpoint and only the re-evaluated chunk and its
+errors are returned. The chunk is written back into the run: its checkpoint, its
+chunk results and its materialized summary. A run is re-evaluated one chunk at a
+time: concurrent requests get a 409.
+"""
+
+import logging
+import time
+from typing import List
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from lib.config.database import lock_engine
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRunStatus
+from lib.services.chunk_results import ChunkResultWriter
+from lib.services.workflow_runs import (
+    get_owned_workflow_run,
+    save_workflow_run_summary,
+)
+from lib.workflows.claim_substantiation.runner import reevaluate_checkpointed_chunk
+from lib.workflows.claim_substantiation.state import ChunkReevaluationDelta
+
+logger = logging.getLogger(__name__)
+
+
+async def reevaluate_workflow_run_chunk(
+    workflow_run_id: str, chunk_index: int, agents_to_run: List[str], user: User
+) -> ChunkReevaluationDelta:
+    run = await get_owned_workflow_run(workflow_run_id, user)
+    if run.status != WorkflowRunStatus.COMPLETED:
+        # Writing into the checkpoint of an unfinished run would race its analysis
+        # or mark it as finished
+        raise HTTPException(
+            status_code=409,
+            detail="Only completed workflow runs can be re-evaluated",
+        )
+
+    # Re-evaluations of a run are serialized so that none overwrites the result of
+    # another. The lock is held by a connection of its own for the whole
+    # re-evaluation, without a transaction or row lock open during the LLM calls
+    async with lock_engine.connect() as lock_connection:
+        lock_connection = await lock_connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        is_locked = (
+            await lock_connection.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:key))"),
+                {"key": f"reevaluate_chunk:{run.id}"},
+            )
+        ).scalar_one()
+        if not is_locked:
+            raise HTTPException(
+                status_code=409,
+                detail="A chunk of this workflow run is already being re-evaluated",
+            )
+
+        start_time = time.time()
+        try:
+            state = await reevaluate_checkpointed_chunk(
+                run.langgraph_thread_id, chunk_index, agents_to_run
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        chunk = next(
+            chunk for chunk in state.chunks if chunk.chunk_index == chunk_index
+        )
+        await ChunkResultWriter(str(run.id)).write([chunk])
+        try:
+            await save_workflow_run_summary(str(run.id), state)
+        except Exception as e:
+            logger.warning(f"Failed to save the summary of {run.id}: {e}")
+
+    return ChunkReevaluationDelta(
+        chunk=chunk,
+        errors=[error for error in state.errors if error.chunk_index == chunk_index],
+        agents_run=agents_to_run,
+        processing_time_ms=(time.time() - start_time) * 1000,
+    )
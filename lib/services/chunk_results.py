@@ -0,0 +1,95 @@
+"""
+Per-chunk results of workflow runs.
+
+The frontend loads the details of every chunk a user opens. Reading a chunk from the
+checkpoint loads and validates the whole state of the run, so the runner also writes
+each chunk to the `chunk_results` table whenever its analysis changes, and chunk
+details are a primary key read returning the stored JSON as is.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from lib.config.database import get_async_db
+from lib.models.chunk_result import ChunkResult
+from lib.workflows.claim_substantiation.state import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT, chunks serialize to tens of kB
+WRITE_BATCH_SIZE = 100
+
+
+class ChunkResultWriter:
+    """Writes the chunks of a run that changed since the previous write."""
+
+    def __init__(self, workflow_run_id: str):
+        self.workflow_run_id = workflow_run_id
+        # Hash of the JSON last written for each chunk index
+        self._written: Dict[int, int] = {}
+
+    async def write(self, chunks: List[DocumentChunk]) -> None:
+        changed = {}
+        for chunk in chunks:
+            chunk_json = chunk.model_dump_json()
+            if self._written.get(chunk.chunk_index) != hash(chunk_json):
+                changed[chunk.chunk_index] = chunk_json
+        if not changed:
+            return
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "workflow_run_id": self.workflow_run_id,
+                "chunk_index": chunk_index,
+                "chunk_json": chunk_json,
+                "updated_at": now,
+            }
+            for chunk_index, chunk_json in changed.items()
+        ]
+        try:
+            async with get_async_db() as db:
+                for start in range(0, len(rows), WRITE_BATCH_SIZE):
+                    statement = insert(ChunkResult).values(
+                        rows[start : start + WRITE_BATCH_SIZE]
+                    )
+                    await db.exec(
+                        statement.on_conflict_do_update(
+                            index_elements=["workflow_run_id", "chunk_index"],
+                            set_={
+                                "chunk_json": statement.excluded.chunk_json,
+                                "updated_at": statement.excluded.updated_at,
+                            },
+                        )
+                    )
+                await db.commit()
+        except Exception as e:
+            # Chunk details fall back to the checkpoint, retried on the next write
+            logger.warning(
+                f"Failed to write chunk results of workflow run {self.workflow_run_id}: {e}"
+            )
+            return
+
+        self._written.update(
+            (chunk_index, hash(chunk_json))
+            for chunk_index, chunk_json in changed.items()
+        )
+
+
+async def get_chunk_result_json(
+    workflow_run_id: str, chunk_index: int
+) -> Optional[str]:
+    """Serialized DocumentChunk of a run, or None if it was not written."""
+    async with get_async_db() as db:
+        return (
+            await db.exec(
+                select(ChunkResult.chunk_json).where(
+                    ChunkResult.workflow_run_id == workflow_run_id,
+                    ChunkResult.chunk_index == chunk_index,
+                )
+            )
+        ).first()
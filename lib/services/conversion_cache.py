@@ -0,0 +1,315 @@
+"""
+Shared cache of file to markdown conversions.
+
+Converting a PDF with MarkItDown or docling-serve takes seconds to minutes, and the
+same reference documents are attached to many analyses. Conversions are keyed by
+the xxh128 hash of the file content (the same hash uploads are stored under), the
+converter and its options, so a file is converted once per converter setup.
+
+The cache is opt-in through the CONVERSION_CACHE_BACKEND env var:
+- unset / "none": disabled, every conversion runs the converter
+- "disk": markdown files under CONVERSION_CACHE_DIR (put it on a volume shared by
+  the workers to share conversions), evicted by CONVERSION_CACHE_MAX_BYTES
+- "postgres": `conversion_cache_entries` table, shared by all workers, evicted by
+  least recent access beyond CONVERSION_CACHE_MAX_BYTES
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol
+
+from pydantic import BaseModel, computed_field
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from xxhash import xxh128
+
+from lib.config.database import get_db
+from lib.models.conversion_cache_entry import ConversionCacheEntry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_CACHE_DIR = ".cache/conversions"
+# Evict after every N writes instead of on every write
+EVICTION_INTERVAL = 20
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ConversionCacheStats(BaseModel):
+    """Hit/miss counters of the conversion cache for a single converter."""
+
+    converter: str
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def hash_file(file_path: str) -> str:
+    """xxh128 of the file content, as used for the file names of uploads."""
+    digest = xxh128()
+    with open(file_path, "rb") as file:
+        while block := file.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_conversion_key(file_hash: str, converter: str, options: dict) -> str:
+    key_data = json.dumps(
+        {"file_hash": file_hash, "converter": converter, "options": options},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+class ConversionCacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, file_hash: str, converter: str, markdown: str) -> None: ...
+
+    def evict(self) -> None: ...
+
+
+class DiskConversionCacheBackend:
+    """Stores one markdown file per entry; least recently used files are evicted first."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.md"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            markdown = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        # mtime doubles as last access time for LRU eviction
+        os.utime(path)
+        return markdown
+
+    def set(self, key: str, file_hash: str, converter: str, markdown: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temporary name, workers may share the directory
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(markdown, encoding="utf-8")
+        tmp_path.replace(path)
+
+    def evict(self) -> None:
+        files = []
+        for path in self.directory.glob("*/*.md"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+
+class PostgresConversionCacheBackend:
+    """Stores conversions in the `conversion_cache_entries` table."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[str]:
+        with get_db() as db:
+            entry = db.get(ConversionCacheEntry, key)
+            if entry is None:
+                return None
+            entry.last_accessed_at = datetime.now(timezone.utc)
+            db.commit()
+            return entry.markdown
+
+    def set(self, key: str, file_hash: str, converter: str, markdown: str) -> None:
+        now = datetime.now(timezone.utc)
+        with get_db() as db:
+            db.execute(
+                insert(ConversionCacheEntry)
+                .values(
+                    key=key,
+                    file_hash=file_hash,
+                    converter=converter,
+                    markdown=markdown,
+                    size_bytes=len(markdown.encode()),
+                    created_at=now,
+                    last_accessed_at=now,
+                )
+                .on_conflict_do_nothing()
+            )
+            db.commit()
+
+    def evict(self) -> None:
+        with get_db() as db:
+            # Keep the most recently used entries that fit in `max_bytes`
+            cumulative_bytes = (
+                func.sum(ConversionCacheEntry.size_bytes)
+                .over(order_by=ConversionCacheEntry.last_accessed_at.desc())
+                .label("cumulative_bytes")
+            )
+            ranked = select(ConversionCacheEntry.key, cumulative_bytes).subquery()
+            db.execute(
+                delete(ConversionCacheEntry).where(
+                    ConversionCacheEntry.key.in_(
+                        select(ranked.c.key).where(
+                            ranked.c.cumulative_bytes > self.max_bytes
+                        )
+                    )
+                )
+            )
+            db.commit()
+
+
+class ConversionCache:
+    def __init__(self, backend: Optional[ConversionCacheBackend] = None):
+        self.backend = backend
+        self._stats: Dict[str, ConversionCacheStats] = {}
+        self._writes = 0
+        # Concurrent runs converting the same file wait for a single conversion
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _get_stats(self, converter: str) -> ConversionCacheStats:
+        if converter not in self._stats:
+            self._stats[converter] = ConversionCacheStats(converter=converter)
+        return self._stats[converter]
+
+    async def aconvert(
+        self,
+        file_path: str,
+        converter: str,
+        options: dict,
+        convert: Callable[[str], Awaitable[str]],
+    ) -> str:
+        """
+        Convert a file to markdown through the cache.
+
+        Args:
+            file_path: Path of the file to convert
+            converter: Name of the converter (part of the key, used for stats)
+            options: Options that change the converter output (part of the key)
+            convert: Conversion to run on a cache miss
+        """
+        if self.backend is None:
+            return await convert(file_path)
+
+        stats = self._get_stats(converter)
+        file_hash = await asyncio.to_thread(hash_file, file_path)
+        key = build_conversion_key(file_hash, converter, options)
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            await asyncio.wait([in_flight])
+            if not in_flight.cancelled():
+                stats.hits += 1
+                return in_flight.result()
+            # The converting run was cancelled, convert in this one instead
+            return await self.aconvert(file_path, converter, options, convert)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            markdown = await self._lookup_or_convert(
+                file_path, file_hash, key, converter, convert
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it, don't warn that it was never retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(markdown)
+        finally:
+            del self._in_flight[key]
+
+        return markdown
+
+    async def _lookup_or_convert(
+        self,
+        file_path: str,
+        file_hash: str,
+        key: str,
+        converter: str,
+        convert: Callable[[str], Awaitable[str]],
+    ) -> str:
+        stats = self._get_stats(converter)
+        try:
+            cached = await asyncio.to_thread(self.backend.get, key)
+        except Exception as e:
+            logger.warning(f"Conversion cache lookup failed for {file_path}: {e}")
+            stats.errors += 1
+            cached = None
+
+        if cached is not None:
+            stats.hits += 1
+            logger.info(f"Using cached {converter} conversion of '{file_path}'")
+            return cached
+        stats.misses += 1
+
+        markdown = await convert(file_path)
+
+        try:
+            await asyncio.to_thread(
+                self.backend.set, key, file_hash, converter, markdown
+            )
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 0:
+                await asyncio.to_thread(self.backend.evict)
+        except Exception as e:
+            logger.warning(f"Conversion cache write failed for {file_path}: {e}")
+            stats.errors += 1
+
+        return markdown
+
+    def stats(self) -> List[ConversionCacheStats]:
+        return list(self._stats.values())
+
+
+def _create_backend() -> Optional[ConversionCacheBackend]:
+    backend = os.getenv("CONVERSION_CACHE_BACKEND", "none").lower()
+    max_bytes = int(os.getenv("CONVERSION_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+    if backend == "none":
+        return None
+    if backend == "disk":
+        return DiskConversionCacheBackend(
+            directory=os.getenv("CONVERSION_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=max_bytes,
+        )
+    if backend == "postgres":
+        return PostgresConversionCacheBackend(max_bytes=max_bytes)
+
+    logger.error(
+        f"Unknown CONVERSION_CACHE_BACKEND '{backend}', conversion cache disabled"
+    )
+    return None
+
+
+conversion_cache = ConversionCache(_create_backend())
@@ -1,34 +1,48 @@
 from typing import Protocol
 import logging
 from lib.config.env import config
+from lib.services.conversion_cache import conversion_cache
 
 logger = logging.getLogger(__name__)
 
 
 class FileConverterProtocol(Protocol):
+    # Identify the conversion output in the conversion cache
+    name: str
+    options: dict
 
     async def convert_to_markdown(self, file_path: str) -> str: ...
 
 
-async def convert_to_markdown(file_path: str) -> str:
-    if file_path.lower().endswith((".md", ".markdown")):
-        logger.info(f"File '{file_path}' is already markdown, reading directly")
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-
-    logger.info(
-        f"Converting file '{file_path}' to markdown using converter: '{config.FILE_CONVERTER}'"
-    )
-
+def _get_converter() -> FileConverterProtocol:
     if config.FILE_CONVERTER == "markitdown":
         from lib.services.converters.markitdown import markitdown_converter
 
-        return await markitdown_converter.convert_to_markdown(file_path)
+        return markitdown_converter
 
     elif config.FILE_CONVERTER == "docling":
         from lib.services.converters.docling import docling_converter
 
-        return await docling_converter.convert_to_markdown(file_path)
+        return docling_converter
 
     else:
         raise ValueError(f"Invalid file converter: {config.FILE_CONVERTER}")
+
+
+async def convert_to_markdown(file_path: str) -> str:
+    if file_path.lower().endswith((".md", ".markdown")):
+        logger.info(f"File '{file_path}' is already markdown, reading directly")
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    converter = _get_converter()
+
+    async def _convert(path: str) -> str:
+        logger.info(
+            f"Converting file '{path}' to markdown using converter: '{converter.name}'"
+        )
+        return await converter.convert_to_markdown(path)
+
+    return await conversion_cache.aconvert(
+        file_path, converter.name, converter.options, _convert
+    )
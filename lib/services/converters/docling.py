@@ -12,8 +12,26 @@ logger = logging.getLogger(__name__)
 
 POLL_INTERVAL_SECONDS = 5
 
+DOCLING_PARAMETERS = {
+    # See https://github.com/docling-project/docling-serve/blob/main/docs/usage.md for full list of parameters
+    "from_formats": ["docx", "html", "pdf", "md"],
+    "to_formats": ["md"],
+    "pipeline": "standard",
+    "image_export_mode": "placeholder",
+    "include_images": False,
+    "do_ocr": False,
+    "force_ocr": False,
+    "ocr_engine": "auto",
+    "ocr_lang": ["en"],
+    "table_mode": "fast",
+    "abort_on_error": False,
+    "document_timeout": 60 * 10,  # 10 minutes
+}
+
 
 class DoclingFileConverter(FileConverterProtocol):
+    name = "docling"
+    options = DOCLING_PARAMETERS
 
     async def convert_to_markdown(self, file_path: str) -> str:
         async_client = httpx.AsyncClient(timeout=60.0)
@@ -23,28 +41,13 @@ class DoclingFileConverter(FileConverterProtocol):
         headers = {
             "X-Api-Key": config.DOCLING_SERVE_API_KEY,
         }
-        parameters = {
-            # See https://github.com/docling-project/docling-serve/blob/main/docs/usage.md for full list of parameters
-            "from_formats": ["docx", "html", "pdf", "md"],
-            "to_formats": ["md"],
-            "pipeline": "standard",
-            "image_export_mode": "placeholder",
-            "include_images": False,
-            "do_ocr": False,
-            "force_ocr": False,
-            "ocr_engine": "auto",
-            "ocr_lang": ["en"],
-            "table_mode": "fast",
-            "abort_on_error": False,
-            "document_timeout": 60 * 10,  # 10 minutes
-        }
         filename = os.path.basename(file_path)
         file_type = mimetypes.guess_type(filename)[0] or "text/plain"
 
         with open(file_path, "rb") as file:
             files = {"files": (filename, file, file_type)}
             response = await async_client.post(
-                url, files=files, data=parameters, headers=headers
+                url, files=files, data=DOCLING_PARAMETERS, headers=headers
             )
 
         if response.status_code != 200:
@@ -1,15 +1,34 @@
-from markitdown import MarkItDown
+from typing import Optional
+
+from markitdown import MarkItDown, __version__ as markitdown_version
 
 from lib.services.converters.base import FileConverterProtocol
+from lib.services.converters.process_pool import conversion_pool
+
+MARKITDOWN_OPTIONS = {"enable_plugins": False}
+
+# Converter of a conversion pool process, created on its first conversion
+_process_converter: Optional[MarkItDown] = None
+
+
+def _convert_in_process(file_path: str) -> str:
+    global _process_converter
+    if _process_converter is None:
+        _process_converter = MarkItDown(**MARKITDOWN_OPTIONS)
+    try:
+        return _process_converter.convert(file_path).markdown
+    except Exception as e:
+        # MarkItDown errors hold tracebacks, which can't be sent back to the parent
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
 
 
 class MarkitdownFileConverter(FileConverterProtocol):
-    def __init__(self):
-        self.converter = MarkItDown(enable_plugins=False)
+    name = "markitdown"
+    options = {**MARKITDOWN_OPTIONS, "version": markitdown_version}
 
     async def convert_to_markdown(self, file_path: str) -> str:
-        result = self.converter.convert(file_path)
-        return result.markdown
+        # MarkItDown parses synchronously, run it off the event loop
+        return await conversion_pool.run(_convert_in_process, file_path)
 
 
 markitdown_converter = MarkitdownFileConverter()
@@ -0,0 +1,100 @@
+"""
+Process pool for CPU-heavy file conversions.
+
+Converters that parse documents in Python (MarkItDown) would otherwise block the
+event loop, and with it every other run of the process, for the whole conversion.
+Conversions run in a bounded pool of CONVERSION_WORKERS processes instead, so that
+the supporting files of a run convert in parallel across cores, and each conversion
+is limited to CONVERSION_TIMEOUT_SECONDS.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CONVERSION_WORKERS = int(
+    os.getenv("CONVERSION_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+CONVERSION_TIMEOUT_SECONDS = int(os.getenv("CONVERSION_TIMEOUT_SECONDS", "600"))
+
+T = TypeVar("T")
+
+
+class ConversionPool:
+    def __init__(self, max_workers: int, timeout_seconds: int):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking would copy the event loop, connection pools and their threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # The pool is created at import, before any event loop runs, and asyncio
+        # primitives are bound to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._slots
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run `func(*args)` in a worker process, killing it after the timeout."""
+        # Only submit when a worker is free, so that the timeout does not include
+        # the time spent waiting for one
+        async with self._get_slots():
+            while True:
+                executor = self._get_executor()
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.get_running_loop().run_in_executor(
+                            executor, func, *args
+                        ),
+                        timeout=self.timeout_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    self._terminate(executor)
+                    raise TimeoutError(
+                        f"Conversion did not finish within {self.timeout_seconds} seconds"
+                    )
+                except BrokenProcessPool:
+                    if executor is self._executor:
+                        # A worker process died (e.g. out of memory), start a new pool
+                        self._executor = None
+                        raise
+                    # The pool was terminated because of another conversion's timeout
+
+    def _terminate(self, executor: ProcessPoolExecutor) -> None:
+        # A running task can't be cancelled, only its process killed; the other
+        # conversions of the pool are retried on a new one
+        if self._executor is executor:
+            self._executor = None
+        logger.warning("Terminating the conversion pool after a conversion timeout")
+        # No public API exposes the worker processes
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+conversion_pool = ConversionPool(
+    max_workers=CONVERSION_WORKERS, timeout_seconds=CONVERSION_TIMEOUT_SECONDS
+)
@@ -0,0 +1,404 @@
+"""
+Pipelined indexer for supporting documents.
+
+Documents are split lazily and their pending chunks are packed into provider-sized
+embedding batches across documents. Batches are embedded concurrently as soon as they
+fill (bounded by INDEXING_MAX_CONCURRENT_BATCHES, and by the LLM governor across the
+process) and their rows are bulk-inserted with COPY as soon as each batch is
+embedded, so only the batches in flight are held in memory.
+
+Progress is tracked in the index manifest: a document is marked complete only
+once all its chunks are stored, and an interrupted document is resumed by embedding
+only the chunks that are not in its collection yet. A run holds an advisory lock on
+each of its documents, so that concurrent runs don't index a document twice. Locks are
+held on a connection of the run's own, outside of the shared pool: runs waiting for a
+document must not hold the pooled connections the run indexing it needs.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from langchain_core.documents import Document
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.models.document_index import DocumentIndex
+from lib.services.llm_governor import estimate_tokens
+from lib.services.vector_store import (
+    EMBEDDING_MODEL,
+    RAG_CHUNK_OVERLAP,
+    RAG_CHUNK_SIZE,
+    VectorStoreService,
+    get_collection_id,
+    get_vector_store_service,
+    is_index_current,
+)
+
+logger = logging.getLogger(__name__)
+
+# Provider limits are 2048 inputs and 300k tokens per embedding request
+EMBEDDING_BATCH_SIZE = 512
+EMBEDDING_BATCH_MAX_TOKENS = 200_000
+INDEXING_MAX_CONCURRENT_BATCHES = int(os.getenv("INDEXING_MAX_CONCURRENT_BATCHES", "4"))
+
+_COPY_EMBEDDINGS_STATEMENT = (
+    "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) "
+    "FROM STDIN"
+)
+
+
+class DocumentToIndex(BaseModel):
+    file_hash: str = Field(description="xxh128 hash of the uploaded file")
+    file_name: str
+    markdown: str
+
+
+class IndexingError(BaseModel):
+    file_name: str
+    error: str
+
+
+class IndexingReport(BaseModel):
+    """Outcome and throughput of an indexing run."""
+
+    documents_indexed: int = 0
+    documents_skipped: int = 0
+    chunks_indexed: int = 0
+    chunks_resumed: int = Field(
+        default=0, description="Chunks already stored by an interrupted run"
+    )
+    tokens_indexed: int = 0
+    seconds: float = 0.0
+    chunks_per_second: float = 0.0
+    tokens_per_second: float = 0.0
+    errors: Dict[str, IndexingError] = Field(
+        default_factory=dict, description="Errors by file hash"
+    )
+
+
+class _PendingChunk(BaseModel):
+    file_hash: str
+    document: Document
+    tokens: int
+
+
+class _DocumentProgress(BaseModel):
+    document: DocumentToIndex
+    collection_uuid: uuid.UUID
+    stored_indices: Set[int] = Field(description="Chunks stored by a previous run")
+    chunk_count: int = Field(default=0, description="Chunks split so far")
+    pending_count: int = Field(default=0, description="Chunks split but not stored")
+    is_split: bool = False
+    is_complete: bool = False
+
+
+class DocumentIndexer:
+    def __init__(self, vector_store: VectorStoreService):
+        self.vector_store = vector_store
+        # Each connection is opened for the run holding it and closed afterwards
+        self.lock_engine = create_async_engine(
+            vector_store.async_engine.url, poolclass=NullPool
+        )
+
+    async def index_documents(self, documents: List[DocumentToIndex]) -> IndexingReport:
+        """Index all documents that are not fully indexed yet."""
+        start = monotonic()
+        report = IndexingReport()
+
+        # Runs indexing the same document concurrently would each delete or resume
+        # its partial index and store the same chunks. Each document is locked until
+        # the run holding it stored its chunks, then the others find it complete.
+        # Locks are taken in hash order so that runs sharing documents don't deadlock,
+        # and are released when the lock connection is closed.
+        documents = list(
+            {document.file_hash: document for document in documents}.values()
+        )
+        async with self.lock_engine.connect() as lock_connection:
+            lock_connection = await lock_connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            for file_hash in sorted(document.file_hash for document in documents):
+                await lock_connection.execute(
+                    text("SELECT pg_advisory_lock(hashtext(:file_hash))"),
+                    {"file_hash": file_hash},
+                )
+            await self._index_locked_documents(documents, report)
+
+        report.seconds = monotonic() - start
+        if report.seconds > 0:
+            report.chunks_per_second = report.chunks_indexed / report.seconds
+            report.tokens_per_second = report.tokens_indexed / report.seconds
+
+        logger.info(
+            f"Indexed {report.chunks_indexed} chunks ({report.tokens_indexed} tokens) "
+            f"from {report.documents_indexed} documents in {report.seconds:.1f}s: "
+            f"{report.chunks_per_second:.1f} chunks/s, "
+            f"{report.tokens_per_second:.0f} tokens/s "
+            f"({report.documents_skipped} already indexed, "
+            f"{report.chunks_resumed} chunks resumed, {len(report.errors)} failed)"
+        )
+        return report
+
+    async def _index_locked_documents(
+        self, documents: List[DocumentToIndex], report: IndexingReport
+    ) -> None:
+        progress: Dict[str, _DocumentProgress] = {}
+
+        prepared = await asyncio.gather(
+            *[self._prepare_document(document) for document in documents],
+            return_exceptions=True,
+        )
+        for document, result in zip(documents, prepared):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to prepare {document.file_name}: {result}")
+                report.errors[document.file_hash] = IndexingError(
+                    file_name=document.file_name, error=str(result)
+                )
+                continue
+
+            if result is None:
+                report.documents_skipped += 1
+                continue
+
+            progress[document.file_hash] = result
+
+        semaphore = asyncio.Semaphore(INDEXING_MAX_CONCURRENT_BATCHES)
+        tasks: List[asyncio.Task] = []
+
+        async def _index_batch(batch: List[_PendingChunk]) -> None:
+            try:
+                await self._embed_and_store(batch, progress)
+            except Exception as e:
+                logger.error(f"Failed to index batch of {len(batch)} chunks: {e}")
+                # Failed documents stay incomplete and are resumed on the next run
+                for file_hash in {chunk.file_hash for chunk in batch}:
+                    report.errors[file_hash] = IndexingError(
+                        file_name=progress[file_hash].document.file_name, error=str(e)
+                    )
+                return
+            finally:
+                semaphore.release()
+
+            report.chunks_indexed += len(batch)
+            report.tokens_indexed += sum(chunk.tokens for chunk in batch)
+
+            for file_hash in {chunk.file_hash for chunk in batch}:
+                document_progress = progress[file_hash]
+                document_progress.pending_count -= sum(
+                    1 for chunk in batch if chunk.file_hash == file_hash
+                )
+                await self._complete_if_stored(document_progress, report)
+
+        # Batches are embedded and stored as soon as they fill, and the splitter only
+        # runs ahead of the batches in flight: at most INDEXING_MAX_CONCURRENT_BATCHES
+        # + 1 batches of chunks are held in memory whatever the documents' size
+        for batch in _iter_batches(self._iter_pending(progress, report)):
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(_index_batch(batch)))
+        await asyncio.gather(*tasks)
+
+        # Documents whose chunks were all stored before their splitting ended
+        for document_progress in progress.values():
+            await self._complete_if_stored(document_progress, report)
+
+    async def _prepare_document(
+        self, document: DocumentToIndex
+    ) -> Optional[_DocumentProgress]:
+        """
+        Find which chunks of a document are already stored, deleting a stale index.
+        Returns no progress if the document is already fully indexed.
+        """
+        manifest = await self.vector_store.get_index_manifest(document.file_hash)
+        if manifest is not None and is_index_current(manifest) and manifest.is_complete:
+            logger.info(f"{document.file_name} already indexed, skipping indexing")
+            return None
+
+        collection_id = get_collection_id(document.file_hash)
+        await self.vector_store._get_vectorstore(collection_id).acreate_collection()
+
+        async with self.vector_store.async_engine.begin() as connection:
+            collection_uuid = (
+                await connection.execute(
+                    text("SELECT uuid FROM langchain_pg_collection WHERE name = :name"),
+                    {"name": collection_id},
+                )
+            ).scalar_one()
+
+            if manifest is not None and is_index_current(manifest):
+                rows = await connection.execute(
+                    text(
+                        "SELECT (cmetadata->>'chunk_index')::int "
+                        "FROM langchain_pg_embedding WHERE collection_id = :uuid"
+                    ),
+                    {"uuid": collection_uuid},
+                )
+                stored_indices = set(rows.scalars().all())
+            else:
+                # New, stale or pre-manifest index: start over
+                await connection.execute(
+                    text(
+                        "DELETE FROM langchain_pg_embedding WHERE collection_id = :uuid"
+                    ),
+                    {"uuid": collection_uuid},
+                )
+                stored_indices = set()
+
+        if manifest is None or not is_index_current(manifest):
+            # Recorded with the current settings, so that an interruption is resumed
+            await self._save_manifest(document, collection_id, 0, False)
+
+        return _DocumentProgress(
+            document=document,
+            collection_uuid=collection_uuid,
+            stored_indices=stored_indices,
+        )
+
+    def _iter_pending(
+        self, progress: Dict[str, _DocumentProgress], report: IndexingReport
+    ) -> Iterator[_PendingChunk]:
+        """Split the documents lazily, yielding the chunks that are not stored yet."""
+        for document_progress in progress.values():
+            document = document_progress.document
+            collection_id = get_collection_id(document.file_hash)
+            # Splitting is deterministic, so chunk indices are stable across runs
+            try:
+                for doc in self.vector_store.splitter.iter_documents(
+                    document.markdown,
+                    metadata={
+                        "file_name": document.file_name,
+                        "collection_id": collection_id,
+                    },
+                ):
+                    document_progress.chunk_count += 1
+                    if doc.metadata["chunk_index"] in document_progress.stored_indices:
+                        continue
+                    document_progress.pending_count += 1
+                    yield _PendingChunk(
+                        file_hash=document.file_hash,
+                        document=doc,
+                        tokens=estimate_tokens([doc.page_content]),
+                    )
+            except Exception as e:
+                # The document stays incomplete and is resumed on the next run
+                logger.error(f"Failed to split {document.file_name}: {e}")
+                report.errors[document.file_hash] = IndexingError(
+                    file_name=document.file_name, error=str(e)
+                )
+                continue
+
+            document_progress.is_split = True
+            resumed_count = len(document_progress.stored_indices)
+            report.chunks_resumed += resumed_count
+            if resumed_count:
+                logger.info(
+                    f"Resuming {document.file_name}: {resumed_count}/"
+                    f"{document_progress.chunk_count} chunks already indexed"
+                )
+
+    async def _complete_if_stored(
+        self, document_progress: _DocumentProgress, report: IndexingReport
+    ) -> None:
+        if (
+            not document_progress.is_split
+            or document_progress.pending_count > 0
+            or document_progress.is_complete
+        ):
+            return
+        document_progress.is_complete = True
+        await self._mark_complete(document_progress)
+        report.documents_indexed += 1
+
+    async def _embed_and_store(
+        self, batch: List[_PendingChunk], progress: Dict[str, _DocumentProgress]
+    ) -> None:
+        embeddings = await self.vector_store.embeddings.aembed_documents(
+            [chunk.document.page_content for chunk in batch]
+        )
+
+        async with self.vector_store.async_engine.begin() as connection:
+            raw_connection = await connection.get_raw_connection()
+            async with raw_connection.driver_connection.cursor() as cursor:
+                async with cursor.copy(_COPY_EMBEDDINGS_STATEMENT) as copy:
+                    for chunk, embedding in zip(batch, embeddings):
+                        await copy.write_row(
+                            (
+                                str(uuid.uuid4()),
+                                progress[chunk.file_hash].collection_uuid,
+                                str(embedding),
+                                chunk.document.page_content,
+                                json.dumps(chunk.document.metadata),
+                            )
+                        )
+
+    async def _mark_complete(self, document_progress: _DocumentProgress) -> None:
+        document = document_progress.document
+        await self._save_manifest(
+            document,
+            get_collection_id(document.file_hash),
+            document_progress.chunk_count,
+            True,
+        )
+        logger.info(
+            f"Indexed {document_progress.chunk_count} chunks for {document.file_name}"
+        )
+
+    async def _save_manifest(
+        self,
+        document: DocumentToIndex,
+        collection_id: str,
+        chunk_count: int,
+        is_complete: bool,
+    ) -> None:
+        async with AsyncSession(self.vector_store.async_engine) as session:
+            await session.merge(
+                DocumentIndex(
+                    file_hash=document.file_hash,
+                    collection_id=collection_id,
+                    chunk_count=chunk_count,
+                    embedding_model=EMBEDDING_MODEL,
+                    chunk_size=RAG_CHUNK_SIZE,
+                    chunk_overlap=RAG_CHUNK_OVERLAP,
+                    indexed_at=datetime.now(timezone.utc),
+                    is_complete=is_complete,
+                )
+            )
+            await session.commit()
+
+
+def _iter_batches(chunks: Iterable[_PendingChunk]) -> Iterator[List[_PendingChunk]]:
+    """Pack chunks of all documents into batches within the provider request limits."""
+    batch: List[_PendingChunk] = []
+    batch_tokens = 0
+
+    for chunk in chunks:
+        if batch and (
+            len(batch) >= EMBEDDING_BATCH_SIZE
+            or batch_tokens + chunk.tokens > EMBEDDING_BATCH_MAX_TOKENS
+        ):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += chunk.tokens
+
+    if batch:
+        yield batch
+
+
+_document_indexer: Optional[DocumentIndexer] = None
+
+
+def get_document_indexer() -> DocumentIndexer:
+    """Get or create singleton document indexer."""
+    global _document_indexer
+    if _document_indexer is None:
+        _document_indexer = DocumentIndexer(get_vector_store_service())
+    return _document_indexer
@@ -0,0 +1,63 @@
+"""
+Content-addressed store of document bodies.
+
+The workflow state holds the converted markdown of the analyzed document and of
+every supporting file, and LangGraph writes the state into a checkpoint after every
+super-step. Bodies are instead stored once, under the xxh128 hash of their content,
+and `FileDocument` only carries that key (`markdown_ref`), loading the body on first
+access. Code restoring a state from a checkpoint loads the bodies beforehand in a
+thread (`ClaimSubstantiatorState.load_documents`), keeping disk reads out of the
+event loop.
+
+Bodies are files under DOCUMENT_STORE_DIR, by default the `documents` directory of
+the uploads volume, which the API and the workers share.
+"""
+
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from xxhash import xxh128
+
+from lib.config.env import config
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_STORE_DIR = os.getenv(
+    "DOCUMENT_STORE_DIR", os.path.join(config.FILE_UPLOADS_MOUNT_PATH, "documents")
+)
+# Bodies kept in memory by each process, most recently used first
+DOCUMENT_STORE_CACHE_SIZE = int(os.getenv("DOCUMENT_STORE_CACHE_SIZE", "32"))
+
+
+def _path(key: str) -> Path:
+    return Path(DOCUMENT_STORE_DIR) / key[:2] / f"{key}.md"
+
+
+def put_document(markdown: str) -> str:
+    """Store a document body, returning its key."""
+    key = xxh128(markdown.encode()).hexdigest()
+    path = _path(key)
+    if path.exists():
+        return key
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temporary file, processes and threads may store the same body
+    # concurrently
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as tmp_file:
+        tmp_file.write(markdown)
+    Path(tmp_file.name).replace(path)
+    return key
+
+
+@lru_cache(maxsize=DOCUMENT_STORE_CACHE_SIZE)
+def get_document(key: str) -> str:
+    """Body of a stored document; bodies never change, so they are cached."""
+    try:
+        return _path(key).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Document {key} not found in {DOCUMENT_STORE_DIR}")
@@ -0,0 +1,322 @@
+"""
+Shared cache of text embeddings keyed by model and a hash of the text.
+
+Embeddings are deterministic for a given model, so chunks of supporting documents
+shared across analyses, rebuilt collections, repeated RAG queries and sentences
+re-checked by fragment detection are embedded once. All embedding consumers get
+their client from `get_embeddings(model)`, which layers the cache over the LLM
+governor and the provider.
+
+The cache is opt-in through the EMBEDDING_CACHE_BACKEND env var:
+- unset / "none": disabled, calls go straight to the provider
+- "memory": in-process LRU of EMBEDDING_CACHE_MAX_ENTRIES vectors
+- "postgres": `embedding_cache_entries` table, shared by all workers, evicted by
+  least recent access beyond EMBEDDING_CACHE_MAX_ENTRIES
+
+Vectors are stored as raw float32 bytes, or float16 with
+EMBEDDING_CACHE_DTYPE=float16 to halve the storage.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Protocol
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+from pydantic import BaseModel, computed_field
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from lib.config.database import get_db
+from lib.models.embedding_cache_entry import EmbeddingCacheEntry
+from lib.services.llm_governor import GovernedEmbeddings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_MEMORY_MAX_ENTRIES = 10_000
+DEFAULT_DTYPE = "float32"
+# Evict after every N writes instead of on every write
+EVICTION_INTERVAL = 100
+
+
+class EmbeddingCacheStats(BaseModel):
+    """Hit/miss counters of the embedding cache for a single model."""
+
+    model: str
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _to_bytes(embedding: List[float], dtype: str) -> bytes:
+    return np.asarray(embedding, dtype=dtype).tobytes()
+
+
+def _from_bytes(data: bytes, dtype: str) -> List[float]:
+    return np.frombuffer(data, dtype=dtype).astype(np.float64).tolist()
+
+
+class EmbeddingCacheBackend(Protocol):
+    def get_many(
+        self, model: str, text_hashes: List[str]
+    ) -> Dict[str, List[float]]: ...
+
+    def set_many(self, model: str, embeddings: Dict[str, List[float]]) -> None: ...
+
+    def evict(self) -> None: ...
+
+
+class MemoryEmbeddingCacheBackend:
+    """Process-local LRU of packed vectors."""
+
+    def __init__(self, max_entries: int, dtype: str):
+        self.max_entries = max_entries
+        self.dtype = dtype
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        # Backends are called from worker threads
+        self._lock = threading.Lock()
+
+    def get_many(self, model: str, text_hashes: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for text_hash in text_hashes:
+                data = self._entries.get((model, text_hash))
+                if data is not None:
+                    self._entries.move_to_end((model, text_hash))
+                    found[text_hash] = _from_bytes(data, self.dtype)
+        return found
+
+    def set_many(self, model: str, embeddings: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for text_hash, embedding in embeddings.items():
+                self._entries[(model, text_hash)] = _to_bytes(embedding, self.dtype)
+                self._entries.move_to_end((model, text_hash))
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class PostgresEmbeddingCacheBackend:
+    """Stores packed vectors in the `embedding_cache_entries` table."""
+
+    def __init__(self, max_entries: int, dtype: str):
+        self.max_entries = max_entries
+        self.dtype = dtype
+
+    def get_many(self, model: str, text_hashes: List[str]) -> Dict[str, List[float]]:
+        with get_db() as db:
+            rows = db.execute(
+                select(
+                    EmbeddingCacheEntry.text_hash,
+                    EmbeddingCacheEntry.dtype,
+                    EmbeddingCacheEntry.embedding,
+                ).where(
+                    EmbeddingCacheEntry.model == model,
+                    EmbeddingCacheEntry.text_hash.in_(text_hashes),
+                )
+            ).all()
+            if rows:
+                db.execute(
+                    update(EmbeddingCacheEntry)
+                    .where(
+                        tuple_(
+                            EmbeddingCacheEntry.model, EmbeddingCacheEntry.text_hash
+                        ).in_([(model, row.text_hash) for row in rows])
+                    )
+                    .values(last_accessed_at=datetime.now(timezone.utc))
+                )
+                db.commit()
+            # Rows keep the dtype they were written with
+            return {
+                row.text_hash: _from_bytes(row.embedding, row.dtype) for row in rows
+            }
+
+    def set_many(self, model: str, embeddings: Dict[str, List[float]]) -> None:
+        now = datetime.now(timezone.utc)
+        with get_db() as db:
+            db.execute(
+                insert(EmbeddingCacheEntry)
+                .values(
+                    [
+                        {
+                            "model": model,
+                            "text_hash": text_hash,
+                            "dtype": self.dtype,
+                            "embedding": _to_bytes(embedding, self.dtype),
+                            "created_at": now,
+                            "last_accessed_at": now,
+                        }
+                        for text_hash, embedding in embeddings.items()
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+            db.commit()
+
+    def evict(self) -> None:
+        with get_db() as db:
+            # Keep the `max_entries` most recently used entries
+            cutoff = db.execute(
+                select(EmbeddingCacheEntry.last_accessed_at)
+                .order_by(EmbeddingCacheEntry.last_accessed_at.desc())
+                .offset(self.max_entries)
+                .limit(1)
+            ).scalar_one_or_none()
+            if cutoff is not None:
+                db.execute(
+                    delete(EmbeddingCacheEntry).where(
+                        EmbeddingCacheEntry.last_accessed_at <= cutoff
+                    )
+                )
+            db.commit()
+
+
+class EmbeddingCache:
+    def __init__(self, backend: Optional[EmbeddingCacheBackend] = None):
+        self.backend = backend
+        self._stats: Dict[str, EmbeddingCacheStats] = {}
+        self._writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _get_stats(self, model: str) -> EmbeddingCacheStats:
+        if model not in self._stats:
+            self._stats[model] = EmbeddingCacheStats(model=model)
+        return self._stats[model]
+
+    async def aembed_documents(
+        self, embeddings: Embeddings, model: str, texts: List[str]
+    ) -> List[List[float]]:
+        """Embed texts, calling `embeddings` only for texts not in the cache."""
+        if self.backend is None or not texts:
+            return await embeddings.aembed_documents(texts)
+
+        stats = self._get_stats(model)
+        text_hashes = [hash_text(text) for text in texts]
+
+        try:
+            cached = await asyncio.to_thread(
+                self.backend.get_many, model, list(set(text_hashes))
+            )
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed for {model}: {e}")
+            stats.errors += 1
+            cached = {}
+
+        # Embed each missing text once, even if it occurs several times
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash in cached:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+                missing.setdefault(text_hash, text)
+
+        if missing:
+            embedded = await embeddings.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), embedded))
+            cached.update(fresh)
+
+            try:
+                await asyncio.to_thread(self.backend.set_many, model, fresh)
+                self._writes += 1
+                if self._writes % EVICTION_INTERVAL == 0:
+                    await asyncio.to_thread(self.backend.evict)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed for {model}: {e}")
+                stats.errors += 1
+
+        return [cached[text_hash] for text_hash in text_hashes]
+
+    def stats(self) -> List[EmbeddingCacheStats]:
+        return list(self._stats.values())
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated texts from the embedding cache."""
+
+    def __init__(self, embeddings: Embeddings, model: str, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.cache.aembed_documents(self.embeddings, self.model, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        # OpenAI embeds queries and documents the same way, so both share entries
+        return (await self.aembed_documents([text]))[0]
+
+
+def _create_backend() -> Optional[EmbeddingCacheBackend]:
+    backend = os.getenv("EMBEDDING_CACHE_BACKEND", "none").lower()
+    dtype = os.getenv("EMBEDDING_CACHE_DTYPE", DEFAULT_DTYPE).lower()
+    if dtype not in ("float16", "float32"):
+        logger.error(f"Unknown EMBEDDING_CACHE_DTYPE '{dtype}', using {DEFAULT_DTYPE}")
+        dtype = DEFAULT_DTYPE
+
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryEmbeddingCacheBackend(
+            max_entries=int(
+                os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_MEMORY_MAX_ENTRIES)
+            ),
+            dtype=dtype,
+        )
+    if backend == "postgres":
+        return PostgresEmbeddingCacheBackend(
+            max_entries=int(
+                os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            ),
+            dtype=dtype,
+        )
+
+    logger.error(
+        f"Unknown EMBEDDING_CACHE_BACKEND '{backend}', embedding cache disabled"
+    )
+    return None
+
+
+embedding_cache = EmbeddingCache(_create_backend())
+
+_embeddings: Dict[str, CachedEmbeddings] = {}
+
+
+def get_embeddings(model: str) -> Embeddings:
+    """Get the shared embeddings client of a model (cache → governor → provider)."""
+    if model not in _embeddings:
+        _embeddings[model] = CachedEmbeddings(
+            GovernedEmbeddings(OpenAIEmbeddings(model=model), model=model),
+            model=model,
+            cache=embedding_cache,
+        )
+    return _embeddings[model]
@@ -8,20 +8,19 @@ from typing import Optional
 import uuid
 
 from fastapi import HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from lib.config.database import get_db
 from lib.models.feedback import Feedback, FeedbackType
 from lib.models.user import User
 from lib.models.workflow_run import WorkflowRun
 
 
-def _verify_workflow_run_ownership(
-    session, workflow_run_id: uuid.UUID, user: User
+async def _verify_workflow_run_ownership(
+    session: AsyncSession, workflow_run_id: uuid.UUID, user: User
 ) -> None:
     """Verify that the user owns the workflow run, raise 403 if not."""
-    workflow_run = (
-        session.query(WorkflowRun).filter(WorkflowRun.id == workflow_run_id).first()
-    )
+    workflow_run = await session.get(WorkflowRun, workflow_run_id)
 
     if workflow_run is None:
         raise HTTPException(status_code=404, detail="Workflow run not found")
@@ -30,8 +29,8 @@ def _verify_workflow_run_ownership(
         raise HTTPException(status_code=403, detail="Access denied")
 
 
-def create_feedback(
-    session,
+async def create_feedback(
+    session: AsyncSession,
     workflow_run_id: uuid.UUID,
     entity_path: dict,
     feedback_type: FeedbackType,
@@ -59,7 +58,7 @@ def create_feedback(
     Raises:
         HTTPException: If workflow run not found or user doesn't own it
     """
-    _verify_workflow_run_ownership(session, workflow_run_id, user)
+    await _verify_workflow_run_ownership(session, workflow_run_id, user)
 
     feedback = Feedback(
         workflow_run_id=workflow_run_id,
@@ -70,13 +69,13 @@ def create_feedback(
     )
 
     session.add(feedback)
-    session.commit()
-    session.refresh(feedback)
+    await session.commit()
+    await session.refresh(feedback)
     return feedback
 
 
-def create_or_update_feedback(
-    session,
+async def create_or_update_feedback(
+    session: AsyncSession,
     workflow_run_id: uuid.UUID,
     entity_path: dict,
     feedback_type: FeedbackType,
@@ -103,25 +102,26 @@ def create_or_update_feedback(
     Raises:
         HTTPException: If workflow run not found or user doesn't own it
     """
-    _verify_workflow_run_ownership(session, workflow_run_id, user)
+    await _verify_workflow_run_ownership(session, workflow_run_id, user)
 
     existing_feedback = (
-        session.query(Feedback)
-        .filter(Feedback.workflow_run_id == workflow_run_id)
-        .filter(Feedback.user_id == user.id)
-        .filter(Feedback.entity_path == entity_path)
-        .first()
-    )
+        await session.exec(
+            select(Feedback)
+            .where(Feedback.workflow_run_id == workflow_run_id)
+            .where(Feedback.user_id == user.id)
+            .where(Feedback.entity_path == entity_path)
+        )
+    ).first()
 
     if existing_feedback:
         existing_feedback.feedback_type = feedback_type
         existing_feedback.feedback_text = feedback_text
         session.add(existing_feedback)
-        session.commit()
-        session.refresh(existing_feedback)
+        await session.commit()
+        await session.refresh(existing_feedback)
         return existing_feedback
 
-    return create_feedback(
+    return await create_feedback(
         session=session,
         workflow_run_id=workflow_run_id,
         entity_path=entity_path,
@@ -131,8 +131,8 @@ def create_or_update_feedback(
     )
 
 
-def get_feedback(
-    session, workflow_run_id: uuid.UUID, entity_path: dict, user: User
+async def get_feedback(
+    session: AsyncSession, workflow_run_id: uuid.UUID, entity_path: dict, user: User
 ) -> Optional[Feedback]:
     """
     Get feedback for a specific entity.
@@ -149,19 +149,20 @@ def get_feedback(
     Raises:
         HTTPException: If workflow run not found or user doesn't own it
     """
-    _verify_workflow_run_ownership(session, workflow_run_id, user)
+    await _verify_workflow_run_ownership(session, workflow_run_id, user)
 
     return (
-        session.query(Feedback)
-        .filter(Feedback.workflow_run_id == workflow_run_id)
-        .filter(Feedback.user_id == user.id)
-        .filter(Feedback.entity_path == entity_path)
-        .first()
-    )
+        await session.exec(
+            select(Feedback)
+            .where(Feedback.workflow_run_id == workflow_run_id)
+            .where(Feedback.user_id == user.id)
+            .where(Feedback.entity_path == entity_path)
+        )
+    ).first()
 
 
-def get_workflow_feedback(
-    session, workflow_run_id: uuid.UUID, user: User
+async def get_workflow_feedback(
+    session: AsyncSession, workflow_run_id: uuid.UUID, user: User
 ) -> list[Feedback]:
     """
     Get all feedback for a workflow run.
@@ -177,17 +178,20 @@ def get_workflow_feedback(
     Raises:
         HTTPException: If workflow run not found or user doesn't own it
     """
-    _verify_workflow_run_ownership(session, workflow_run_id, user)
+    await _verify_workflow_run_ownership(session, workflow_run_id, user)
 
     return (
-        session.query(Feedback)
-        .filter(Feedback.workflow_run_id == workflow_run_id)
-        .filter(Feedback.user_id == user.id)
-        .all()
-    )
+        await session.exec(
+            select(Feedback)
+            .where(Feedback.workflow_run_id == workflow_run_id)
+            .where(Feedback.user_id == user.id)
+        )
+    ).all()
 
 
-def delete_feedback(session, feedback_id: uuid.UUID, user: User) -> bool:
+async def delete_feedback(
+    session: AsyncSession, feedback_id: uuid.UUID, user: User
+) -> bool:
     """
     Delete feedback by ID.
 
@@ -202,7 +206,7 @@ def delete_feedback(session, feedback_id: uuid.UUID, user: User) -> bool:
     Raises:
         HTTPException: If user doesn't own the feedback
     """
-    feedback = session.query(Feedback).filter(Feedback.id == feedback_id).first()
+    feedback = await session.get(Feedback, feedback_id)
 
     if feedback is None:
         return False
@@ -210,6 +214,6 @@ def delete_feedback(session, feedback_id: uuid.UUID, user: User) -> bool:
     if feedback.user_id != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    session.delete(feedback)
-    session.commit()
+    await session.delete(feedback)
+    await session.commit()
     return True
@@ -1,10 +1,21 @@
+import asyncio
 import mimetypes
 import os
+from typing import Optional
 
 from langchain_core.messages.utils import count_tokens_approximately
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    SerializationInfo,
+    computed_field,
+    model_serializer,
+    model_validator,
+)
 
 from lib.services.converters.base import convert_to_markdown
+from lib.services.document_store import get_document, put_document
 
 
 class FileDocument(BaseModel):
@@ -15,11 +26,50 @@ class FileDocument(BaseModel):
         description="The path to the uploaded file, as saved in the file system"
     )
     file_type: str = Field(description="The MIME type of the uploaded file")
-    markdown: str = Field(description="The uploaded file content converted to markdown")
+    markdown_ref: Optional[str] = Field(
+        default=None,
+        description="The key of the markdown content in the document store, if stored there",
+    )
     markdown_token_count: int = Field(
         description="The approximate number of tokens in the markdown content"
     )
 
+    _markdown: Optional[str] = PrivateAttr(default=None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _take_markdown(cls, data, handler):
+        # `markdown` is not a field, keep the content passed in
+        markdown = None
+        if isinstance(data, dict) and "markdown" in data:
+            data = dict(data)
+            markdown = data.pop("markdown")
+        file_document = handler(data)
+        if markdown is not None:
+            file_document._markdown = markdown
+        return file_document
+
+    @computed_field(description="The uploaded file content converted to markdown")
+    @property
+    def markdown(self) -> str:
+        if self._markdown is None and self.markdown_ref is not None:
+            self._markdown = get_document(self.markdown_ref)
+        return self._markdown or ""
+
+    async def load_markdown(self) -> None:
+        """Load the stored markdown in a thread, `markdown` then reads it from memory."""
+        if self._markdown is None and self.markdown_ref is not None:
+            self._markdown = await asyncio.to_thread(get_document, self.markdown_ref)
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler, info: SerializationInfo):
+        data = handler(self)
+        # Checkpoints are python mode dumps: keep stored content out of them, while
+        # JSON (API responses, job payloads) still includes it
+        if info.mode == "python" and self.markdown_ref is not None:
+            data.pop("markdown", None)
+        return data
+
     def __hash__(self):
         return hash((self.file_path))
 
@@ -30,6 +80,22 @@ class FileDocument(BaseModel):
         return self.file_path == other.file_path
 
 
+async def create_file_document(
+    file_path: str, file_name: str, file_type: str, markdown: str
+) -> FileDocument:
+    """File document with its markdown put in the document store."""
+    markdown_ref = await asyncio.to_thread(put_document, markdown)
+
+    return FileDocument(
+        file_path=str(file_path),
+        file_name=file_name,
+        file_type=file_type,
+        markdown=markdown,
+        markdown_ref=markdown_ref,
+        markdown_token_count=count_tokens_approximately([markdown]),
+    )
+
+
 async def create_file_document_from_path(
     file_path: str, original_file_name: str = None, markdown_convert: bool = True
 ) -> FileDocument:
@@ -41,14 +107,15 @@ async def create_file_document_from_path(
     file_type = mimetypes.guess_type(file_name)[0] or "text/plain"
 
     markdown = await convert_to_markdown(file_path) if markdown_convert else ""
-    markdown_token_count = count_tokens_approximately([markdown])
+    if markdown_convert:
+        return await create_file_document(file_path, file_name, file_type, markdown)
 
     file_document = FileDocument(
         file_path=str(file_path),
         file_name=file_name,
         file_type=file_type,
         markdown=markdown,
-        markdown_token_count=markdown_token_count,
+        markdown_token_count=count_tokens_approximately([markdown]),
     )
 
     return file_document
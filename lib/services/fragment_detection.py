@@ -197,6 +197,7 @@ HIGH_SIMILARITY_THRESHOLD = 0.95
 VERY_HIGH_SIMILARITY_THRESHOLD = 0.98
 SHORT_HIGH_SIMILARITY_PENALTY = 3
 HIGH_SIMILARITY_PENALTY = 2
+SEMANTIC_EMBEDDING_MODEL = "text-embedding-3-small"
 
 
 async def detect_by_semantic_coherence(
@@ -221,13 +222,15 @@ async def detect_by_semantic_coherence(
         return (False, 0)
 
     try:
-        from langchain_openai import OpenAIEmbeddings
+        import langchain_openai  # noqa: F401
     except ImportError:
         return detect_by_reconstruction_quality(sentences, original_paragraph or "")
 
     suspicion_score = 0
 
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    from lib.services.embedding_cache import get_embeddings
+
+    embeddings = get_embeddings(SEMANTIC_EMBEDDING_MODEL)
 
     try:
         embedded = await embeddings.aembed_documents(filtered)
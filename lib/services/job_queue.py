@@ -0,0 +1,260 @@
+"""
+Durable Postgres queue of analysis jobs.
+
+The API enqueues a job per analysis and returns immediately; analysis workers
+(`worker.py`) claim jobs with `FOR UPDATE SKIP LOCKED`, so any number of workers on
+any number of nodes can poll the same table without claiming a job twice.
+
+A claimed job is leased for JOB_VISIBILITY_TIMEOUT_SECONDS and the worker keeps
+extending the lease while the analysis runs. If the worker crashes or its pod is
+killed, the lease expires and the job becomes claimable again; the next attempt
+resumes the workflow from its last LangGraph checkpoint. Jobs that failed or were
+abandoned JOB_MAX_ATTEMPTS times are marked failed.
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel, computed_field
+from sqlalchemy import and_, func, or_
+from sqlmodel import select, update
+
+from lib.config.database import get_async_db
+from lib.models.analysis_job import AnalysisJob, AnalysisJobStatus
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.state import SubstantiationWorkflowConfig
+
+logger = logging.getLogger(__name__)
+
+JOB_VISIBILITY_TIMEOUT_SECONDS = int(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY_SECONDS = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "30"))
+
+
+class AnalysisJobPayload(BaseModel):
+    main_file: FileDocument
+    supporting_files: Optional[List[FileDocument]] = None
+    config: SubstantiationWorkflowConfig
+
+
+class JobQueueStats(BaseModel):
+    """Depth of the analysis queue, used to autoscale the workers."""
+
+    queued: int = 0
+    running: int = 0
+    failed: int = 0
+    oldest_queued_seconds: float = 0.0
+
+    @computed_field
+    @property
+    def depth(self) -> int:
+        return self.queued + self.running
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue_analysis(
+    workflow_run_id: str,
+    main_file: FileDocument,
+    supporting_files: Optional[List[FileDocument]],
+    config: SubstantiationWorkflowConfig,
+) -> AnalysisJob:
+    now = _now()
+    job = AnalysisJob(
+        id=uuid.uuid4(),
+        workflow_run_id=uuid.UUID(workflow_run_id),
+        session_id=config.session_id,
+        payload=AnalysisJobPayload(
+            main_file=main_file, supporting_files=supporting_files, config=config
+        ).model_dump(mode="json"),
+        status=AnalysisJobStatus.QUEUED,
+        attempts=0,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        available_at=now,
+        created_at=now,
+    )
+    async with get_async_db() as db:
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+    logger.info(f"Enqueued analysis job {job.id} for session {job.session_id}")
+    return job
+
+
+def _claimable():
+    now = func.now()
+    return and_(
+        AnalysisJob.attempts < AnalysisJob.max_attempts,
+        or_(
+            and_(
+                AnalysisJob.status == AnalysisJobStatus.QUEUED,
+                AnalysisJob.available_at <= now,
+            ),
+            # Lease of a crashed worker expired
+            and_(
+                AnalysisJob.status == AnalysisJobStatus.RUNNING,
+                AnalysisJob.locked_until < now,
+            ),
+        ),
+    )
+
+
+async def claim_job(worker_id: str) -> Optional[AnalysisJob]:
+    """Lease the oldest claimable job to the worker, or return None if there is none."""
+    async with get_async_db() as db:
+        next_job_id = (
+            select(AnalysisJob.id)
+            .where(_claimable())
+            .order_by(AnalysisJob.available_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        job = (
+            await db.exec(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == next_job_id)
+                .values(
+                    status=AnalysisJobStatus.RUNNING,
+                    attempts=AnalysisJob.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=func.now()
+                    + timedelta(seconds=JOB_VISIBILITY_TIMEOUT_SECONDS),
+                    started_at=func.coalesce(AnalysisJob.started_at, func.now()),
+                )
+                .returning(AnalysisJob)
+            )
+        ).first()
+        await db.commit()
+
+    if job is None:
+        return None
+    job = job[0]
+    logger.info(
+        f"Worker {worker_id} claimed job {job.id} "
+        f"(attempt {job.attempts}/{job.max_attempts})"
+    )
+    return job
+
+
+async def extend_lease(job: AnalysisJob, worker_id: str) -> bool:
+    """Extend the lease of a running job. Returns False if the worker lost the job."""
+    async with get_async_db() as db:
+        result = await db.exec(
+            update(AnalysisJob)
+            .where(
+                AnalysisJob.id == job.id,
+                AnalysisJob.locked_by == worker_id,
+                AnalysisJob.status == AnalysisJobStatus.RUNNING,
+            )
+            .values(
+                locked_until=func.now()
+                + timedelta(seconds=JOB_VISIBILITY_TIMEOUT_SECONDS)
+            )
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+
+async def complete_job(job: AnalysisJob) -> None:
+    await _finish_job(job, status=AnalysisJobStatus.COMPLETED)
+    logger.info(f"Job {job.id} completed")
+
+
+async def fail_job(job: AnalysisJob, error: str) -> None:
+    """Record a failed attempt: retry after a delay, or fail after the last attempt."""
+    if job.attempts < job.max_attempts:
+        await _finish_job(
+            job,
+            status=AnalysisJobStatus.QUEUED,
+            last_error=error,
+            available_at=_now() + timedelta(seconds=JOB_RETRY_DELAY_SECONDS),
+            finished_at=None,
+        )
+        logger.warning(f"Job {job.id} failed, retrying: {error}")
+    else:
+        await _finish_job(job, status=AnalysisJobStatus.FAILED, last_error=error)
+        logger.error(f"Job {job.id} failed after {job.attempts} attempts: {error}")
+
+
+async def release_job(job: AnalysisJob) -> None:
+    """Hand a job back to the queue without counting the attempt (worker shutdown)."""
+    await _finish_job(
+        job,
+        status=AnalysisJobStatus.QUEUED,
+        attempts=AnalysisJob.attempts - 1,
+        available_at=_now(),
+        finished_at=None,
+    )
+    logger.info(f"Job {job.id} released back to the queue")
+
+
+async def _finish_job(job: AnalysisJob, status: AnalysisJobStatus, **values) -> None:
+    async with get_async_db() as db:
+        await db.exec(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job.id)
+            .values(
+                **{
+                    "status": status,
+                    "locked_by": None,
+                    "locked_until": None,
+                    "finished_at": _now(),
+                    **values,
+                }
+            )
+        )
+        await db.commit()
+
+
+async def fail_abandoned_jobs() -> int:
+    """Mark jobs whose lease expired on their last attempt as failed."""
+    async with get_async_db() as db:
+        result = await db.exec(
+            update(AnalysisJob)
+            .where(
+                AnalysisJob.status == AnalysisJobStatus.RUNNING,
+                AnalysisJob.locked_until < func.now(),
+                AnalysisJob.attempts >= AnalysisJob.max_attempts,
+            )
+            .values(
+                status=AnalysisJobStatus.FAILED,
+                locked_by=None,
+                locked_until=None,
+                finished_at=func.now(),
+                last_error="Lease expired on the last attempt",
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def get_job_queue_stats() -> JobQueueStats:
+    async with get_async_db() as db:
+        rows = (
+            await db.exec(
+                select(
+                    AnalysisJob.status,
+                    func.count(),
+                    func.min(AnalysisJob.available_at),
+                )
+                .where(AnalysisJob.status != AnalysisJobStatus.COMPLETED)
+                .group_by(AnalysisJob.status)
+            )
+        ).all()
+
+    stats = JobQueueStats()
+    for status, count, oldest in rows:
+        if status == AnalysisJobStatus.QUEUED:
+            stats.queued = count
+            stats.oldest_queued_seconds = max(0.0, (_now() - oldest).total_seconds())
+        elif status == AnalysisJobStatus.RUNNING:
+            stats.running = count
+        elif status == AnalysisJobStatus.FAILED:
+            stats.failed = count
+    return stats
@@ -0,0 +1,362 @@
+"""
+Content-addressed cache for structured agent LLM responses.
+
+Agents route their model call through `llm_cache.ainvoke`, which looks up a response
+keyed on the agent name, model, temperature, output schema and a hash of the rendered
+prompt messages. The model and temperature are read from the agent's chat model, so
+the key always matches the settings the model was created with. Identical prompts
+(e.g. re-running a document or re-evaluating a chunk with the same agents) are then
+served without calling the provider.
+
+The cache is opt-in through the LLM_CACHE_BACKEND env var:
+- unset / "none": disabled, calls go straight to the provider
+- "disk": JSON files under LLM_CACHE_DIR, evicted by LLM_CACHE_MAX_BYTES
+- "postgres": `llm_cache_entries` table, evicted by LLM_CACHE_MAX_ENTRIES
+
+Entries expire after LLM_CACHE_TTL_SECONDS. Runs that must be fresh can skip lookups
+with `llm_cache.bypass()` (results are still written back to refresh the cache).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import time
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Type
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableBinding, RunnableSequence
+from langchain_core.runnables.config import RunnableConfig
+from pydantic import BaseModel, computed_field
+from sqlalchemy import delete, select
+
+from lib.config.database import get_db
+from lib.models.llm_cache_entry import LLMCacheEntry
+from lib.services.llm_governor import llm_governor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_CACHE_DIR = ".cache/llm"
+# Evict after every N writes instead of on every write
+EVICTION_INTERVAL = 100
+# Last access times are only updated once they are this old, so that cache hits
+# don't each write to the database. Eviction is least recently used to this precision
+LAST_ACCESS_RESOLUTION = timedelta(hours=1)
+
+_bypass_cache: ContextVar[bool] = ContextVar("bypass_llm_cache", default=False)
+
+
+class LLMCacheStats(BaseModel):
+    """Hit/miss counters of the LLM cache for a single agent."""
+
+    agent_name: str
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    errors: int = 0
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _serialize_messages(messages: Any) -> str:
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    if isinstance(messages, str):
+        return messages
+    return json.dumps(
+        [
+            {"type": getattr(m, "type", None), "content": getattr(m, "content", m)}
+            for m in messages
+        ],
+        sort_keys=True,
+        default=str,
+    )
+
+
+def get_model_settings(llm: Runnable) -> Tuple[str, Optional[float]]:
+    """
+    Provider model name and temperature of the chat model an agent runnable wraps,
+    e.g. one built with `init_chat_model(...).with_structured_output(...)`.
+    """
+    runnable = llm
+    while not isinstance(runnable, BaseChatModel):
+        if isinstance(runnable, RunnableSequence):
+            runnable = runnable.first
+        elif isinstance(runnable, RunnableBinding):
+            runnable = runnable.bound
+        else:
+            raise TypeError(f"No chat model found in {type(llm).__name__}")
+
+    model = getattr(runnable, "model_name", None) or getattr(runnable, "model", None)
+    return model, getattr(runnable, "temperature", None)
+
+
+def build_cache_key(
+    agent_name: str,
+    model: str,
+    temperature: Optional[float],
+    output_schema: Type[BaseModel],
+    messages: Any,
+) -> str:
+    """SHA-256 over everything that determines the response of a structured LLM call."""
+    messages_hash = hashlib.sha256(_serialize_messages(messages).encode()).hexdigest()
+    key_data = json.dumps(
+        {
+            "agent_name": agent_name,
+            "model": model,
+            "temperature": temperature,
+            "output_schema": output_schema.model_json_schema(),
+            "messages": messages_hash,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+class LLMCacheBackend(Protocol):
+    def get(self, key: str) -> Optional[dict]: ...
+
+    def set(self, key: str, agent_name: str, model: str, response: dict) -> None: ...
+
+    def evict(self) -> None: ...
+
+
+class DiskCacheBackend:
+    """Stores one JSON file per entry; least recently used files are evicted first."""
+
+    def __init__(self, directory: str, ttl_seconds: int, max_bytes: int):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            if time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            data = json.loads(path.read_text())
+            # mtime doubles as last access time for LRU eviction
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, agent_name: str, model: str, response: dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file, as the same key may be stored by several processes
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_file.write(json.dumps(response))
+        Path(tmp_file.name).replace(path)
+
+    def evict(self) -> None:
+        now = time()
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+
+class PostgresCacheBackend:
+    """Stores entries in the `llm_cache_entries` table."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        with get_db() as db:
+            entry = db.get(LLMCacheEntry, key)
+            if entry is None or entry.expires_at <= now:
+                return None
+            if entry.last_accessed_at <= now - LAST_ACCESS_RESOLUTION:
+                entry.last_accessed_at = now
+                db.commit()
+            return entry.response
+
+    def set(self, key: str, agent_name: str, model: str, response: dict) -> None:
+        now = datetime.now(timezone.utc)
+        with get_db() as db:
+            db.merge(
+                LLMCacheEntry(
+                    key=key,
+                    agent_name=agent_name,
+                    model=model,
+                    response=response,
+                    size_bytes=len(json.dumps(response)),
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                    last_accessed_at=now,
+                )
+            )
+            db.commit()
+
+    def evict(self) -> None:
+        now = datetime.now(timezone.utc)
+        with get_db() as db:
+            db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= now))
+
+            # Keep the `max_entries` most recently used entries
+            cutoff = db.execute(
+                select(LLMCacheEntry.last_accessed_at)
+                .order_by(LLMCacheEntry.last_accessed_at.desc())
+                .offset(self.max_entries)
+                .limit(1)
+            ).scalar_one_or_none()
+            if cutoff is not None:
+                db.execute(
+                    delete(LLMCacheEntry).where(
+                        LLMCacheEntry.last_accessed_at <= cutoff
+                    )
+                )
+            db.commit()
+
+
+class LLMCache:
+    def __init__(self, backend: Optional[LLMCacheBackend] = None):
+        self.backend = backend
+        self._stats: Dict[str, LLMCacheStats] = {}
+        self._writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @contextmanager
+    def bypass(self, enabled: bool = True):
+        """Skip cache lookups for all agent calls made within this context."""
+        token = _bypass_cache.set(enabled)
+        try:
+            yield
+        finally:
+            _bypass_cache.reset(token)
+
+    def _get_stats(self, agent_name: str) -> LLMCacheStats:
+        if agent_name not in self._stats:
+            self._stats[agent_name] = LLMCacheStats(agent_name=agent_name)
+        return self._stats[agent_name]
+
+    async def ainvoke(
+        self,
+        llm: Runnable,
+        messages: Any,
+        *,
+        agent_name: str,
+        output_schema: Type[BaseModel],
+        config: RunnableConfig = None,
+    ) -> BaseModel:
+        """
+        Invoke a structured-output LLM through the cache and the LLM governor.
+
+        Args:
+            llm: Chat model bound to `output_schema` via `with_structured_output`,
+                its model name and temperature are part of the key
+            messages: Rendered prompt messages
+            agent_name: Name of the calling agent (part of the key, used for stats)
+            output_schema: Pydantic model returned by the LLM
+            config: Runnable config forwarded to the LLM (callbacks, tracing)
+        """
+        model, temperature = get_model_settings(llm)
+        if self.backend is None:
+            async with llm_governor.limit(model, messages):
+                return await llm.ainvoke(messages, config=config)
+
+        stats = self._get_stats(agent_name)
+        key = build_cache_key(agent_name, model, temperature, output_schema, messages)
+
+        if _bypass_cache.get():
+            stats.bypassed += 1
+        else:
+            try:
+                cached = await asyncio.to_thread(self.backend.get, key)
+            except Exception as e:
+                logger.warning(f"LLM cache lookup failed for {agent_name}: {e}")
+                stats.errors += 1
+                cached = None
+
+            if cached is not None:
+                stats.hits += 1
+                return output_schema.model_validate(cached)
+            stats.misses += 1
+
+        async with llm_governor.limit(model, messages):
+            response = await llm.ainvoke(messages, config=config)
+
+        try:
+            await asyncio.to_thread(
+                self.backend.set,
+                key,
+                agent_name,
+                model,
+                response.model_dump(mode="json"),
+            )
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 0:
+                await asyncio.to_thread(self.backend.evict)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed for {agent_name}: {e}")
+            stats.errors += 1
+
+        return response
+
+    def stats(self) -> List[LLMCacheStats]:
+        return list(self._stats.values())
+
+
+def _create_backend() -> Optional[LLMCacheBackend]:
+    backend = os.getenv("LLM_CACHE_BACKEND", "none").lower()
+    ttl_seconds = int(os.getenv("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+    if backend == "none":
+        return None
+    if backend == "disk":
+        return DiskCacheBackend(
+            directory=os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR),
+            ttl_seconds=ttl_seconds,
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        )
+    if backend == "postgres":
+        return PostgresCacheBackend(
+            ttl_seconds=ttl_seconds,
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        )
+
+    logger.error(f"Unknown LLM_CACHE_BACKEND '{backend}', LLM cache disabled")
+    return None
+
+
+llm_cache = LLMCache(_create_backend())
@@ -0,0 +1,333 @@
+"""
+Process-wide governor for LLM and embedding calls.
+
+Every agent `ainvoke` acquires a slot from the governor before calling the model
+provider, so concurrent workflow runs and parallel graph branches share a single
+set of per-model limits instead of each creating their own semaphore.
+
+Each model has:
+- a concurrency limit that adapts automatically (halved on rate-limit responses,
+  grown back by one after a streak of successful calls)
+- optional requests-per-minute and tokens-per-minute budgets (sliding window)
+
+Limits can be overridden with the LLM_GOVERNOR_LIMITS env var, a JSON object keyed
+by model name, e.g. '{"gpt-5": {"max_concurrency": 20, "tokens_per_minute": 800000}}'.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages.utils import count_tokens_approximately
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WINDOW_SECONDS = 60
+RATE_LIMIT_STATUS_CODE = 429
+DEFAULT_RATE_LIMIT_COOLDOWN_SECONDS = 5.0
+WAIT_SAMPLES_SIZE = 200
+
+
+class ModelLimits(BaseModel):
+    """Limits applied to all calls made against a single model."""
+
+    max_concurrency: int = Field(ge=1, description="Upper bound of in-flight calls")
+    min_concurrency: int = Field(
+        default=1, ge=1, description="Lower bound when backing off on rate limits"
+    )
+    requests_per_minute: Optional[int] = Field(
+        default=None, description="Requests-per-minute budget (None = unlimited)"
+    )
+    tokens_per_minute: Optional[int] = Field(
+        default=None, description="Tokens-per-minute budget (None = unlimited)"
+    )
+
+
+DEFAULT_MODEL_LIMITS: Dict[str, ModelLimits] = {
+    "gpt-5": ModelLimits(
+        max_concurrency=30, requests_per_minute=500, tokens_per_minute=2_000_000
+    ),
+    "gpt-5-mini": ModelLimits(
+        max_concurrency=50, requests_per_minute=1000, tokens_per_minute=4_000_000
+    ),
+    "gpt-4.1": ModelLimits(
+        max_concurrency=30, requests_per_minute=500, tokens_per_minute=2_000_000
+    ),
+    "text-embedding-3-large": ModelLimits(
+        max_concurrency=20, requests_per_minute=3000, tokens_per_minute=5_000_000
+    ),
+    "text-embedding-3-small": ModelLimits(
+        max_concurrency=20, requests_per_minute=3000, tokens_per_minute=5_000_000
+    ),
+}
+
+FALLBACK_MODEL_LIMITS = ModelLimits(max_concurrency=15)
+
+
+class ModelGovernorStats(BaseModel):
+    """Live snapshot of a model limiter, used to size pods."""
+
+    model: str
+    concurrency_limit: int
+    max_concurrency: int
+    in_flight: int
+    queue_depth: int
+    requests_last_minute: int
+    tokens_last_minute: int
+    total_requests: int
+    rate_limited_count: int
+    avg_wait_seconds: float
+    max_wait_seconds: float
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check if an exception raised by a provider client is a rate-limit response."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code == RATE_LIMIT_STATUS_CODE
+
+
+def _get_retry_after_seconds(error: BaseException) -> float:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", DEFAULT_RATE_LIMIT_COOLDOWN_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_RATE_LIMIT_COOLDOWN_SECONDS
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Approximate the token count of prompt messages, prompt values or raw texts."""
+    if not messages:
+        return 0
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    return count_tokens_approximately(messages)
+
+
+class ModelLimiter:
+    """Adaptive concurrency + RPM/TPM limiter for a single model."""
+
+    def __init__(self, model: str, limits: ModelLimits):
+        self.model = model
+        self.limits = limits
+        self.concurrency_limit = limits.max_concurrency
+
+        self._in_flight = 0
+        self._waiting = 0
+        self._success_streak = 0
+        self._paused_until = 0.0
+        self._window: deque[tuple[float, int]] = deque()
+        self._wait_samples: deque[float] = deque(maxlen=WAIT_SAMPLES_SIZE)
+        self._total_requests = 0
+        self._rate_limited_count = 0
+
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # asyncio primitives are bound to the loop they are first used on, so
+        # recreate the condition if the governor is used from a new event loop
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    def _prune_window(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= RATE_LIMIT_WINDOW_SECONDS:
+            self._window.popleft()
+
+    def _seconds_until_allowed(self, tokens: int, now: float) -> float:
+        """Return 0 if a call can start now, otherwise how long to wait before retrying."""
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        if self._in_flight >= self.concurrency_limit:
+            # Woken up by release(); the timeout is only a safety net
+            return RATE_LIMIT_WINDOW_SECONDS
+
+        self._prune_window(now)
+        if not self._window:
+            return 0
+
+        over_rpm = (
+            self.limits.requests_per_minute is not None
+            and len(self._window) >= self.limits.requests_per_minute
+        )
+        used_tokens = sum(t for _, t in self._window)
+        over_tpm = (
+            self.limits.tokens_per_minute is not None
+            and used_tokens + tokens > self.limits.tokens_per_minute
+        )
+        if not over_rpm and not over_tpm:
+            return 0
+
+        oldest_timestamp = self._window[0][0]
+        return max(oldest_timestamp + RATE_LIMIT_WINDOW_SECONDS - now, 0.01)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        condition = self._get_condition()
+        start = monotonic()
+        self._waiting += 1
+        try:
+            async with condition:
+                while True:
+                    now = monotonic()
+                    wait_seconds = self._seconds_until_allowed(tokens, now)
+                    if wait_seconds <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=wait_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+
+                self._in_flight += 1
+                self._total_requests += 1
+                self._window.append((monotonic(), tokens))
+        finally:
+            self._waiting -= 1
+
+        self._wait_samples.append(monotonic() - start)
+
+    async def release(self, error: Optional[BaseException] = None) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            if error is not None and is_rate_limit_error(error):
+                self._on_rate_limited(error)
+            elif error is None:
+                self._on_success()
+            condition.notify_all()
+
+    def _on_rate_limited(self, error: BaseException) -> None:
+        self._rate_limited_count += 1
+        self._success_streak = 0
+        previous_limit = self.concurrency_limit
+        self.concurrency_limit = max(
+            self.limits.min_concurrency, self.concurrency_limit // 2
+        )
+        self._paused_until = max(
+            self._paused_until, monotonic() + _get_retry_after_seconds(error)
+        )
+        logger.warning(
+            f"LLM governor: rate limited on {self.model}, reducing concurrency "
+            f"{previous_limit} -> {self.concurrency_limit}"
+        )
+
+    def _on_success(self) -> None:
+        if self.concurrency_limit >= self.limits.max_concurrency:
+            return
+
+        self._success_streak += 1
+        if self._success_streak >= self.concurrency_limit:
+            self._success_streak = 0
+            self.concurrency_limit += 1
+
+    def stats(self) -> ModelGovernorStats:
+        now = monotonic()
+        self._prune_window(now)
+        wait_samples = list(self._wait_samples)
+        return ModelGovernorStats(
+            model=self.model,
+            concurrency_limit=self.concurrency_limit,
+            max_concurrency=self.limits.max_concurrency,
+            in_flight=self._in_flight,
+            queue_depth=self._waiting,
+            requests_last_minute=len(self._window),
+            tokens_last_minute=sum(t for _, t in self._window),
+            total_requests=self._total_requests,
+            rate_limited_count=self._rate_limited_count,
+            avg_wait_seconds=(
+                sum(wait_samples) / len(wait_samples) if wait_samples else 0.0
+            ),
+            max_wait_seconds=max(wait_samples, default=0.0),
+        )
+
+
+def _load_limits_overrides() -> Dict[str, ModelLimits]:
+    raw = os.getenv("LLM_GOVERNOR_LIMITS")
+    if not raw:
+        return {}
+
+    try:
+        overrides = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid LLM_GOVERNOR_LIMITS, using defaults: {e}")
+        return {}
+
+    limits = {}
+    for model, values in overrides.items():
+        base = DEFAULT_MODEL_LIMITS.get(model, FALLBACK_MODEL_LIMITS)
+        limits[model] = base.model_copy(update=values)
+    return limits
+
+
+class LLMGovernor:
+    """Registry of per-model limiters shared by the whole process."""
+
+    def __init__(self, limits: Optional[Dict[str, ModelLimits]] = None):
+        self._limits = {**DEFAULT_MODEL_LIMITS, **(limits or {})}
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def get_limiter(self, model: str) -> ModelLimiter:
+        if model not in self._limiters:
+            limits = self._limits.get(model, FALLBACK_MODEL_LIMITS)
+            self._limiters[model] = ModelLimiter(model, limits)
+        return self._limiters[model]
+
+    @asynccontextmanager
+    async def limit(self, model: str, messages: Any = None):
+        """
+        Hold a slot for `model` while the wrapped provider call runs.
+
+        Args:
+            model: Provider model name (e.g. "gpt-5", "text-embedding-3-large")
+            messages: Prompt messages or texts, used to estimate token usage for TPM budgets
+        """
+        limiter = self.get_limiter(model)
+        tokens = estimate_tokens(messages)
+
+        await limiter.acquire(tokens)
+        try:
+            yield
+        except BaseException as e:
+            await limiter.release(error=e)
+            raise
+        else:
+            await limiter.release()
+
+    def stats(self) -> List[ModelGovernorStats]:
+        return [limiter.stats() for limiter in self._limiters.values()]
+
+
+class GovernedEmbeddings(Embeddings):
+    """Embeddings wrapper that routes every provider call through the governor."""
+
+    def __init__(self, embeddings: Embeddings, model: str):
+        self.embeddings = embeddings
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        async with llm_governor.limit(self.model, texts):
+            return await self.embeddings.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        async with llm_governor.limit(self.model, [text]):
+            return await self.embeddings.aembed_query(text)
+
+
+llm_governor = LLMGovernor(_load_limits_overrides())
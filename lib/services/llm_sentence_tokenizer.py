@@ -8,6 +8,7 @@ from langchain.chat_models import init_chat_model
 from lib.models.agent import DEFAULT_LLM_TIMEOUT
 from lib.config.llm_models import gpt_5_mini_model
 from lib.services.fragment_detection import DetectionMethod
+from lib.services.llm_governor import llm_governor
 
 
 # Default detection method for identifying when to use LLM fallback
@@ -80,7 +81,8 @@ Text to tokenize:
 
     try:
         messages = prompt.format_messages(paragraph=paragraph)
-        result = await llm.ainvoke(messages)
+        async with llm_governor.limit(gpt_5_mini_model.name, messages):
+            result = await llm.ainvoke(messages)
         return result.chunks
     except Exception as e:
         raise Exception(f"LLM tokenization failed for paragraph: {e}") from e
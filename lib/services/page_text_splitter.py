@@ -0,0 +1,108 @@
+from typing import Iterator, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_text_splitters.base import TextSplitter
+
+# Page separators emitted by the converters: pdfminer (markitdown) separates PDF
+# pages with form feeds, docling-serve with `md_page_break_placeholder` set
+PAGE_BREAK_MARKERS = ("\f", "<!-- page-break -->")
+
+# Text is split in windows of this many chunks, cut at paragraph boundaries
+WINDOW_CHUNKS = 64
+
+
+class PageTextSplitter:
+    """
+    Streaming splitter yielding chunks with their page number and character offsets.
+
+    The document is walked page by page, and each page in windows of about
+    WINDOW_CHUNKS chunks cut at paragraph boundaries, so only one window of splits
+    is held in memory at a time regardless of the document size. Chunks never span
+    pages or windows.
+    """
+
+    def __init__(self, chunker: TextSplitter, window_chunks: int = WINDOW_CHUNKS):
+        self.chunker = chunker
+        self.window_size = chunker._chunk_size * window_chunks
+
+    def iter_documents(
+        self, text: str, metadata: Optional[dict] = None
+    ) -> Iterator[Document]:
+        """
+        Yield the chunks of a document in order.
+
+        Chunk metadata extends `metadata` with `chunk_index`, `start_index` and
+        `end_index` (character offsets into `text`) and `page_number` (1-based, only
+        if the document has page breaks).
+        """
+        has_pages = any(marker in text for marker in PAGE_BREAK_MARKERS)
+        chunk_index = 0
+
+        for page_number, page_start, page_end in _iter_pages(text):
+            for window_start, window_end in self._iter_windows(
+                text, page_start, page_end
+            ):
+                window = text[window_start:window_end]
+                search_from = 0
+                previous_length = 0
+
+                for chunk in self.chunker.split_text(window):
+                    # Same offset lookup as TextSplitter(add_start_index=True)
+                    offset = window.find(
+                        chunk,
+                        max(
+                            0,
+                            search_from + previous_length - self.chunker._chunk_overlap,
+                        ),
+                    )
+                    if offset == -1:
+                        offset = window.find(chunk)
+                    search_from, previous_length = offset, len(chunk)
+
+                    start_index = window_start + offset
+                    yield Document(
+                        page_content=chunk,
+                        metadata={
+                            **(metadata or {}),
+                            "chunk_index": chunk_index,
+                            "start_index": start_index,
+                            "end_index": start_index + len(chunk),
+                            "page_number": str(page_number) if has_pages else None,
+                        },
+                    )
+                    chunk_index += 1
+
+    def _iter_windows(
+        self, text: str, start: int, end: int
+    ) -> Iterator[Tuple[int, int]]:
+        while start < end:
+            window_end = min(start + self.window_size, end)
+            if window_end < end:
+                # Prefer cutting at a paragraph, then a line break
+                for separator in ("\n\n", "\n"):
+                    cut = text.rfind(separator, start, window_end)
+                    if cut > start:
+                        window_end = cut + len(separator)
+                        break
+            yield start, window_end
+            start = window_end
+
+
+def _iter_pages(text: str) -> Iterator[Tuple[int, int, int]]:
+    """Yield (page number, start, end) of every page without copying the text."""
+    next_breaks = {marker: text.find(marker) for marker in PAGE_BREAK_MARKERS}
+    page_number = 1
+    start = 0
+    while True:
+        found = [
+            (index, marker) for marker, index in next_breaks.items() if index != -1
+        ]
+        if not found:
+            yield page_number, start, len(text)
+            return
+
+        index, marker = min(found)
+        yield page_number, start, index
+        page_number += 1
+        start = index + len(marker)
+        next_breaks[marker] = text.find(marker, start)
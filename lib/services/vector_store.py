@@ -3,13 +3,17 @@ import os
 from typing import List, Optional
 
 from langchain_core.vectorstores import VectorStoreRetriever
-from langchain_openai import OpenAIEmbeddings
 from langchain_postgres import PGVector
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from lib.config.env import config
+from lib.config.database import async_engine
+from lib.models.document_index import DocumentIndex
+from lib.services.embedding_cache import get_embeddings
+from lib.services.page_text_splitter import PageTextSplitter
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,64 @@ RAG_CHUNK_OVERLAP = 400  # Character overlap between adjacent chunks
 
 EMBEDDING_MODEL = "text-embedding-3-large"
 
+EMBEDDING_DIMENSIONS = 3072
+
+# Approximate nearest neighbour index over all passages: "hnsw", "ivfflat" or "none".
+# Vectors of text-embedding-3-large exceed the 2000 dimensions pgvector can index, so
+# the index is built over a half-precision cast of the embeddings, which also halves
+# its size. Only the index is half precision: the embedding column stays `vector`, so
+# the table's storage is not reduced. Requires pgvector >= 0.8: searches filter the
+# index scan by collection, and without iterative scans they would return fewer than
+# top-k passages. Indexes are created by `search_indexes.py`.
+RAG_ANN_INDEX = os.getenv("RAG_ANN_INDEX", "hnsw").lower()
+RAG_HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "100"))
+RAG_IVFFLAT_PROBES = int(os.getenv("RAG_IVFFLAT_PROBES", "10"))
+MIN_ANN_PGVECTOR_VERSION = (0, 8)
+ANN_INDEX_NAME = "ix_langchain_pg_embedding_embedding_ann"
+# PGVector creates no index on collection_id, so filtering by collection scans the
+# whole table
+COLLECTION_INDEX_NAME = "ix_langchain_pg_embedding_collection_id"
+
+
+def _build_search_query(ann_cast: Optional[str]) -> str:
+    """
+    Top-k nearest passages of each requested collection in a single round trip.
+
+    LATERAL keeps the per-collection ORDER BY/LIMIT so the top-k is applied per
+    document rather than across all of them. With `ann_cast` (e.g. "halfvec(3072)"),
+    passages are ordered by the expression of the ANN index so it can serve the
+    search, and the exact distance is returned.
+    """
+    order_by = (
+        f"CAST(embedding AS {ann_cast}) <=> CAST(:query_embedding AS {ann_cast})"
+        if ann_cast
+        else "distance"
+    )
+    return f"""
+    SELECT
+        c.name AS collection_name,
+        e.document,
+        e.cmetadata,
+        e.distance
+    FROM langchain_pg_collection AS c
+    CROSS JOIN LATERAL (
+        SELECT
+            document,
+            cmetadata,
+            embedding <=> CAST(:query_embedding AS vector) AS distance
+        FROM langchain_pg_embedding
+        WHERE collection_id = c.uuid
+        ORDER BY {order_by}
+        LIMIT :top_k
+    ) AS e
+    WHERE c.name = ANY(:collection_ids)
+    ORDER BY e.distance
+    """
+
+
+def _parse_version(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split(".") if part.isdigit())
+
 
 class RetrievedPassage(BaseModel):
     """Represents a passage retrieved from vector store."""
@@ -47,30 +109,36 @@ def get_collection_id(file_hash: str) -> str:
     return f"doc_passages_{file_hash}"
 
 
+def is_index_current(manifest: DocumentIndex) -> bool:
+    """Check if an index was built with the current embedding model and chunking."""
+    return (
+        manifest.embedding_model == EMBEDDING_MODEL
+        and manifest.chunk_size == RAG_CHUNK_SIZE
+        and manifest.chunk_overlap == RAG_CHUNK_OVERLAP
+    )
+
+
 class VectorStoreService:
     """Service for vector storage and retrieval operations."""
 
-    def __init__(self, connection_string: str):
-        """Initialize vector store with database connection."""
-        self.embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+    def __init__(self, async_engine: AsyncEngine):
+        """Initialize vector store with an async database engine."""
+        self.embeddings = get_embeddings(EMBEDDING_MODEL)
         self.chunker = RecursiveCharacterTextSplitter(
             chunk_size=RAG_CHUNK_SIZE,
             chunk_overlap=RAG_CHUNK_OVERLAP,
             separators=["\n\n", "\n", ". ", " ", ""],
         )
+        self.splitter = PageTextSplitter(self.chunker)
 
-        # Always use async engine since all our methods are async
-        # Convert postgresql:// to postgresql+psycopg:// for SQLAlchemy async engine
-        if connection_string.startswith("postgresql://"):
-            async_url = connection_string.replace(
-                "postgresql://", "postgresql+psycopg://", 1
-            )
-        else:
-            async_url = connection_string
-
-        self.async_engine = create_async_engine(async_url)
+        self.async_engine = async_engine
         self._vectorstore_cache: dict[str, PGVector] = {}
 
+        self.ann_index = RAG_ANN_INDEX
+        self.ann_cast = f"halfvec({EMBEDDING_DIMENSIONS})"
+        self._ann_index_ready = False
+        self._pgvector_version: tuple[int, ...] = ()
+
         logger.info("VectorStore initialized with async engine")
 
     def _get_vectorstore(self, collection_id: str) -> PGVector:
@@ -89,45 +157,194 @@ class VectorStoreService:
 
         return self._vectorstore_cache[collection_id]
 
-    async def is_collection_indexed(self, collection_id: str) -> bool:
-        """Check if collection is indexed."""
+    async def create_search_indexes(self) -> None:
+        """
+        Create the collection and ANN indexes of the passage table if missing.
+
+        Run from `search_indexes.py` rather than when indexing documents: building an
+        HNSW index over an existing corpus takes as long as the corpus is large.
+        Indexes are built concurrently, so indexing and searches are not blocked, and
+        an invalid index left behind by a failed build is dropped and built again.
+        HNSW indexes are maintained by Postgres as passages are added, while IVFFlat
+        lists are sized from the passages present when it is built (see
+        `rebuild_ann_index`).
+        """
+        async with self.async_engine.connect() as connection:
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            has_passages = (
+                await connection.execute(
+                    text("SELECT to_regclass('langchain_pg_embedding') IS NOT NULL")
+                )
+            ).scalar_one()
+            if not has_passages:
+                logger.warning("No passage table yet, index documents first")
+                return
+
+            await self._drop_invalid_index(connection, COLLECTION_INDEX_NAME)
+            await connection.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                    f"{COLLECTION_INDEX_NAME} "
+                    f"ON langchain_pg_embedding (collection_id)"
+                )
+            )
+
+            if self.ann_index != "none":
+                statement = await self._build_ann_index_statement(connection)
+                if statement is not None:
+                    await self._drop_invalid_index(connection, ANN_INDEX_NAME)
+                    logger.info(f"Creating {self.ann_index} index {ANN_INDEX_NAME}")
+                    await connection.execute(text(statement))
+
+    async def rebuild_ann_index(self) -> None:
+        """Rebuild the ANN index, e.g. to resize IVFFlat lists to a grown corpus."""
+        async with self.async_engine.connect() as connection:
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            await connection.execute(
+                text(f"DROP INDEX CONCURRENTLY IF EXISTS {ANN_INDEX_NAME}")
+            )
+            self._ann_index_ready = False
+            statement = await self._build_ann_index_statement(connection)
+            if statement is not None:
+                await connection.execute(text(statement))
+
+    async def _build_ann_index_statement(self, connection) -> Optional[str]:
+        version = await self._get_pgvector_version(connection)
+        if version < MIN_ANN_PGVECTOR_VERSION:
+            logger.warning(
+                f"pgvector {'.'.join(map(str, version))} has no iterative index "
+                f"scans, skipping ANN index (requires pgvector >= 0.8)"
+            )
+            return None
 
-        vectorstore = self._get_vectorstore(collection_id)
-        results = await vectorstore.asimilarity_search(query="", k=1)
-        return len(results) > 0
+        opclass = (
+            "halfvec_cosine_ops"
+            if self.ann_cast.startswith("halfvec")
+            else "vector_cosine_ops"
+        )
+        expression = f"(CAST(embedding AS {self.ann_cast})) {opclass}"
+
+        if self.ann_index == "hnsw":
+            return (
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {ANN_INDEX_NAME} "
+                f"ON langchain_pg_embedding USING hnsw ({expression}) "
+                f"WITH (m = 16, ef_construction = 64)"
+            )
+
+        if self.ann_index == "ivfflat":
+            # IVFFlat clusters the rows present at build time
+            row_count = (
+                await connection.execute(
+                    text("SELECT count(*) FROM langchain_pg_embedding")
+                )
+            ).scalar_one()
+            if row_count == 0:
+                return None
+            # pgvector guidance: rows / 1000 lists up to 1M rows, sqrt(rows) above
+            lists = (
+                max(1, row_count // 1000)
+                if row_count <= 1_000_000
+                else int(row_count**0.5)
+            )
+            return (
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {ANN_INDEX_NAME} "
+                f"ON langchain_pg_embedding USING ivfflat ({expression}) "
+                f"WITH (lists = {lists})"
+            )
 
-    async def index_document(
-        self, markdown_content: str, file_name: str, collection_id: str
-    ) -> int:
+        logger.error(f"Unknown RAG_ANN_INDEX '{self.ann_index}', using exact search")
+        return None
+
+    async def _is_index_valid(self, connection, name: str) -> Optional[bool]:
+        """Whether an index is ready for queries, or None if it does not exist."""
+        return (
+            await connection.execute(
+                text(
+                    "SELECT indisvalid FROM pg_index "
+                    "WHERE indexrelid = to_regclass(:name)"
+                ),
+                {"name": name},
+            )
+        ).scalar_one_or_none()
+
+    async def _drop_invalid_index(self, connection, name: str) -> None:
+        # IF NOT EXISTS would keep the index, which is never used by searches
+        if await self._is_index_valid(connection, name) is False:
+            logger.warning(f"Dropping invalid index {name} left by a failed build")
+            await connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    async def _get_pgvector_version(self, connection) -> tuple[int, ...]:
+        if not self._pgvector_version:
+            version = (
+                await connection.execute(
+                    text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                )
+            ).scalar_one_or_none()
+            self._pgvector_version = _parse_version(version or "")
+        return self._pgvector_version
+
+    async def _prepare_ann_search(self, connection, top_k: int) -> bool:
         """
-        Chunk, embed, and index document.
-        Returns number of chunks indexed.
+        Check that the ANN index is usable and tune it for this transaction.
+        Returns False if searches must be exact.
         """
-        try:
-            docs = self.chunker.create_documents(
-                [markdown_content],
-                metadatas=[
-                    {"file_name": file_name, "collection_id": collection_id}
-                    for _ in range(len(markdown_content))
-                ],
+        if self.ann_index == "none":
+            return False
+
+        if await self._get_pgvector_version(connection) < MIN_ANN_PGVECTOR_VERSION:
+            return False
+
+        if not self._ann_index_ready:
+            # The index may be created by another process, so keep checking until
+            # it is built
+            if not await self._is_index_valid(connection, ANN_INDEX_NAME):
+                return False
+            self._ann_index_ready = True
+
+        # Iterative scans keep reading the index until `top_k` passages of the
+        # collection are found
+        if self.ann_index == "hnsw":
+            ef_search = max(RAG_HNSW_EF_SEARCH, top_k)
+            await connection.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+            await connection.execute(
+                text("SET LOCAL hnsw.iterative_scan = relaxed_order")
+            )
+        else:
+            await connection.execute(
+                text(f"SET LOCAL ivfflat.probes = {RAG_IVFFLAT_PROBES}")
+            )
+            await connection.execute(
+                text("SET LOCAL ivfflat.iterative_scan = relaxed_order")
             )
-            for i, doc in enumerate(docs):
-                doc.metadata["chunk_index"] = i
-                doc.metadata["file_name"] = file_name
-                doc.metadata["collection_id"] = collection_id
+        return True
 
-            vectorstore = self._get_vectorstore(collection_id)
-            await vectorstore.aadd_documents(docs)
+    async def get_index_manifest(self, file_hash: str) -> Optional[DocumentIndex]:
+        """Get the index manifest entry of a supporting file, if it was indexed."""
+        async with AsyncSession(self.async_engine) as session:
+            return await session.get(DocumentIndex, file_hash)
 
+    async def is_document_indexed(self, file_hash: str) -> bool:
+        """
+        Check if a file is fully indexed with the current embedding model and chunking.
+
+        Partial indexes and indexes built with other settings are reported as not
+        indexed, so they get resumed or rebuilt by the document indexer.
+        """
+        manifest = await self.get_index_manifest(file_hash)
+        if manifest is None:
+            return False
+
+        if not is_index_current(manifest):
             logger.info(
-                f"Indexed {len(docs)} chunks for {file_name} in collection {collection_id}"
+                f"Index of {file_hash} is stale ({manifest.embedding_model}, "
+                f"{manifest.chunk_size}/{manifest.chunk_overlap}), re-indexing"
             )
-            return len(docs)
-
-        except Exception as e:
-            raise Exception(
-                f"Failed to index document '{file_name}' in collection {collection_id}"
-            ) from e
+            return False
+        return manifest.is_complete
 
     async def retrieve_relevant_passages(
         self, query: str, collection_id: str, top_k: int = RAG_TOP_K
@@ -135,35 +352,71 @@ class VectorStoreService:
         """
         Retrieve most relevant passages for query from a SPECIFIC collection.
         Each document has its own collection, so no filtering needed.
-        Returns empty list on failure for graceful degradation.
         """
+        return await self.retrieve_relevant_passages_from_collections(
+            query, [collection_id], top_k
+        )
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a retrieval query, so it can be reused across several searches."""
+        return await self.embeddings.aembed_query(query)
+
+    async def retrieve_relevant_passages_from_collections(
+        self,
+        query: str,
+        collection_ids: List[str],
+        top_k: int = RAG_TOP_K,
+        query_embedding: Optional[List[float]] = None,
+        exact: bool = False,
+    ) -> List[RetrievedPassage]:
+        """
+        Retrieve the `top_k` most relevant passages of each collection in one query.
+
+        The query is embedded once (or `query_embedding` is reused if given) and all
+        collections are searched in a single SQL round trip, through the ANN index
+        when it is available unless `exact` is set.
+        Returns the passages of all collections sorted by cosine distance.
+        """
+        if not collection_ids:
+            return []
+
         try:
-            vectorstore = self._get_vectorstore(collection_id)
+            if query_embedding is None:
+                query_embedding = await self.embed_query(query)
 
-            results = await vectorstore.asimilarity_search_with_score(query, k=top_k)
+            async with self.async_engine.begin() as connection:
+                use_ann = not exact and await self._prepare_ann_search(
+                    connection, top_k
+                )
+                result = await connection.execute(
+                    text(_build_search_query(self.ann_cast if use_ann else None)),
+                    {
+                        "query_embedding": str(query_embedding),
+                        "collection_ids": list(collection_ids),
+                        "top_k": top_k,
+                    },
+                )
+                rows = result.mappings().all()
 
             logger.info(
-                f"Retrieved {len(results)} passages from collection {collection_id} "
+                f"Retrieved {len(rows)} passages from {len(collection_ids)} collections "
                 f"for query: '{query}.'"
             )
 
-            passages = []
-            for doc, score in results:
-                passages.append(
-                    RetrievedPassage(
-                        content=doc.page_content,
-                        source_file=doc.metadata.get("file_name", "unknown"),
-                        chunk_index=doc.metadata.get("chunk_index", 0),
-                        cosine_distance=float(score),
-                        page_number=doc.metadata.get("page_number"),
-                    )
+            return [
+                RetrievedPassage(
+                    content=row["document"],
+                    source_file=(row["cmetadata"] or {}).get("file_name", "unknown"),
+                    chunk_index=(row["cmetadata"] or {}).get("chunk_index", 0),
+                    cosine_distance=float(row["distance"]),
+                    page_number=(row["cmetadata"] or {}).get("page_number"),
                 )
-
-            return passages
+                for row in rows
+            ]
 
         except Exception as e:
             raise Exception(
-                f"Retrieval failed for query '{query}' in collection {collection_id}"
+                f"Retrieval failed for query '{query}' in collections {collection_ids}"
             ) from e
 
 
@@ -174,5 +427,5 @@ def get_vector_store_service() -> VectorStoreService:
     """Get or create singleton vector store service."""
     global _vector_store_service
     if _vector_store_service is None:
-        _vector_store_service = VectorStoreService(config.DATABASE_URL)
+        _vector_store_service = VectorStoreService(async_engine)
     return _vector_store_service
@@ -0,0 +1,208 @@
+"""
+Push-based progress events of workflow runs, delivered to clients as Server-Sent Events.
+
+The runner publishes events with Postgres NOTIFY on a single channel, so a client
+connected to any API replica receives the events of a run executed by any other.
+Each process holds one LISTEN connection, opened on the first subscription, and
+fans notifications out to the in-process subscribers of the run.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, Dict, Optional, Set
+
+import psycopg
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlmodel import select
+
+from lib.config.database import async_engine, get_async_db
+from lib.config.env import config
+from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_EVENTS_CHANNEL = "workflow_run_events"
+# NOTIFY payloads are limited to 8000 bytes
+MAX_ERROR_LENGTH = 2000
+LISTEN_RETRY_SECONDS = 5
+LISTEN_READY_TIMEOUT_SECONDS = 5
+SSE_KEEPALIVE_SECONDS = int(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+
+class WorkflowRunEventType(str, Enum):
+    NODE_STARTED = "node_started"
+    NODE_FINISHED = "node_finished"
+    CHUNK_COMPLETED = "chunk_completed"
+    ERROR = "error"
+    COMPLETED = "completed"
+
+
+class WorkflowRunEvent(BaseModel):
+    session_id: str = Field(description="LangGraph thread ID of the run")
+    sequence: int = Field(description="Position of the event within the run")
+    type: WorkflowRunEventType
+    node: Optional[str] = None
+    chunk_index: Optional[int] = None
+    chunks_done: Optional[int] = None
+    chunks_total: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class WorkflowEventPublisher:
+    """Publishes the events of a single run in order."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self._sequence = 0
+
+    async def publish(self, type: WorkflowRunEventType, **fields) -> None:
+        self._sequence += 1
+        if fields.get("error"):
+            fields["error"] = fields["error"][:MAX_ERROR_LENGTH]
+        event = WorkflowRunEvent(
+            session_id=self.session_id, sequence=self._sequence, type=type, **fields
+        )
+        try:
+            async with async_engine.begin() as connection:
+                await connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {
+                        "channel": WORKFLOW_EVENTS_CHANNEL,
+                        "payload": event.model_dump_json(),
+                    },
+                )
+        except Exception as e:
+            # Events are best effort, clients can always fall back to polling
+            logger.warning(
+                f"Failed to publish {type.value} event of {self.session_id}: {e}"
+            )
+
+
+class _WorkflowEventListener:
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listening: Optional[asyncio.Event] = None
+
+    async def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._listening = asyncio.Event()
+            self._task = loop.create_task(self._listen())
+
+        try:
+            await asyncio.wait_for(
+                self._listening.wait(), timeout=LISTEN_READY_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Workflow event listener is not connected yet")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    config.DATABASE_URL, autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {WORKFLOW_EVENTS_CHANNEL}")
+                    self._listening.set()
+                    logger.info(f"Listening to {WORKFLOW_EVENTS_CHANNEL}")
+                    async for notification in connection.notifies():
+                        self._dispatch(notification.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Workflow event listener disconnected, retrying in "
+                    f"{LISTEN_RETRY_SECONDS}s: {e}"
+                )
+            self._listening.clear()
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = WorkflowRunEvent.model_validate_json(payload)
+        except Exception as e:
+            logger.warning(f"Ignoring invalid workflow event: {e}")
+            return
+        for queue in self._subscribers.get(event.session_id, ()):
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, session_id: str) -> AsyncIterator[asyncio.Queue]:
+        await self._start()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[session_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[session_id].discard(queue)
+            if not self._subscribers[session_id]:
+                del self._subscribers[session_id]
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+workflow_event_listener = _WorkflowEventListener()
+
+
+def format_sse(event: str, data: str, id: Optional[str] = None) -> str:
+    lines = [f"event: {event}"]
+    if id is not None:
+        lines.append(f"id: {id}")
+    lines.extend(f"data: {line}" for line in data.splitlines())
+    return "\n".join(lines) + "\n\n"
+
+
+async def iter_workflow_run_events(session_id: str) -> AsyncIterator[str]:
+    """
+    Yield the progress of a run as SSE messages: a `snapshot` of the run (status and
+    progress) followed by its live events, until the run completes.
+    """
+    async with workflow_event_listener.subscribe(session_id) as queue:
+        # Subscribed before reading the snapshot, so no event falls in between
+        async with get_async_db() as db:
+            run = (
+                await db.exec(
+                    select(WorkflowRun).where(
+                        WorkflowRun.langgraph_thread_id == session_id
+                    )
+                )
+            ).first()
+        if run is None:
+            return
+
+        yield format_sse("snapshot", run.model_dump_json())
+        if run.status in (WorkflowRunStatus.COMPLETED, WorkflowRunStatus.FAILED):
+            return
+
+        while True:
+            try:
+                event: WorkflowRunEvent = await asyncio.wait_for(
+                    queue.get(), timeout=SSE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment line keeping proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+
+            yield format_sse(
+                event.type.value, event.model_dump_json(), id=str(event.sequence)
+            )
+            if event.type == WorkflowRunEventType.COMPLETED:
+                return
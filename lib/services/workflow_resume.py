@@ -0,0 +1,110 @@
+"""
+Resuming workflow runs that stopped before their graph finished.
+
+A run stops early when its analysis fails (FAILED) or its worker dies after the last
+job attempt (left RUNNING). Its LangGraph checkpoints and chunk journal are kept, so
+resuming re-enqueues the analysis and the worker continues from the last completed
+node, reprocessing only the chunks of the interrupted node that did not complete.
+"""
+
+import asyncio
+import logging
+from typing import List
+
+from fastapi import HTTPException
+from sqlalchemy import and_, exists
+from sqlmodel import select, update
+
+from lib.config.database import get_async_db
+from lib.models.analysis_job import AnalysisJob, AnalysisJobStatus
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.services.job_queue import enqueue_analysis
+from lib.services.workflow_runs import get_owned_workflow_run
+from lib.workflows.claim_substantiation.runner import (
+    get_unfinished_state,
+    has_unfinished_checkpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+# Checkpoints of the candidate runs checked at once when listing unfinished runs
+UNFINISHED_RUN_CHECKS_MAX_CONCURRENCY = 10
+
+
+def _has_active_job():
+    return exists().where(
+        and_(
+            AnalysisJob.workflow_run_id == WorkflowRun.id,
+            AnalysisJob.status.in_(
+                [AnalysisJobStatus.QUEUED, AnalysisJobStatus.RUNNING]
+            ),
+        )
+    )
+
+
+async def get_unfinished_workflow_runs(user: User) -> List[WorkflowRun]:
+    """Runs of the user that stopped before finishing and can be resumed."""
+    async with get_async_db() as db:
+        candidates = (
+            await db.exec(
+                select(WorkflowRun)
+                .where(
+                    WorkflowRun.user_id == user.id,
+                    WorkflowRun.status.in_(
+                        [WorkflowRunStatus.RUNNING, WorkflowRunStatus.FAILED]
+                    ),
+                    ~_has_active_job(),
+                )
+                .order_by(WorkflowRun.created_at.desc())
+                .limit(100)
+            )
+        ).all()
+
+    semaphore = asyncio.Semaphore(UNFINISHED_RUN_CHECKS_MAX_CONCURRENCY)
+
+    async def _is_unfinished(run: WorkflowRun) -> bool:
+        async with semaphore:
+            try:
+                return await has_unfinished_checkpoint(run.langgraph_thread_id)
+            except Exception as e:
+                logger.warning(f"Failed to read the checkpoint of {run.id}: {e}")
+                return False
+
+    unfinished = await asyncio.gather(*[_is_unfinished(run) for run in candidates])
+    return [run for run, is_unfinished in zip(candidates, unfinished) if is_unfinished]
+
+
+async def resume_workflow_run(workflow_run_id: str, user: User) -> AnalysisJob:
+    """Enqueue an unfinished run to continue from its last checkpoint."""
+    run = await get_owned_workflow_run(workflow_run_id, user)
+
+    async with get_async_db() as db:
+        active = (
+            await db.exec(
+                select(WorkflowRun.id).where(
+                    WorkflowRun.id == run.id, _has_active_job()
+                )
+            )
+        ).first()
+    if active is not None:
+        raise HTTPException(status_code=409, detail="Workflow run is already queued")
+
+    state = await get_unfinished_state(run.langgraph_thread_id)
+    if state is None:
+        raise HTTPException(
+            status_code=409, detail="Workflow run has no unfinished checkpoint"
+        )
+
+    async with get_async_db() as db:
+        await db.exec(
+            update(WorkflowRun)
+            .where(WorkflowRun.id == run.id)
+            .values(status=WorkflowRunStatus.PENDING)
+        )
+        await db.commit()
+
+    logger.info(f"Resuming workflow run {run.id} of session {state.config.session_id}")
+    return await enqueue_analysis(
+        str(run.id), state.file, state.supporting_files, state.config
+    )
@@ -1,14 +1,28 @@
+import asyncio
 import logging
-from typing import List, Optional
+import os
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException
 from langgraph.types import StateSnapshot
 from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select, update
 
-from lib.config.database import get_db
+from lib.config.database import get_async_db
 from lib.models.user import User
-from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.models.workflow_run import (
+    NodeProgress,
+    WorkflowRun,
+    WorkflowRunProgress,
+    WorkflowRunStatus,
+)
+from lib.models.workflow_run_summary import WorkflowRunSummary
+from lib.services.chunk_results import get_chunk_result_json
+from lib.workflows.chunk_journal import clear_chunk_journal
 from lib.workflows.claim_substantiation.checkpointer import get_checkpointer
-from lib.workflows.claim_substantiation.graph import build_claim_substantiator_graph
+from lib.workflows.claim_substantiation.graph import get_compiled_graph
 from lib.workflows.claim_substantiation.nodes.rank_issues import rank_issues
 from lib.workflows.claim_substantiation.state import (
     ClaimSubstantiatorState,
@@ -18,6 +32,11 @@ from lib.workflows.claim_substantiation.state import (
 
 logger = logging.getLogger(__name__)
 
+# Status and progress changes of a running workflow are written at most this often
+WORKFLOW_STATUS_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("WORKFLOW_STATUS_FLUSH_INTERVAL_SECONDS", "2")
+)
+
 
 class WorkflowRunDetailed(BaseModel):
     run: WorkflowRun
@@ -50,9 +69,10 @@ def _convert_to_summary_state(
     )
 
 
-async def get_workflow_run_detailed(id: str, user: User) -> WorkflowRunDetailed:
-    with get_db() as db:
-        run = db.query(WorkflowRun).filter(WorkflowRun.id == id).first()
+async def get_owned_workflow_run(id: str, user: User) -> WorkflowRun:
+    """Get a workflow run owned by the user, raising 404/403 otherwise."""
+    async with get_async_db() as db:
+        run = (await db.exec(select(WorkflowRun).where(WorkflowRun.id == id))).first()
 
     if run is None:
         raise HTTPException(status_code=404, detail="Workflow run not found")
@@ -60,35 +80,101 @@ async def get_workflow_run_detailed(id: str, user: User) -> WorkflowRunDetailed:
     if run.user_id is None or run.user_id != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    graph = build_claim_substantiator_graph()
+    return run
+
 
+async def _load_full_state(run: WorkflowRun) -> Optional[ClaimSubstantiatorState]:
     async with get_checkpointer() as checkpointer:
-        app = graph.compile(checkpointer=checkpointer)
+        app = get_compiled_graph(checkpointer)
         state = await app.aget_state(
             {"configurable": {"thread_id": run.langgraph_thread_id}}
         )
 
     full_state = _convert_state_snapshot(state)
+    if full_state is None:
+        return None
+
+    # The serialized state includes the documents' markdown
+    await full_state.load_documents()
+    if not full_state.ranked_issues:
+        # Issues are ranked by the last node of the graph: rank them for runs still
+        # in progress, and runs completed before it existed
+        full_state.ranked_issues = rank_issues(full_state).get("ranked_issues", [])
+    return full_state
+
+
+async def save_workflow_run_summary(
+    workflow_run_id: str, full_state: ClaimSubstantiatorState
+) -> str:
+    """Materialize the summary state of a completed run, returning its JSON."""
+    summary_json = _convert_to_summary_state(full_state).model_dump_json()
+
+    async with get_async_db() as db:
+        statement = insert(WorkflowRunSummary).values(
+            workflow_run_id=workflow_run_id,
+            summary_json=summary_json,
+            created_at=datetime.now(timezone.utc),
+        )
+        await db.exec(
+            statement.on_conflict_do_update(
+                index_elements=["workflow_run_id"],
+                set_={
+                    "summary_json": statement.excluded.summary_json,
+                    "created_at": statement.excluded.created_at,
+                },
+            )
+        )
+        await db.commit()
+
+    return summary_json
+
 
+async def _get_summary_json(run: WorkflowRun) -> Optional[str]:
+    async with get_async_db() as db:
+        summary_json = (
+            await db.exec(
+                select(WorkflowRunSummary.summary_json).where(
+                    WorkflowRunSummary.workflow_run_id == run.id
+                )
+            )
+        ).first()
+    if summary_json is not None:
+        return summary_json
+
+    # Completed before summaries were materialized, materialize it now
+    full_state = await _load_full_state(run)
     if full_state is None:
-        return WorkflowRunDetailed(run=run, state=None)
+        return None
+    return await save_workflow_run_summary(str(run.id), full_state)
+
 
-    # TODO: temporarily rank issues to be able to display them in the UI - add to graph later
-    full_state.ranked_issues = rank_issues(full_state).get("ranked_issues", [])
-    summary_state = _convert_to_summary_state(full_state)
+async def get_workflow_run_detailed(id: str, user: User) -> str:
+    """WorkflowRunDetailed of a run, serialized to JSON."""
+    run = await get_owned_workflow_run(id, user)
 
-    return WorkflowRunDetailed(run=run, state=summary_state)
+    if run.status == WorkflowRunStatus.COMPLETED:
+        summary_json = await _get_summary_json(run)
+        if summary_json is not None:
+            # Both parts are already serialized, only join them
+            return f'{{"run":{run.model_dump_json()},"state":{summary_json}}}'
+
+    full_state = await _load_full_state(run)
+    summary_state = (
+        _convert_to_summary_state(full_state) if full_state is not None else None
+    )
+    return WorkflowRunDetailed(run=run, state=summary_state).model_dump_json()
 
 
 async def get_workflow_runs(user: User) -> List[WorkflowRun]:
-    with get_db() as db:
+    async with get_async_db() as db:
         runs = (
-            db.query(WorkflowRun)
-            .filter(WorkflowRun.user_id == user.id)
-            .order_by(WorkflowRun.created_at.desc())
-            .limit(100)
-            .all()
-        )
+            await db.exec(
+                select(WorkflowRun)
+                .where(WorkflowRun.user_id == user.id)
+                .order_by(WorkflowRun.created_at.desc())
+                .limit(100)
+            )
+        ).all()
 
     return runs
 
@@ -118,12 +204,12 @@ async def upsert_workflow_run(
         logger.warning("upsert_workflow_run: No session_id provided")
         return None
 
-    with get_db() as db:
+    async with get_async_db() as db:
         run = (
-            db.query(WorkflowRun)
-            .filter(WorkflowRun.langgraph_thread_id == session_id)
-            .first()
-        )
+            await db.exec(
+                select(WorkflowRun).where(WorkflowRun.langgraph_thread_id == session_id)
+            )
+        ).first()
 
         if run is None:
             # Create new run
@@ -140,12 +226,113 @@ async def upsert_workflow_run(
             if title:
                 run.title = title
 
-        db.commit()
-        db.refresh(run)
+        await db.commit()
+        await db.refresh(run)
         return str(run.id)
 
 
-def get_workflow_run_id_by_session(session_id: str) -> Optional[str]:
+class WorkflowRunStatusWriter:
+    """
+    Coalesces the status, title and progress updates of a running workflow.
+
+    Updates only mark the fields that differ from what was last written. Changes are
+    written in a single UPDATE at most once per flush interval, and `close()` writes
+    whatever is still pending when the workflow completes or fails.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        status: WorkflowRunStatus,
+        title: Optional[str] = None,
+        flush_interval: float = WORKFLOW_STATUS_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.session_id = session_id
+        self.flush_interval = flush_interval
+        self.progress = WorkflowRunProgress()
+        # Values as stored by `upsert_workflow_run` when the run started
+        self._persisted: Dict[str, Any] = {"status": status, "title": title}
+        self._pending: Dict[str, Any] = {}
+        self._last_flush = monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.writes = 0
+
+    def set_title(self, title: Optional[str]) -> None:
+        if title:
+            self._update(title=title)
+
+    def set_status(self, status: WorkflowRunStatus) -> None:
+        self._update(status=status)
+
+    def set_chunk_progress(
+        self, node: Optional[str], chunks_done: int, chunks_total: int
+    ) -> None:
+        if node is None:
+            return
+        node_progress = self.progress.nodes.setdefault(node, NodeProgress())
+        node_progress.chunks_done = chunks_done
+        node_progress.chunks_total = chunks_total
+        self.progress.current_node = node
+        self._update(progress=self.progress.model_dump(mode="json"))
+
+    def set_node_completed(self, node: str) -> None:
+        self.progress.nodes.setdefault(node, NodeProgress()).completed = True
+        self.progress.current_node = node
+        self._update(progress=self.progress.model_dump(mode="json"))
+
+    def _update(self, **values: Any) -> None:
+        for field, value in values.items():
+            if self._persisted.get(field) == value:
+                self._pending.pop(field, None)
+            else:
+                self._pending[field] = value
+
+        if self._pending and self._flush_task is None:
+            delay = max(0.0, self.flush_interval - (monotonic() - self._last_flush))
+            self._flush_task = asyncio.ensure_future(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # Updates made while flushing schedule the next flush
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending changes now."""
+        async with self._lock:
+            if not self._pending:
+                return
+            values, self._pending = self._pending, {}
+            try:
+                async with get_async_db() as db:
+                    await db.exec(
+                        update(WorkflowRun)
+                        .where(WorkflowRun.langgraph_thread_id == self.session_id)
+                        .values(**values)
+                    )
+                    await db.commit()
+                self._persisted.update(values)
+                self.writes += 1
+            except Exception as e:
+                logger.warning(
+                    f"Failed to write status of workflow run {self.session_id}: {e}"
+                )
+                # Keep the failed changes unless they were superseded meanwhile
+                self._pending = {**values, **self._pending}
+            finally:
+                self._last_flush = monotonic()
+
+    async def close(self, status: WorkflowRunStatus) -> None:
+        """Set the final status and write all pending changes."""
+        self.set_status(status)
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+
+async def get_workflow_run_id_by_session(session_id: str) -> Optional[str]:
     """
     Get the workflow run ID for a given session ID.
 
@@ -158,12 +345,12 @@ def get_workflow_run_id_by_session(session_id: str) -> Optional[str]:
     if not session_id:
         return None
 
-    with get_db() as db:
+    async with get_async_db() as db:
         run = (
-            db.query(WorkflowRun)
-            .filter(WorkflowRun.langgraph_thread_id == session_id)
-            .first()
-        )
+            await db.exec(
+                select(WorkflowRun).where(WorkflowRun.langgraph_thread_id == session_id)
+            )
+        ).first()
         return str(run.id) if run else None
 
 
@@ -184,8 +371,10 @@ async def update_workflow_run(
     Raises:
         HTTPException: If the workflow run is not found or user doesn't have access
     """
-    with get_db() as db:
-        run = db.query(WorkflowRun).filter(WorkflowRun.id == workflow_run_id).first()
+    async with get_async_db() as db:
+        run = (
+            await db.exec(select(WorkflowRun).where(WorkflowRun.id == workflow_run_id))
+        ).first()
 
         if run is None:
             raise HTTPException(status_code=404, detail="Workflow run not found")
@@ -196,14 +385,16 @@ async def update_workflow_run(
         if request.title is not None:
             run.title = request.title
 
-        db.commit()
-        db.refresh(run)
+        await db.commit()
+        await db.refresh(run)
         return run
 
 
 async def delete_workflow_run(workflow_run_id: str, user: User) -> None:
-    with get_db() as db:
-        run = db.query(WorkflowRun).filter(WorkflowRun.id == workflow_run_id).first()
+    async with get_async_db() as db:
+        run = (
+            await db.exec(select(WorkflowRun).where(WorkflowRun.id == workflow_run_id))
+        ).first()
 
         if run is None:
             raise HTTPException(status_code=404, detail="Workflow run not found")
@@ -213,12 +404,13 @@ async def delete_workflow_run(workflow_run_id: str, user: User) -> None:
 
         thread_id = run.langgraph_thread_id
 
-        db.delete(run)
-        db.commit()
+        await db.delete(run)
+        await db.commit()
 
     try:
         async with get_checkpointer() as checkpointer:
             await checkpointer.adelete_thread(thread_id)
+        await clear_chunk_journal(thread_id)
     except Exception as e:
         logger.error(f"Error deleting checkpoints for thread {thread_id}: {e}")
         raise HTTPException(
@@ -226,20 +418,26 @@ async def delete_workflow_run(workflow_run_id: str, user: User) -> None:
         )
 
 
-async def get_chunk_details(workflow_run_id: str, chunk_index: int) -> DocumentChunk:
+async def get_chunk_details(workflow_run_id: str, chunk_index: int) -> str:
     """
-    Get detailed analysis for a specific chunk.
+    Get detailed analysis for a specific chunk, serialized to JSON.
     Returns the full chunk with all analysis (used for lazy loading chunk details).
     """
-    with get_db() as db:
-        run = db.query(WorkflowRun).filter(WorkflowRun.id == workflow_run_id).first()
+    chunk_json = await get_chunk_result_json(workflow_run_id, chunk_index)
+    if chunk_json is not None:
+        return chunk_json
+
+    # Runs analyzed before chunk results were stored are read from the checkpoint
+    async with get_async_db() as db:
+        run = (
+            await db.exec(select(WorkflowRun).where(WorkflowRun.id == workflow_run_id))
+        ).first()
 
     if run is None:
         raise HTTPException(status_code=404, detail="Workflow run not found")
 
-    graph = build_claim_substantiator_graph()
     async with get_checkpointer() as checkpointer:
-        app = graph.compile(checkpointer=checkpointer)
+        app = get_compiled_graph(checkpointer)
         state = await app.aget_state(
             {"configurable": {"thread_id": run.langgraph_thread_id}}
         )
@@ -252,4 +450,4 @@ async def get_chunk_details(workflow_run_id: str, chunk_index: int) -> DocumentC
     if chunk is None:
         raise HTTPException(status_code=404, detail=f"Chunk {chunk_index} not found")
 
-    return chunk
+    return chunk.model_dump_json()
@@ -1,21 +1,63 @@
-from typing import Callable, List, Tuple
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from langgraph.config import get_config, get_stream_writer
+
 from lib.run_utils import run_tasks
+from lib.workflows.chunk_journal import ChunkJournal
 from lib.workflows.claim_substantiation.state import (
     WorkflowError,
     ClaimSubstantiatorState,
     DocumentChunk,
 )
+from lib.workflows.models import ChunkProgress
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 def get_target_chunks(state: ClaimSubstantiatorState) -> List[DocumentChunk]:
     target_chunk_indices = state.config.target_chunk_indices
 
+    if target_chunk_indices is None and state.revision is not None:
+        # Chunks carried over from the previous revision are not processed again
+        target_chunk_indices = state.revision.changed_chunk_indices
+
     if target_chunk_indices is None:
         return state.chunks
 
     return [state.chunks[index] for index in target_chunk_indices]
 
 
+def report_chunk_progress(
+    chunks_done: int,
+    chunks_total: int,
+    chunk_index: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Emit the chunk progress of the current node on the LangGraph custom stream.
+    Does nothing when called outside of a graph run (e.g. from tests or scripts).
+    """
+    try:
+        config = get_config()
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+
+    writer(
+        ChunkProgress(
+            node=config.get("metadata", {}).get("langgraph_node"),
+            chunks_done=chunks_done,
+            chunks_total=chunks_total,
+            chunk_index=chunk_index,
+            error=error,
+        ).model_dump()
+    )
+
+
 async def iterate_chunks(
     state: ClaimSubstantiatorState,
     func: Callable[[ClaimSubstantiatorState, DocumentChunk], DocumentChunk],
@@ -23,10 +65,39 @@ async def iterate_chunks(
 ) -> ClaimSubstantiatorState:
     target_chunks = get_target_chunks(state)
 
-    tasks = [func(state, chunk) for chunk in target_chunks]
-    results: Tuple[List[DocumentChunk], List[Exception]] = await run_tasks(
-        tasks, desc=desc
-    )
+    def _on_progress(completed: int, total: int, index: int, error: Exception):
+        report_chunk_progress(
+            completed,
+            total,
+            chunk_index=target_chunks[index].chunk_index,
+            error=str(error) if error is not None else None,
+        )
+
+    # Chunks completed before the task was interrupted are not processed again
+    journal = ChunkJournal.for_current_task()
+    committed = await journal.load() if journal else {}
+
+    async def _run_chunk(chunk: DocumentChunk) -> DocumentChunk:
+        key = (func.__name__, chunk.chunk_index)
+        if key in committed:
+            return committed[key]
+        result = await func(state, chunk)
+        if journal is not None:
+            await journal.record(func.__name__, chunk.chunk_index, result)
+        return result
+
+    if committed:
+        logger.info(f"{desc}: resuming with {len(committed)} chunks already done")
+
+    report_chunk_progress(0, len(target_chunks))
+    tasks = [_run_chunk(chunk) for chunk in target_chunks]
+    try:
+        results: Tuple[List[DocumentChunk], List[Exception]] = await run_tasks(
+            tasks, desc=desc, on_progress=_on_progress
+        )
+    finally:
+        if journal is not None:
+            await journal.flush()
     updated_chunks, exceptions = results
 
     errors = []
@@ -42,3 +113,35 @@ async def iterate_chunks(
             )
 
     return {"chunks": updated_chunks, "errors": errors}
+
+
+async def iterate_claims(
+    state: ClaimSubstantiatorState,
+    chunk: DocumentChunk,
+    func: Callable[[int, Any], Awaitable[Optional[T]]],
+) -> List[T]:
+    """
+    Run `func(claim_index, claim)` for every claim of the chunk.
+
+    When `config.parallelize_claims` is enabled, every (chunk, claim) pair is scheduled
+    as its own task and the provider concurrency is bounded by the shared LLM governor.
+    Results are returned in claim order, skipping claims for which `func` returned None.
+    If any claim fails, the remaining claim tasks are cancelled and the error is raised.
+    """
+    claims = chunk.claims.claims if chunk.claims else []
+
+    if not state.config.parallelize_claims:
+        results = [await func(index, claim) for index, claim in enumerate(claims)]
+        return [result for result in results if result is not None]
+
+    tasks = [
+        asyncio.ensure_future(func(index, claim)) for index, claim in enumerate(claims)
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return [result for result in results if result is not None]
@@ -0,0 +1,125 @@
+import logging
+import os
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+from langgraph.config import get_config
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from lib.config.database import get_async_db
+from lib.models.chunk_task_result import ChunkTaskResult
+from lib.workflows.claim_substantiation.state import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+# Buffered chunk results are written in one INSERT once this many are buffered, once
+# the oldest is this old, and when the stage ends
+CHUNK_JOURNAL_FLUSH_SIZE = int(os.getenv("CHUNK_JOURNAL_FLUSH_SIZE", "50"))
+CHUNK_JOURNAL_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("CHUNK_JOURNAL_FLUSH_INTERVAL_SECONDS", "10")
+)
+
+
+class ChunkJournal:
+    """
+    Records chunk results of the running node task, so that a node resumed after a
+    crash only reprocesses the chunks that did not complete.
+
+    Results are buffered and written in batches: a crash loses at most the results
+    buffered since the last flush, which are reprocessed on resume.
+    """
+
+    def __init__(self, thread_id: str, task_id: str):
+        self.thread_id = thread_id
+        self.task_id = task_id
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffered_at = 0.0
+
+    @classmethod
+    def for_current_task(cls) -> Optional["ChunkJournal"]:
+        """Journal of the node task being executed, or None outside a checkpointed run."""
+        try:
+            config = get_config()
+        except RuntimeError:
+            return None
+
+        thread_id = config.get("configurable", {}).get("thread_id")
+        # "node:task_id", where the task id is derived from the checkpoint the task
+        # started from and is therefore the same when the task is resumed
+        checkpoint_ns = config.get("metadata", {}).get("langgraph_checkpoint_ns")
+        if not thread_id or not checkpoint_ns:
+            return None
+        return cls(thread_id, checkpoint_ns)
+
+    async def load(self) -> Dict[Tuple[str, int], DocumentChunk]:
+        """Chunks completed by earlier attempts of this task, by (step, chunk index)."""
+        try:
+            async with get_async_db() as db:
+                rows = (
+                    await db.exec(
+                        select(
+                            ChunkTaskResult.step,
+                            ChunkTaskResult.chunk_index,
+                            ChunkTaskResult.result,
+                        ).where(
+                            ChunkTaskResult.thread_id == self.thread_id,
+                            ChunkTaskResult.task_id == self.task_id,
+                        )
+                    )
+                ).all()
+        except Exception as e:
+            logger.warning(f"Failed to load chunk journal of {self.task_id}: {e}")
+            return {}
+
+        return {
+            (step, chunk_index): DocumentChunk.model_validate(result)
+            for step, chunk_index, result in rows
+        }
+
+    async def record(self, step: str, chunk_index: int, chunk: DocumentChunk) -> None:
+        """Buffer a chunk result, writing the buffer when it is full or old enough."""
+        if not self._buffer:
+            self._buffered_at = monotonic()
+        self._buffer.append(
+            {
+                "thread_id": self.thread_id,
+                "task_id": self.task_id,
+                "step": step,
+                "chunk_index": chunk_index,
+                "result": chunk.model_dump(mode="json"),
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+        if (
+            len(self._buffer) >= CHUNK_JOURNAL_FLUSH_SIZE
+            or monotonic() - self._buffered_at >= CHUNK_JOURNAL_FLUSH_INTERVAL_SECONDS
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write the buffered chunk results."""
+        rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+        try:
+            async with get_async_db() as db:
+                await db.exec(
+                    insert(ChunkTaskResult).values(rows).on_conflict_do_nothing()
+                )
+                await db.commit()
+        except Exception as e:
+            # Only costs reprocessing the chunks if the task is interrupted
+            logger.warning(
+                f"Failed to record {len(rows)} chunks of {self.task_id}: {e}"
+            )
+
+
+async def clear_chunk_journal(thread_id: str) -> None:
+    async with get_async_db() as db:
+        await db.exec(
+            delete(ChunkTaskResult).where(ChunkTaskResult.thread_id == thread_id)
+        )
+        await db.commit()
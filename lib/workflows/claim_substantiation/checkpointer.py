@@ -1,11 +1,122 @@
+"""
+Application-lifetime LangGraph checkpointer backed by a psycopg connection pool.
+
+The pool is opened (and the checkpoint schema set up) once, on FastAPI startup or on
+first use in scripts and tests. `get_checkpointer()` then hands out a lightweight
+saver per caller: `AsyncPostgresSaver` serializes all operations of an instance on a
+lock, so sharing one instance would serialize every workflow and status request.
+"""
+
+import asyncio
+import logging
+import os
 from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from pydantic import BaseModel
 
 from lib.config.env import config
 
+logger = logging.getLogger(__name__)
+
+CHECKPOINTER_POOL_MIN_SIZE = int(os.getenv("CHECKPOINTER_POOL_MIN_SIZE", "2"))
+CHECKPOINTER_POOL_MAX_SIZE = int(os.getenv("CHECKPOINTER_POOL_MAX_SIZE", "20"))
+CHECKPOINTER_POOL_TIMEOUT_SECONDS = float(
+    os.getenv("CHECKPOINTER_POOL_TIMEOUT_SECONDS", "30")
+)
+CHECKPOINTER_POOL_MAX_IDLE_SECONDS = float(
+    os.getenv("CHECKPOINTER_POOL_MAX_IDLE_SECONDS", "300")
+)
+
+
+class CheckpointerPoolStats(BaseModel):
+    """Saturation metrics of the checkpointer connection pool."""
+
+    pool_min: int
+    pool_max: int
+    pool_size: int = 0
+    pool_available: int = 0
+    requests_waiting: int = 0
+    requests_num: int = 0
+    requests_queued: int = 0
+    requests_wait_ms: int = 0
+    requests_errors: int = 0
+    connections_num: int = 0
+    connections_errors: int = 0
+    connections_lost: int = 0
+
+
+class _CheckpointerPool:
+    def __init__(self):
+        self.pool: Optional[AsyncConnectionPool] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def open(self) -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pools are bound to the event loop they were opened on (scripts and
+            # tests may run several loops), so a new loop gets a new pool
+            self.pool = None
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self.pool is None:
+                pool = AsyncConnectionPool(
+                    config.DATABASE_URL,
+                    min_size=CHECKPOINTER_POOL_MIN_SIZE,
+                    max_size=CHECKPOINTER_POOL_MAX_SIZE,
+                    timeout=CHECKPOINTER_POOL_TIMEOUT_SECONDS,
+                    max_idle=CHECKPOINTER_POOL_MAX_IDLE_SECONDS,
+                    # Same connection settings as AsyncPostgresSaver.from_conn_string
+                    kwargs={
+                        "autocommit": True,
+                        "prepare_threshold": 0,
+                        "row_factory": dict_row,
+                    },
+                    open=False,
+                )
+                await pool.open(wait=True)
+                await AsyncPostgresSaver(pool).setup()
+                self.pool = pool
+                logger.info(
+                    f"Checkpointer pool opened ({CHECKPOINTER_POOL_MIN_SIZE}-"
+                    f"{CHECKPOINTER_POOL_MAX_SIZE} connections)"
+                )
+        return self.pool
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info("Checkpointer pool closed")
+
+
+_checkpointer_pool = _CheckpointerPool()
+
+
+async def open_checkpointer_pool() -> None:
+    """Open the connection pool and set up the checkpoint schema."""
+    await _checkpointer_pool.open()
+
+
+async def close_checkpointer_pool() -> None:
+    await _checkpointer_pool.close()
+
+
+def get_checkpointer_pool_stats() -> Optional[CheckpointerPoolStats]:
+    """Current pool usage, or None if the pool is not open in this process."""
+    pool = _checkpointer_pool.pool
+    if pool is None:
+        return None
+    return CheckpointerPoolStats(**pool.get_stats())
+
 
 @asynccontextmanager
-async def get_checkpointer():
-    async with AsyncPostgresSaver.from_conn_string(config.DATABASE_URL) as checkpointer:
-        await checkpointer.setup()
-        yield checkpointer
+async def get_checkpointer() -> AsyncIterator[AsyncPostgresSaver]:
+    pool = await _checkpointer_pool.open()
+    yield AsyncPostgresSaver(pool)
@@ -0,0 +1,310 @@
+"""Per-chunk streaming execution engine for claim substantiation.
+
+The graph engine runs every stage as a node over all chunks, so each stage waits for
+the slowest chunk of the previous one. This engine runs the per-chunk stages
+(extract → categorize → verify / validate inferences → suggest citations) as one
+pipeline per chunk, and only joins on whole-document work (references, citation
+detection of the paragraph, RAG index, summaries, literature review) at the stages
+that actually read it.
+
+Stages reuse the same chunk functions as the graph nodes, so results are identical.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from lib.run_utils import MAX_CONCURRENT_TASKS
+from lib.workflows.chunk_iterator import get_target_chunks, report_chunk_progress
+from lib.workflows.chunk_journal import ChunkJournal
+from lib.workflows.claim_substantiation.nodes.categorize_claims import (
+    _categorize_chunk_claims,
+)
+from lib.workflows.claim_substantiation.nodes.detect_citations import (
+    _detect_chunk_citations,
+)
+from lib.workflows.claim_substantiation.nodes.extract_claims import (
+    _extract_chunk_claims,
+)
+from lib.workflows.claim_substantiation.nodes.extract_claims_toulmin import (
+    _extract_chunk_claims_toulmin,
+)
+from lib.workflows.claim_substantiation.nodes.extract_references import (
+    extract_references,
+)
+from lib.workflows.claim_substantiation.nodes.index_supporting_documents import (
+    index_supporting_documents,
+)
+from lib.workflows.claim_substantiation.nodes.review_literature import literature_review
+from lib.workflows.claim_substantiation.nodes.suggest_citations import (
+    _suggest_chunk_citations,
+)
+from lib.workflows.claim_substantiation.nodes.summarize_supporting_documents import (
+    summarize_supporting_documents,
+)
+from lib.workflows.claim_substantiation.nodes.validate_inferences import (
+    _validate_chunk_inferences,
+)
+from lib.workflows.claim_substantiation.nodes.validate_references import (
+    validate_references,
+)
+from lib.workflows.claim_substantiation.nodes.verify_claims import (
+    _verify_chunk_claims,
+    _verify_chunk_claims_rag,
+)
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+)
+from lib.workflows.decorators import handle_workflow_node_errors
+from lib.workflows.models import WorkflowError
+
+logger = logging.getLogger(__name__)
+
+ChunkFunc = Callable[[ClaimSubstantiatorState, DocumentChunk], Awaitable[DocumentChunk]]
+
+
+def _is_agent_enabled(state: ClaimSubstantiatorState, agent_type: str) -> bool:
+    agents_to_run = state.config.agents_to_run
+    return not agents_to_run or agent_type in agents_to_run
+
+
+class _ChunkPipelineRun:
+    """Mutable working state of a single pipeline execution."""
+
+    def __init__(self, state: ClaimSubstantiatorState):
+        self.state = state
+        self.chunks: Dict[int, DocumentChunk] = {
+            chunk.chunk_index: chunk for chunk in state.chunks
+        }
+        self.target_indices = [chunk.chunk_index for chunk in get_target_chunks(state)]
+        self.update: Dict[str, Any] = {"references": [], "errors": []}
+        self.errors: List[WorkflowError] = []
+
+        self.citations_detected = {
+            index: asyncio.Event() for index in self.target_indices
+        }
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # Stage results recorded before the task was interrupted, see `load_journal`
+        self.journal: Optional[ChunkJournal] = None
+        self.committed: Dict[Tuple[str, int], DocumentChunk] = {}
+
+        # Target chunks of each paragraph, whose citations verification depends on
+        self.paragraph_targets: Dict[int, List[int]] = {}
+        for index in self.target_indices:
+            paragraph_index = self.chunks[index].paragraph_index
+            self.paragraph_targets.setdefault(paragraph_index, []).append(index)
+
+    def view(self) -> ClaimSubstantiatorState:
+        """State as seen by a stage: the input state plus everything produced so far."""
+        return self.state.model_copy(
+            update={
+                "chunks": [self.chunks[index] for index in sorted(self.chunks)],
+                "references": self.state.references + self.update["references"],
+                "supporting_documents_summaries": self.update.get(
+                    "supporting_documents_summaries",
+                    self.state.supporting_documents_summaries,
+                ),
+                "literature_review": self.update.get(
+                    "literature_review", self.state.literature_review
+                ),
+            }
+        )
+
+    def apply_document_update(self, update: Dict[str, Any]) -> None:
+        for key, value in update.items():
+            if key in ("references", "references_validated", "errors"):
+                self.update[key] = self.update.get(key, []) + value
+            else:
+                self.update[key] = value
+
+    async def load_journal(self) -> None:
+        self.journal = ChunkJournal.for_current_task()
+        if self.journal is not None:
+            self.committed = await self.journal.load()
+        if self.committed:
+            logger.info(
+                f"run_chunk_pipeline ({self.state.config.session_id}): resuming with "
+                f"{len(self.committed)} chunk stages already done"
+            )
+
+    async def run_stage(self, func: ChunkFunc, chunk_index: int, field: str) -> None:
+        """
+        Run a chunk function and merge the field it produces into the working chunk.
+
+        Mirrors `iterate_chunks` + `conciliate_chunks`: failures are recorded as chunk
+        errors and leave the chunk unchanged, and empty results do not overwrite.
+        """
+        semaphore = self.semaphores.setdefault(
+            func.__name__, asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+        )
+        result = self.committed.get((func.__name__, chunk_index))
+        if result is None:
+            async with semaphore:
+                try:
+                    result = await func(self.view(), self.chunks[chunk_index])
+                except Exception as e:
+                    logger.error(
+                        f"Error processing chunk {chunk_index} in {func.__name__}: {e}",
+                        exc_info=True,
+                    )
+                    self.errors.append(
+                        WorkflowError(
+                            task_name=func.__name__,
+                            error=str(e),
+                            chunk_index=chunk_index,
+                        )
+                    )
+                    return
+            if self.journal is not None:
+                await self.journal.record(func.__name__, chunk_index, result)
+
+        value = getattr(result, field)
+        if value is None or (isinstance(value, list) and not value):
+            return
+        self.chunks[chunk_index] = self.chunks[chunk_index].model_copy(
+            update={field: value}
+        )
+
+
+@handle_workflow_node_errors()
+async def run_chunk_pipeline(
+    state: ClaimSubstantiatorState,
+) -> ClaimSubstantiatorState:
+    """Run references, indexing and all per-chunk stages as a streaming dataflow."""
+    logger.info(f"run_chunk_pipeline ({state.config.session_id}): starting")
+
+    config = state.config
+    run = _ChunkPipelineRun(state)
+    await run.load_journal()
+
+    async def _document_task(
+        node: Callable[[ClaimSubstantiatorState], Awaitable[Dict[str, Any]]],
+        after: Optional[asyncio.Task] = None,
+        input_state: Optional[ClaimSubstantiatorState] = None,
+    ) -> None:
+        if after is not None:
+            await after
+        try:
+            update = await node(input_state or run.view())
+        except Exception as e:
+            # As in the graph, where the nodes after a failed node still run, the
+            # stages waiting on this one carry on without its results
+            logger.error(
+                f"run_chunk_pipeline ({config.session_id}): {node.__name__} failed: {e}",
+                exc_info=True,
+            )
+            run.errors.append(WorkflowError(task_name=node.__name__, error=str(e)))
+            return
+        run.apply_document_update(update)
+
+    async def _noop() -> None:
+        return None
+
+    references_task = asyncio.ensure_future(_document_task(extract_references))
+    document_tasks = [references_task]
+    if config.run_reference_validation:
+        document_tasks.append(
+            asyncio.ensure_future(
+                _document_task(validate_references, after=references_task)
+            )
+        )
+
+    index_task = asyncio.ensure_future(
+        _document_task(index_supporting_documents) if config.use_rag else _noop()
+    )
+    document_tasks.append(index_task)
+
+    summaries_task = asyncio.ensure_future(
+        _document_task(summarize_supporting_documents)
+        if config.run_suggest_citations
+        else _noop()
+    )
+    # Literature review reads the input state, as in the graph where it runs
+    # alongside reference extraction
+    literature_review_task = asyncio.ensure_future(
+        _document_task(literature_review, input_state=state)
+        if config.run_literature_review
+        else _noop()
+    )
+    document_tasks.extend([summaries_task, literature_review_task])
+
+    extract_func = (
+        _extract_chunk_claims_toulmin if config.use_toulmin else _extract_chunk_claims
+    )
+    verify_func = _verify_chunk_claims_rag if config.use_rag else _verify_chunk_claims
+    run_extract = _is_agent_enabled(state, "claims")
+    run_detect = _is_agent_enabled(state, "citations")
+    run_verify = _is_agent_enabled(state, "substantiation")
+    run_suggest = config.run_suggest_citations and _is_agent_enabled(
+        state, "suggest_citations"
+    )
+
+    async def _detect(chunk_index: int) -> None:
+        try:
+            await references_task
+            if run_detect:
+                await run.run_stage(_detect_chunk_citations, chunk_index, "citations")
+        finally:
+            run.citations_detected[chunk_index].set()
+
+    async def _verify(chunk_index: int) -> None:
+        paragraph_index = run.chunks[chunk_index].paragraph_index
+        for index in run.paragraph_targets[paragraph_index]:
+            await run.citations_detected[index].wait()
+        await index_task
+        await run.run_stage(verify_func, chunk_index, "substantiations")
+
+    async def _suggest(chunk_index: int) -> None:
+        await run.citations_detected[chunk_index].wait()
+        await asyncio.gather(summaries_task, literature_review_task)
+        await run.run_stage(
+            _suggest_chunk_citations, chunk_index, "citation_suggestions"
+        )
+
+    async def _process_chunk(chunk_index: int) -> None:
+        if run_extract:
+            await run.run_stage(extract_func, chunk_index, "claims")
+        await run.run_stage(_categorize_chunk_claims, chunk_index, "claim_categories")
+
+        downstream = [
+            run.run_stage(
+                _validate_chunk_inferences, chunk_index, "inference_validations"
+            )
+        ]
+        if run_verify:
+            downstream.append(_verify(chunk_index))
+        if run_suggest:
+            downstream.append(_suggest(chunk_index))
+        await asyncio.gather(*downstream)
+
+    chunks_done = 0
+
+    async def _run_chunk(chunk_index: int) -> None:
+        nonlocal chunks_done
+        await asyncio.gather(_detect(chunk_index), _process_chunk(chunk_index))
+        chunks_done += 1
+        errors = [e.error for e in run.errors if e.chunk_index == chunk_index]
+        report_chunk_progress(
+            chunks_done,
+            len(run.target_indices),
+            chunk_index=chunk_index,
+            error="; ".join(errors) if errors else None,
+        )
+
+    report_chunk_progress(0, len(run.target_indices))
+    try:
+        await asyncio.gather(
+            *document_tasks, *[_run_chunk(index) for index in run.target_indices]
+        )
+    finally:
+        if run.journal is not None:
+            await run.journal.flush()
+
+    logger.info(f"run_chunk_pipeline ({state.config.session_id}): done")
+
+    update = dict(run.update)
+    update["errors"] = update["errors"] + run.errors
+    update["chunks"] = [run.chunks[index] for index in run.target_indices]
+    return update
@@ -1,5 +1,10 @@
+from functools import lru_cache
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
+from lib.workflows.claim_substantiation.chunk_pipeline import run_chunk_pipeline
 from lib.workflows.claim_substantiation.nodes.categorize_claims import categorize_claims
 
 # from lib.workflows.claim_substantiation.nodes.check_claim_needs_substantiation import (
@@ -26,6 +31,7 @@ from lib.workflows.claim_substantiation.nodes.index_supporting_documents import
     index_supporting_documents,
 )
 from lib.workflows.claim_substantiation.nodes.prepare_documents import prepare_documents
+from lib.workflows.claim_substantiation.nodes.rank_issues import rank_issues
 from lib.workflows.claim_substantiation.nodes.review_literature import literature_review
 from lib.workflows.claim_substantiation.nodes.split_into_chunks import split_into_chunks
 from lib.workflows.claim_substantiation.nodes.suggest_citations import suggest_citations
@@ -56,6 +62,7 @@ def build_claim_substantiator_graph(
     use_rag: bool = True,
     run_live_reports: bool = False,
     run_reference_validation: bool = False,
+    use_chunk_pipeline: bool = False,
 ) -> StateGraph:
     """
     Build a LangGraph workflow for claim substantiation analysis.
@@ -66,11 +73,16 @@ def build_claim_substantiator_graph(
         run_suggest_citations: Include citation suggestion nodes
         use_rag: Use RAG-based claim verification
         run_reference_validation: Include reference validation node
+        use_chunk_pipeline: Run references, indexing and the per-chunk stages in a
+            single streaming node instead of one node per stage
 
     Returns:
         Configured StateGraph for claim substantiation workflow
     """
 
+    if use_chunk_pipeline:
+        return _build_chunk_pipeline_graph(run_live_reports=run_live_reports)
+
     graph = StateGraph(ClaimSubstantiatorState)
 
     # Core nodes
@@ -165,22 +177,116 @@ def build_claim_substantiator_graph(
         graph.add_edge("suggest_citations", "finalize")
         graph.add_edge("generate_live_reports_analysis", "finalize")
         graph.add_edge("generate_addendum_report", "finalize")
-        graph.set_finish_point("finalize")
+        last_node = "finalize"
     elif run_suggest_citations:
-        graph.set_finish_point("suggest_citations")
+        last_node = "suggest_citations"
     elif run_live_reports:
-        graph.set_finish_point("generate_addendum_report")
+        last_node = "generate_addendum_report"
     else:
         # When no downstream nodes exist, create a finalize node to wait for both
         # verify_claims and validate_inferences to complete in parallel
         graph.add_node("finalize", finalize)
         graph.add_edge("verify_claims", "finalize")
         graph.add_edge("validate_inferences", "finalize")
-        graph.set_finish_point("finalize")
+        last_node = "finalize"
+
+    # Issues are ranked once, from the results of all analyses
+    graph.add_node("rank_issues", rank_issues, defer=True)
+    graph.add_edge(last_node, "rank_issues")
+    if run_literature_review and not run_suggest_citations:
+        graph.add_edge("literature_review", "rank_issues")
+    graph.set_finish_point("rank_issues")
 
     return graph
 
 
+def _build_chunk_pipeline_graph(run_live_reports: bool = False) -> StateGraph:
+    """
+    Build the workflow graph for the chunk pipeline execution engine.
+
+    The per-stage nodes are replaced by `run_chunk_pipeline`, which schedules them
+    per chunk (see `chunk_pipeline.py`). Live reports still run afterwards since they
+    need the verified claims of the whole document.
+    """
+
+    graph = StateGraph(ClaimSubstantiatorState)
+
+    graph.add_node("convert_to_markdown", convert_to_markdown)
+    graph.add_node("prepare_documents", prepare_documents)
+    graph.add_node("split_into_chunks", split_into_chunks)
+    graph.add_node("run_chunk_pipeline", run_chunk_pipeline)
+
+    graph.set_entry_point("convert_to_markdown")
+    graph.add_edge("convert_to_markdown", "prepare_documents")
+    graph.add_edge("prepare_documents", "split_into_chunks")
+    graph.add_edge("split_into_chunks", "run_chunk_pipeline")
+
+    if run_live_reports:
+        graph.add_node("generate_live_reports_analysis", generate_live_reports_analysis)
+        graph.add_node("generate_addendum_report", generate_addendum_report)
+        graph.add_edge("run_chunk_pipeline", "generate_live_reports_analysis")
+        graph.add_edge("generate_live_reports_analysis", "generate_addendum_report")
+        last_node = "generate_addendum_report"
+    else:
+        last_node = "run_chunk_pipeline"
+
+    graph.add_node("rank_issues", rank_issues)
+    graph.add_edge(last_node, "rank_issues")
+    graph.set_finish_point("rank_issues")
+
+    return graph
+
+
+@lru_cache(maxsize=None)
+def _compile_graph(
+    use_toulmin: bool,
+    run_literature_review: bool,
+    run_suggest_citations: bool,
+    use_rag: bool,
+    run_live_reports: bool,
+    run_reference_validation: bool,
+    use_chunk_pipeline: bool,
+) -> CompiledStateGraph:
+    return build_claim_substantiator_graph(
+        use_toulmin=use_toulmin,
+        run_literature_review=run_literature_review,
+        run_suggest_citations=run_suggest_citations,
+        use_rag=use_rag,
+        run_live_reports=run_live_reports,
+        run_reference_validation=run_reference_validation,
+        use_chunk_pipeline=use_chunk_pipeline,
+    ).compile()
+
+
+def get_compiled_graph(
+    checkpointer: BaseCheckpointSaver,
+    use_toulmin: bool = False,
+    run_literature_review: bool = True,
+    run_suggest_citations: bool = True,
+    use_rag: bool = True,
+    run_live_reports: bool = False,
+    run_reference_validation: bool = False,
+    use_chunk_pipeline: bool = False,
+) -> CompiledStateGraph:
+    """
+    Get the compiled claim substantiation graph for the given flags, bound to
+    `checkpointer` (flags as in `build_claim_substantiator_graph`).
+
+    Graphs are compiled once per flag combination and shared; binding the
+    checkpointer is a shallow copy of the compiled graph.
+    """
+    compiled = _compile_graph(
+        use_toulmin,
+        run_literature_review,
+        run_suggest_citations,
+        use_rag,
+        run_live_reports,
+        run_reference_validation,
+        use_chunk_pipeline,
+    )
+    return compiled.copy(update={"checkpointer": checkpointer})
+
+
 if __name__ == "__main__":
     # Print the graph in mermaid format
     # Paste it into https://mermaid.live/ to see the graph
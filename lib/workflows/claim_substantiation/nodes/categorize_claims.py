@@ -14,7 +14,7 @@ from lib.workflows.claim_substantiation.state import (
     ClaimSubstantiatorState,
     DocumentChunk,
 )
-from lib.workflows.chunk_iterator import iterate_chunks
+from lib.workflows.chunk_iterator import iterate_chunks, iterate_claims
 from lib.workflows.decorators import handle_chunk_errors, handle_workflow_node_errors
 
 logger = logging.getLogger(__name__)
@@ -45,8 +45,9 @@ async def _categorize_chunk_claims(
         )
         return chunk
 
-    categorization_results = []
-    for claim_index, claim in enumerate(chunk.claims.claims):
+    async def _categorize_claim(
+        claim_index: int, claim
+    ) -> ClaimCategorizationResponseWithClaimIndex:
         result = await claim_categorizer_agent.ainvoke(
             {
                 "full_document": state.file.markdown,
@@ -59,14 +60,14 @@ async def _categorize_chunk_claims(
                 ),
             }
         )
-        categorization_results.append(
-            ClaimCategorizationResponseWithClaimIndex(
-                chunk_index=chunk.chunk_index,
-                claim_index=claim_index,
-                **result.model_dump(),
-            )
+        return ClaimCategorizationResponseWithClaimIndex(
+            chunk_index=chunk.chunk_index,
+            claim_index=claim_index,
+            **result.model_dump(),
         )
 
+    categorization_results = await iterate_claims(state, chunk, _categorize_claim)
+
     return chunk.model_copy(update={"claim_categories": categorization_results})
 
 
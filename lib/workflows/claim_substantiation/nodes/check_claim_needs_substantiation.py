@@ -6,7 +6,7 @@ from lib.agents.claim_needs_substantiation_checker import (
     claim_needs_substantiation_checker_agent,
 )
 from lib.agents.formatting_utils import format_audience_context, format_domain_context
-from lib.workflows.chunk_iterator import iterate_chunks
+from lib.workflows.chunk_iterator import iterate_chunks, iterate_claims
 from lib.workflows.claim_substantiation.state import (
     ClaimSubstantiatorState,
     DocumentChunk,
@@ -48,8 +48,9 @@ async def _check_chunk_claim_needs_substantiation(
         )
         return chunk
 
-    claim_common_knowledge_results = []
-    for claim_index, claim in enumerate(chunk.claims.claims):
+    async def _check_claim(
+        claim_index: int, claim
+    ) -> ClaimCommonKnowledgeResultWithClaimIndex:
         result = await claim_needs_substantiation_checker_agent.ainvoke(
             {
                 "full_document": state.file.markdown,
@@ -63,14 +64,14 @@ async def _check_chunk_claim_needs_substantiation(
             }
         )
 
-        claim_common_knowledge_results.append(
-            ClaimCommonKnowledgeResultWithClaimIndex(
-                chunk_index=chunk.chunk_index,
-                claim_index=claim_index,
-                **result.model_dump(),
-            )
+        return ClaimCommonKnowledgeResultWithClaimIndex(
+            chunk_index=chunk.chunk_index,
+            claim_index=claim_index,
+            **result.model_dump(),
         )
 
+    claim_common_knowledge_results = await iterate_claims(state, chunk, _check_claim)
+
     return chunk.model_copy(
         update={"claim_common_knowledge_results": claim_common_knowledge_results}
     )
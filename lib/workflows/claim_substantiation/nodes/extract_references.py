@@ -21,6 +21,12 @@ async def extract_references(state: ClaimSubstantiatorState) -> ClaimSubstantiat
         )
         return {}
 
+    if state.revision is not None and state.revision.references_reused:
+        logger.info(
+            f"extract_references ({state.config.session_id}): Skipping reference extraction (carried over from the previous revision)"
+        )
+        return {}
+
     markdown = state.file.markdown
     supporting_documents = format_supporting_documents_prompt_section_multiple(
         state.supporting_files, truncate_at_character_count=1000
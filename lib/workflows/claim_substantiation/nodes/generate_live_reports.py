@@ -1,5 +1,7 @@
 # %%
 import logging
+from typing import Optional
+
 from lib.agents.live_literature_review import (
     live_literature_review_agent,
     LiveLiteratureReviewResponse,
@@ -14,7 +16,7 @@ from lib.workflows.claim_substantiation.state import (
     DocumentChunk,
     SubstantiationWorkflowConfig,
 )
-from lib.workflows.chunk_iterator import iterate_chunks
+from lib.workflows.chunk_iterator import iterate_chunks, iterate_claims
 from lib.workflows.decorators import handle_workflow_node_errors
 
 logger = logging.getLogger(__name__)
@@ -63,9 +65,9 @@ async def _analyze_chunk_live_reports(
         )
         return chunk
 
-    live_reports_analysis_results = []
-
-    for claim_index, claim in enumerate(chunk.claims.claims):
+    async def _analyze_claim_live_reports(
+        claim_index: int, claim
+    ) -> Optional[EvidenceWeighterResponseWithClaimIndex]:
         try:
             # Step 1: Find newer literature
             literature_review_result = await live_literature_review_agent.ainvoke(
@@ -98,12 +100,10 @@ async def _analyze_chunk_live_reports(
                 }
             )
 
-            live_reports_analysis_results.append(
-                EvidenceWeighterResponseWithClaimIndex(
-                    chunk_index=chunk.chunk_index,
-                    claim_index=claim_index,
-                    **live_reports_analysis_result.model_dump(),
-                )
+            return EvidenceWeighterResponseWithClaimIndex(
+                chunk_index=chunk.chunk_index,
+                claim_index=claim_index,
+                **live_reports_analysis_result.model_dump(),
             )
 
         except Exception as e:
@@ -112,7 +112,11 @@ async def _analyze_chunk_live_reports(
                 exc_info=True,
             )
             # Continue processing other claims even if one fails
-            continue
+            return None
+
+    live_reports_analysis_results = await iterate_claims(
+        state, chunk, _analyze_claim_live_reports
+    )
 
     return chunk.model_copy(
         update={
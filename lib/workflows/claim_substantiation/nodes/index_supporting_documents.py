@@ -1,17 +1,15 @@
 import logging
 
-from lib.services.file import FileDocument
-from lib.services.vector_store import (
-    get_collection_id,
-    get_file_hash_from_path,
-    get_vector_store_service,
-)
+from lib.services.document_indexer import DocumentToIndex, get_document_indexer
+from lib.services.vector_store import get_file_hash_from_path
 from lib.workflows.claim_substantiation.state import ClaimSubstantiatorState
+from lib.workflows.decorators import handle_workflow_node_errors
 from lib.workflows.models import WorkflowError
 
 logger = logging.getLogger(__name__)
 
 
+@handle_workflow_node_errors()
 async def index_supporting_documents(
     state: ClaimSubstantiatorState,
 ) -> ClaimSubstantiatorState:
@@ -29,47 +27,28 @@ async def index_supporting_documents(
 
     logger.info(f"Indexing {len(state.supporting_files)} supporting documents for RAG")
 
-    indexed_count = 0
-    failed_files: list[str] = []
-    errors: list[WorkflowError] = []
-
-    for file_doc in state.supporting_files:
-        try:
-            await index_file_document(file_doc)
-            indexed_count += 1
-
-        except Exception as e:
-            logger.error(f"Failed to index {file_doc.file_name}: {e}")
-            errors.append(
-                WorkflowError(
-                    task_name="index_supporting_documents",
-                    error=str(e),
-                )
+    report = await get_document_indexer().index_documents(
+        [
+            DocumentToIndex(
+                file_hash=get_file_hash_from_path(file_doc.file_path),
+                file_name=file_doc.file_name,
+                markdown=file_doc.markdown,
             )
-            failed_files.append(file_doc.file_name)
+            for file_doc in state.supporting_files
+        ]
+    )
 
-    if indexed_count:
-        logger.info(f"Successfully indexed {indexed_count} collections")
-    if failed_files:
-        logger.warning(f"Failed to index {len(failed_files)} files: {failed_files}")
+    errors = [
+        WorkflowError(
+            task_name="index_supporting_documents",
+            error=f"Failed to index {error.file_name}: {error.error}",
+        )
+        for error in report.errors.values()
+    ]
+    if errors:
+        logger.warning(
+            f"Failed to index {len(errors)} files: "
+            f"{[error.file_name for error in report.errors.values()]}"
+        )
 
     return {"errors": errors}
-
-
-async def index_file_document(file_doc: FileDocument) -> int:
-    vector_store = get_vector_store_service()
-
-    file_hash = get_file_hash_from_path(file_doc.file_path)
-    collection_id = get_collection_id(file_hash)
-
-    collection_exists = await vector_store.is_collection_indexed(collection_id)
-    if collection_exists:
-        logger.info(f"Collection {collection_id} already exists, skipping indexing")
-        return 0
-
-    indexed_docs_count = await vector_store.index_document(
-        markdown_content=file_doc.markdown,
-        file_name=file_doc.file_name,
-        collection_id=collection_id,
-    )
-    return indexed_docs_count
@@ -2,6 +2,10 @@ import logging
 
 from lib.run_utils import call_maybe_async
 from lib.services.nltk_text_splitter import NLTKTextSplitter
+from lib.workflows.claim_substantiation.revision import (
+    align_revision,
+    load_previous_state,
+)
 from lib.workflows.claim_substantiation.state import (
     ClaimSubstantiatorState,
     DocumentChunk,
@@ -48,15 +52,24 @@ async def split_into_chunks(state: ClaimSubstantiatorState) -> ClaimSubstantiato
     # Automatically handle both sync and async chunkers
     docs = await call_maybe_async(chunker.create_documents, [markdown])
 
+    chunks = [
+        DocumentChunk(
+            content=doc.page_content,
+            chunk_index=doc.metadata.chunk_index,
+            paragraph_index=doc.metadata.paragraph_index,
+        )
+        for doc in docs
+    ]
+
     logger.info(f"split_into_chunks ({state.config.session_id}): done")
 
-    return {
-        "chunks": [
-            DocumentChunk(
-                content=doc.page_content,
-                chunk_index=doc.metadata.chunk_index,
-                paragraph_index=doc.metadata.paragraph_index,
-            )
-            for doc in docs
-        ]
-    }
+    previous_workflow_run_id = state.config.previous_workflow_run_id
+    if previous_workflow_run_id:
+        previous = await load_previous_state(previous_workflow_run_id)
+        if previous is not None:
+            return align_revision(previous, state, chunks)
+        logger.warning(
+            f"split_into_chunks ({state.config.session_id}): previous run {previous_workflow_run_id} has no state, analyzing the whole document"
+        )
+
+    return {"chunks": chunks}
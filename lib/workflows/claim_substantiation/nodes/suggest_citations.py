@@ -1,10 +1,12 @@
 import logging
+from typing import Optional
+
 from lib.agents.citation_suggester import (
     CitationSuggestionResponse,
     CitationSuggestionResultWithClaimIndex,
     citation_suggester_agent,
 )
-from lib.workflows.chunk_iterator import iterate_chunks
+from lib.workflows.chunk_iterator import iterate_chunks, iterate_claims
 from lib.workflows.claim_substantiation.state import (
     ClaimSubstantiatorState,
     DocumentChunk,
@@ -55,8 +57,9 @@ async def _suggest_chunk_citations(
         )
         return chunk
 
-    citation_suggestions = []
-    for claim_index, claim in enumerate(chunk.claims.claims):
+    async def _suggest_claim_citations(
+        claim_index: int, claim
+    ) -> Optional[CitationSuggestionResultWithClaimIndex]:
         category = next(
             (
                 result
@@ -66,7 +69,7 @@ async def _suggest_chunk_citations(
             None,
         )
         if category and not category.needs_external_verification:
-            continue
+            return None
 
         cited_references = format_cited_references(
             state.references,
@@ -88,12 +91,12 @@ async def _suggest_chunk_citations(
                 "literature_review_report": state.literature_review,
             }
         )
-        citation_suggestions.append(
-            CitationSuggestionResultWithClaimIndex(
-                chunk_index=chunk.chunk_index,
-                claim_index=claim_index,
-                **result.model_dump(),
-            )
+        return CitationSuggestionResultWithClaimIndex(
+            chunk_index=chunk.chunk_index,
+            claim_index=claim_index,
+            **result.model_dump(),
         )
 
+    citation_suggestions = await iterate_claims(state, chunk, _suggest_claim_citations)
+
     return chunk.model_copy(update={"citation_suggestions": citation_suggestions})
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from lib.agents.formatting_utils import (
     format_audience_context,
@@ -13,7 +14,7 @@ from lib.workflows.claim_substantiation.state import (
     ClaimSubstantiatorState,
     DocumentChunk,
 )
-from lib.workflows.chunk_iterator import iterate_chunks
+from lib.workflows.chunk_iterator import iterate_chunks, iterate_claims
 from lib.workflows.decorators import handle_chunk_errors
 
 logger = logging.getLogger(__name__)
@@ -53,8 +54,9 @@ async def _validate_chunk_inferences(
         )
         return chunk
 
-    validation_results = []
-    for claim_index, claim in enumerate(chunk.claims.claims):
+    async def _validate_claim_inference(
+        claim_index: int, claim
+    ) -> Optional[InferenceValidationResponseWithClaimIndex]:
         # Find the categorization result for this claim
         categorization = next(
             (cat for cat in chunk.claim_categories if cat.claim_index == claim_index),
@@ -72,7 +74,7 @@ async def _validate_chunk_inferences(
                 chunk.chunk_index,
                 categorization.claim_category if categorization else "None",
             )
-            continue
+            return None
 
         logger.debug(
             "Validating inference for claim %s in chunk %s",
@@ -92,14 +94,14 @@ async def _validate_chunk_inferences(
                 ),
             }
         )
-        validation_results.append(
-            InferenceValidationResponseWithClaimIndex(
-                chunk_index=chunk.chunk_index,
-                claim_index=claim_index,
-                **result.model_dump(),
-            )
+        return InferenceValidationResponseWithClaimIndex(
+            chunk_index=chunk.chunk_index,
+            claim_index=claim_index,
+            **result.model_dump(),
         )
 
+    validation_results = await iterate_claims(state, chunk, _validate_claim_inference)
+
     logger.debug(
         "Validated %s inference claims for chunk %s",
         len(validation_results),
@@ -20,6 +20,13 @@ async def validate_references(
         )
         return {}
 
+    revision = state.revision
+    if revision and revision.references_reused and state.references_validated:
+        logger.info(
+            f"validate_references ({state.config.session_id}): Skipping validate references (carried over from the previous revision)"
+        )
+        return {}
+
     validate_references_response = await reference_validator_agent.ainvoke(
         {
             "references": state.references,
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from lib.agents.citation_detector import CitationResponse
 from lib.agents.claim_verifier import (
@@ -10,7 +11,7 @@ from lib.agents.formatting_utils import (
     format_domain_context,
 )
 from lib.agents.formatting_utils import format_audience_context, format_domain_context
-from lib.workflows.chunk_iterator import iterate_chunks
+from lib.workflows.chunk_iterator import iterate_chunks, iterate_claims
 from lib.workflows.claim_substantiation.reference_providers import (
     CitationBasedReferenceProvider,
     RAGReferenceProvider,
@@ -79,14 +80,14 @@ async def _verify_chunk_claims_with_provider(
         logger.debug(f"Chunk {chunk.chunk_index} has no claims")
         return chunk
 
-    substantiations = []
-
-    for claim_index, claim in enumerate(chunk.claims.claims):
+    async def _verify_claim(
+        claim_index: int, claim
+    ) -> Optional[ClaimSubstantiationResultWithClaimIndex]:
         if not _needs_substantiation(state, chunk, claim_index):
             logger.debug(
                 f"Chunk {chunk.chunk_index} claim {claim_index} does not need external verification, skipping verification"
             )
-            continue
+            return None
 
         ref_context = await reference_provider.get_references_for_claim(
             state, chunk, claim, claim_index
@@ -117,14 +118,14 @@ async def _verify_chunk_claims_with_provider(
                 update={"retrieved_passages": ref_context.retrieved_passages}
             )
 
-        substantiations.append(
-            ClaimSubstantiationResultWithClaimIndex(
-                chunk_index=chunk.chunk_index,
-                claim_index=claim_index,
-                **result.model_dump(),
-            )
+        return ClaimSubstantiationResultWithClaimIndex(
+            chunk_index=chunk.chunk_index,
+            claim_index=claim_index,
+            **result.model_dump(),
         )
 
+    substantiations = await iterate_claims(state, chunk, _verify_claim)
+
     return chunk.model_copy(update={"substantiations": substantiations})
 
 
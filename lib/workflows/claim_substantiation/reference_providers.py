@@ -20,6 +20,7 @@ from lib.agents.formatting_utils import (
 from lib.agents.reference_extractor import BibliographyItem
 from lib.services.file import FileDocument
 from lib.services.vector_store import (
+    RetrievedPassage,
     get_collection_id,
     get_file_hash_from_path,
     get_vector_store_service,
@@ -135,22 +136,14 @@ class RAGReferenceProvider:
         try:
             query = self._build_enriched_query(chunk, claim)
 
-            # Get the passages for the citations in the chunk
+            # Supporting files for the citations in the chunk
             chunk_citation_supporting_files = self._get_supporting_files_for_citations(
                 state.supporting_files,
                 state.references,
                 chunk.citations.citations if chunk.citations else [],
             )
-            chunk_citation_passages = await self._get_passages(
-                query, chunk_citation_supporting_files
-            )
 
-            logger.info(
-                f"Retrieved {len(chunk_citation_passages)} passages for chunk {chunk.chunk_index}, claim {claim_index} "
-                f"from {len(chunk_citation_supporting_files)} matched supporting files, using query: '{query}'"
-            )
-
-            # Get the passages for the other citations in the paragraph
+            # Supporting files for the other citations in the paragraph
             all_paragraph_citations = get_all_paragraph_citations(state, chunk)
             paragraph_supportings_files = self._get_supporting_files_for_citations(
                 state.supporting_files,
@@ -160,10 +153,25 @@ class RAGReferenceProvider:
             extra_supporting_files = (
                 paragraph_supportings_files - chunk_citation_supporting_files
             )
-            paragraph_citations_passages = await self._get_passages(
-                query, extra_supporting_files
+
+            # Embed the query once and reuse it for both retrievals
+            query_embedding = None
+            if chunk_citation_supporting_files or extra_supporting_files:
+                query_embedding = await get_vector_store_service().embed_query(query)
+
+            chunk_citation_passages, paragraph_citations_passages = (
+                await asyncio.gather(
+                    self._get_passages(
+                        query, query_embedding, chunk_citation_supporting_files
+                    ),
+                    self._get_passages(query, query_embedding, extra_supporting_files),
+                )
             )
 
+            logger.info(
+                f"Retrieved {len(chunk_citation_passages)} passages for chunk {chunk.chunk_index}, claim {claim_index} "
+                f"from {len(chunk_citation_supporting_files)} matched supporting files, using query: '{query}'"
+            )
             logger.info(
                 f"Retrieved {len(paragraph_citations_passages)} passages for paragraph from chunk {chunk.chunk_index}, claim {claim_index} "
                 f"from {len(extra_supporting_files)} matched supporting files, using query: '{query}'"
@@ -191,25 +199,22 @@ class RAGReferenceProvider:
             raise Exception(f"RAG retrieval failed for claim {claim_index}") from e
 
     async def _get_passages(
-        self, query: str, supporting_files: List[FileDocument]
-    ) -> List[RetrievedPassageInfo]:
+        self,
+        query: str,
+        query_embedding: Optional[List[float]],
+        supporting_files: Set[FileDocument],
+    ) -> List[RetrievedPassage]:
+        """Top passages of each supporting file, sorted by cosine distance."""
         vector_store = get_vector_store_service()
-
-        retrieval_tasks = [
-            vector_store.retrieve_relevant_passages(
-                query=query,
-                collection_id=get_collection_id(
-                    get_file_hash_from_path(file_doc.file_path)
-                ),
-                top_k=10,
-            )
-            for file_doc in supporting_files
-        ]
-
-        results = await asyncio.gather(*retrieval_tasks)
-        all_passages = [passage for passages in results for passage in passages]
-        all_passages.sort(key=lambda p: p.cosine_distance, reverse=False)
-        return all_passages
+        return await vector_store.retrieve_relevant_passages_from_collections(
+            query=query,
+            collection_ids=[
+                get_collection_id(get_file_hash_from_path(file_doc.file_path))
+                for file_doc in supporting_files
+            ],
+            top_k=10,
+            query_embedding=query_embedding,
+        )
 
     def _build_enriched_query(self, chunk: DocumentChunk, claim: Claim) -> str:
         """
@@ -0,0 +1,227 @@
+"""
+Incremental analysis of a revised document.
+
+A run started with `config.previous_workflow_run_id` aligns its chunks to the chunks
+of the previous run by content hash. Chunks whose content, paragraph and references
+are unchanged carry over their previous results, so the agents only run on the
+changed or new chunks (see `get_target_chunks`).
+"""
+
+import hashlib
+import logging
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from sqlmodel import select
+
+from lib.config.database import get_async_db
+from lib.models.workflow_run import WorkflowRun
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.checkpointer import get_checkpointer
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    RevisionCarryOver,
+)
+
+logger = logging.getLogger(__name__)
+
+# Config fields the chunk results depend on; both runs must agree on them
+_RESULT_CONFIG_FIELDS = {
+    "use_toulmin",
+    "use_rag",
+    "run_literature_review",
+    "run_suggest_citations",
+    "run_live_reports",
+    "domain",
+    "target_audience",
+    "document_publication_date",
+    "agents_to_run",
+}
+
+# Per-claim results, each produced by one agent call
+_CLAIM_RESULT_FIELDS = (
+    "claim_categories",
+    "claim_common_knowledge_results",
+    "substantiations",
+    "citation_suggestions",
+    "live_reports_analysis",
+    "inference_validations",
+)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+async def load_previous_state(
+    workflow_run_id: str,
+) -> Optional[ClaimSubstantiatorState]:
+    """Final state of a previous run, read from its last checkpoint."""
+    async with get_async_db() as db:
+        run = (
+            await db.exec(select(WorkflowRun).where(WorkflowRun.id == workflow_run_id))
+        ).first()
+    if run is None:
+        return None
+
+    async with get_checkpointer() as checkpointer:
+        checkpoint = await checkpointer.aget_tuple(
+            {"configurable": {"thread_id": run.langgraph_thread_id}}
+        )
+    if checkpoint is None:
+        return None
+
+    values = checkpoint.checkpoint["channel_values"]
+    previous = ClaimSubstantiatorState(
+        **{
+            key: value
+            for key, value in values.items()
+            if key in ClaimSubstantiatorState.model_fields
+        }
+    )
+    await previous.load_documents()
+    return previous
+
+
+def _supporting_files_fingerprint(files: Optional[List[FileDocument]]) -> List[tuple]:
+    return [(file.file_name, _hash(file.markdown)) for file in files or []]
+
+
+def _bibliography_span(markdown: str, references: List[str]) -> Optional[str]:
+    """Text from the first to the last reference, or None if one is missing."""
+    start = end = None
+    position = 0
+    for reference in references:
+        index = markdown.find(reference, position)
+        if index < 0:
+            return None
+        if start is None:
+            start = index
+        position = end = index + len(reference)
+    return markdown[start:end]
+
+
+def _references_unchanged(
+    previous: ClaimSubstantiatorState, state: ClaimSubstantiatorState
+) -> bool:
+    """
+    Whether the previous references still apply to the revision: same supporting
+    documents, and the same bibliography text, so that the citations of carried
+    over chunks still point to the same bibliography items.
+    """
+    if not previous.references:
+        # Nothing to compare against: a bibliography may have been added
+        return False
+    if _supporting_files_fingerprint(
+        previous.supporting_files
+    ) != _supporting_files_fingerprint(state.supporting_files):
+        return False
+
+    references = [_normalize(reference.text) for reference in previous.references]
+    previous_span = _bibliography_span(_normalize(previous.file.markdown), references)
+    span = _bibliography_span(_normalize(state.file.markdown), references)
+    return span is not None and span == previous_span
+
+
+def _paragraph_hashes(chunks: List[DocumentChunk]) -> Dict[int, str]:
+    paragraphs: Dict[int, List[str]] = {}
+    for chunk in chunks:
+        paragraphs.setdefault(chunk.paragraph_index, []).append(chunk.content)
+    return {index: _hash("\n".join(text)) for index, text in paragraphs.items()}
+
+
+def _count_llm_calls(chunk: DocumentChunk) -> int:
+    calls = int(chunk.claims is not None) + int(chunk.citations is not None)
+    return calls + sum(len(getattr(chunk, field)) for field in _CLAIM_RESULT_FIELDS)
+
+
+def _carry_over_chunk(previous: DocumentChunk, chunk: DocumentChunk) -> DocumentChunk:
+    """Previous results of the chunk, moved to the chunk's position in the revision."""
+    update = {
+        field: [
+            result.model_copy(update={"chunk_index": chunk.chunk_index})
+            for result in getattr(previous, field)
+        ]
+        for field in _CLAIM_RESULT_FIELDS
+    }
+    return previous.model_copy(
+        update={
+            **update,
+            "chunk_index": chunk.chunk_index,
+            "paragraph_index": chunk.paragraph_index,
+        }
+    )
+
+
+def align_revision(
+    previous: ClaimSubstantiatorState,
+    state: ClaimSubstantiatorState,
+    chunks: List[DocumentChunk],
+) -> dict:
+    """
+    State update carrying over the results of unchanged chunks from the previous
+    run. `chunks` are the freshly split chunks of the revision.
+    """
+    carry_over = RevisionCarryOver(
+        previous_workflow_run_id=state.config.previous_workflow_run_id,
+        changed_chunk_indices=[chunk.chunk_index for chunk in chunks],
+    )
+
+    previous_config = previous.config.model_dump(include=_RESULT_CONFIG_FIELDS)
+    if previous_config != state.config.model_dump(include=_RESULT_CONFIG_FIELDS):
+        logger.info("Revision analyzed with a different configuration, not reusing")
+        return {"chunks": chunks, "revision": carry_over}
+    if not _references_unchanged(previous, state):
+        logger.info("References of the revision changed, not reusing")
+        return {"chunks": chunks, "revision": carry_over}
+
+    previous_paragraphs = _paragraph_hashes(previous.chunks)
+    paragraphs = _paragraph_hashes(chunks)
+
+    # Longest matching runs of identical chunks, in document order
+    matcher = SequenceMatcher(
+        None,
+        [_hash(chunk.content) for chunk in previous.chunks],
+        [_hash(chunk.content) for chunk in chunks],
+        autojunk=False,
+    )
+    updated_chunks = list(chunks)
+    reused = set()
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            previous_chunk = previous.chunks[block.a + offset]
+            chunk = chunks[block.b + offset]
+            if (
+                previous_paragraphs[previous_chunk.paragraph_index]
+                != paragraphs[chunk.paragraph_index]
+            ):
+                continue
+            updated_chunks[block.b + offset] = _carry_over_chunk(previous_chunk, chunk)
+            reused.add(chunk.chunk_index)
+            carry_over.llm_calls_saved += _count_llm_calls(previous_chunk)
+
+    carry_over.reused_chunk_indices = sorted(reused)
+    carry_over.changed_chunk_indices = [
+        chunk.chunk_index for chunk in chunks if chunk.chunk_index not in reused
+    ]
+    carry_over.references_reused = True
+    carry_over.llm_calls_saved += 1 + int(bool(previous.references_validated))
+
+    logger.info(
+        f"Revision of {carry_over.previous_workflow_run_id}: reusing "
+        f"{len(reused)}/{len(chunks)} chunks, saving "
+        f"{carry_over.llm_calls_saved} LLM calls"
+    )
+
+    return {
+        "chunks": updated_chunks,
+        "references": previous.references,
+        "references_validated": previous.references_validated,
+        "revision": carry_over,
+    }
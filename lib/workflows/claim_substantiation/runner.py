@@ -8,16 +8,30 @@ from typing import List, Optional
 from lib.config.langfuse import langfuse_handler
 from lib.models.workflow_run import WorkflowRunStatus
 from lib.services.file import FileDocument
+from lib.services.chunk_results import ChunkResultWriter
+from lib.services.llm_cache import llm_cache
+from lib.services.workflow_events import (
+    WorkflowEventPublisher,
+    WorkflowRunEventType,
+)
 from lib.services.workflow_runs import (
+    WorkflowRunStatusWriter,
+    save_workflow_run_summary,
     upsert_workflow_run,
 )
+from lib.workflows.chunk_journal import clear_chunk_journal
 from lib.workflows.claim_substantiation.checkpointer import get_checkpointer
-from lib.workflows.claim_substantiation.graph import build_claim_substantiator_graph
+from lib.workflows.claim_substantiation.graph import get_compiled_graph
+from lib.workflows.claim_substantiation.nodes.rank_issues import rank_issues
 from lib.workflows.claim_substantiation.state import (
+    ChunkErrorsReplacement,
     ClaimSubstantiatorState,
+    ExecutionEngine,
     SubstantiationWorkflowConfig,
+    conciliate_chunks,
+    conciliate_errors,
 )
-from lib.workflows.models import WorkflowError
+from lib.workflows.models import ChunkProgress, WorkflowError
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +40,7 @@ async def run_claim_substantiator(
     file: FileDocument,
     supporting_files: Optional[List[FileDocument]] = None,
     config: SubstantiationWorkflowConfig = None,
+    resume: bool = False,
 ) -> ClaimSubstantiatorState:
     """
     Claim substantiation runner using LangGraph approach.
@@ -35,6 +50,9 @@ async def run_claim_substantiator(
     - For selective re-evaluation: provide config.target_chunk_indices and/or config.agents_to_run
     - For re-evaluation with existing results: provide existing_state to preserve previous results
 
+    With `resume`, a run of the same session_id that was interrupted (e.g. its worker
+    crashed) continues from its last checkpoint instead of starting over.
+
     This is the single, authoritative entry point for claim substantiation.
     """
 
@@ -47,7 +65,7 @@ async def run_claim_substantiator(
         config=config,
     )
 
-    return await _execute(state)
+    return await _execute(state, resume=resume)
 
 
 async def reevaluate_single_chunk(
@@ -94,29 +112,129 @@ async def reevaluate_single_chunk(
     return await _execute(state)
 
 
-async def _execute(state: ClaimSubstantiatorState):
+async def reevaluate_checkpointed_chunk(
+    session_id: str, chunk_index: int, agents_to_run: List[str]
+) -> ClaimSubstantiatorState:
+    """
+    Re-evaluate a single chunk of a finished session from its checkpointed state,
+    and write the re-evaluated chunk back into the session's checkpoint.
+
+    Returns the updated state of the session. Callers serialize the re-evaluations
+    of a session, each one reads the state written by the previous one.
+    """
+    thread_config = {"configurable": {"thread_id": session_id}}
+    async with get_checkpointer() as checkpointer:
+        snapshot = await get_compiled_graph(checkpointer).aget_state(thread_config)
+        if not snapshot.values:
+            raise ValueError(f"Session {session_id} has no checkpoint")
+        state = ClaimSubstantiatorState(**snapshot.values)
+        if not any(chunk.chunk_index == chunk_index for chunk in state.chunks):
+            raise ValueError(f"Chunk {chunk_index} not found")
+        await state.load_documents()
+
+        logger.info(
+            f"Re-evaluating chunk {chunk_index} of {session_id} with agents {agents_to_run}"
+        )
+        config = state.config.model_copy(
+            update={
+                "target_chunk_indices": [chunk_index],
+                "agents_to_run": agents_to_run,
+            }
+        )
+        errors = [error for error in state.errors if error.chunk_index != chunk_index]
+        # Run without a checkpointer, only the chunk is kept from the result
+        result = await (
+            _compile_graph(None, config)
+            .with_config(
+                {
+                    "callbacks": [langfuse_handler],
+                    "metadata": {"langfuse_session_id": session_id},
+                }
+            )
+            .ainvoke(state.model_copy(update={"config": config, "errors": errors}))
+        )
+        result = ClaimSubstantiatorState(**result)
+
+        chunk = next(c for c in result.chunks if c.chunk_index == chunk_index)
+        chunk_errors = [
+            error for error in result.errors if error.chunk_index == chunk_index
+        ]
+        update = {
+            "chunks": [chunk],
+            # Replaces the previous errors of the chunk instead of appending to them
+            "errors": ChunkErrorsReplacement(
+                chunk_index=chunk_index, errors=chunk_errors
+            ),
+        }
+        updated_state = state.model_copy(
+            update={
+                "chunks": conciliate_chunks(state.chunks, [chunk]),
+                "errors": conciliate_errors(state.errors, update["errors"]),
+            }
+        )
+        updated_state.ranked_issues = rank_issues(updated_state)["ranked_issues"]
+
+        # Only the chunk and its errors go through the reducers. As the update of the
+        # last node, the session stays finished.
+        await _compile_graph(checkpointer, state.config).aupdate_state(
+            thread_config,
+            {**update, "ranked_issues": updated_state.ranked_issues},
+            as_node="rank_issues",
+        )
+
+    return updated_state
+
+
+async def _handle_progress_event(
+    mode: str,
+    chunk: dict,
+    status_writer: WorkflowRunStatusWriter,
+    events: WorkflowEventPublisher,
+) -> None:
+    """Record node and chunk progress of a streamed event and publish it to clients."""
+    if mode == "tasks":
+        node = chunk["name"]
+        if node.startswith("__"):
+            return
+        if "result" not in chunk:
+            await events.publish(WorkflowRunEventType.NODE_STARTED, node=node)
+            return
+        status_writer.set_node_completed(node)
+        await events.publish(
+            WorkflowRunEventType.NODE_FINISHED,
+            node=node,
+            error=str(chunk["error"]) if chunk.get("error") else None,
+        )
+    elif mode == "custom" and chunk.get("type") == "chunk_progress":
+        progress = ChunkProgress(**chunk)
+        status_writer.set_chunk_progress(
+            progress.node, progress.chunks_done, progress.chunks_total
+        )
+        if progress.chunk_index is not None:
+            await events.publish(
+                WorkflowRunEventType.CHUNK_COMPLETED,
+                node=progress.node,
+                chunk_index=progress.chunk_index,
+                chunks_done=progress.chunks_done,
+                chunks_total=progress.chunks_total,
+                error=progress.error,
+            )
+
+
+async def _execute(state: ClaimSubstantiatorState, resume: bool = False):
     """
     Execute the claim substantiation workflow.
 
     Note: If reusing a session_id from a previous run with a different graph structure,
     checkpoints may cause unexpected behavior. Use a fresh session_id after graph changes.
     """
-    graph = build_claim_substantiator_graph(
-        use_toulmin=state.config.use_toulmin,
-        run_literature_review=state.config.run_literature_review,
-        run_suggest_citations=state.config.run_suggest_citations,
-        use_rag=state.config.use_rag,
-        run_live_reports=state.config.run_live_reports,
-        run_reference_validation=state.config.run_reference_validation,
-    )
-
     # Generate a fresh session ID if not provided to avoid checkpoint conflicts
     if state.config.session_id is None:
         state.config.session_id = str(uuid.uuid4())
         logger.info("Generated new session ID: %s", state.config.session_id)
 
     async with get_checkpointer() as checkpointer:
-        app = graph.compile(checkpointer=checkpointer).with_config(
+        app = _compile_graph(checkpointer, state.config).with_config(
             {
                 "callbacks": [langfuse_handler],
                 "metadata": {"langfuse_session_id": state.config.session_id},
@@ -131,37 +249,160 @@ async def _execute(state: ClaimSubstantiatorState):
 
         state.workflow_run_id = workflow_run_id
         updated_state = state
+        status_writer = WorkflowRunStatusWriter(
+            session_id=state.config.session_id,
+            status=WorkflowRunStatus.RUNNING,
+            title=state.file.file_name,
+        )
+
+        events = WorkflowEventPublisher(state.config.session_id)
+        chunk_results = ChunkResultWriter(workflow_run_id)
+        thread_config = {"configurable": {"thread_id": state.config.session_id}}
+        graph_input = state
+
+        if resume:
+            snapshot = await app.aget_state(thread_config)
+            if snapshot.next:
+                # Passing no input continues the thread from its last checkpoint
+                logger.info(
+                    f"Resuming session {state.config.session_id} at {snapshot.next}"
+                )
+                graph_input = None
+                updated_state = ClaimSubstantiatorState(**snapshot.values)
+                # The resumed nodes then read the bodies from the store's cache
+                await updated_state.load_documents()
+            elif snapshot.values:
+                logger.info(f"Session {state.config.session_id} already finished")
+                await status_writer.close(WorkflowRunStatus.COMPLETED)
+                await events.publish(WorkflowRunEventType.COMPLETED)
+                return ClaimSubstantiatorState(**snapshot.values)
+
+        errors_seen = len(updated_state.errors)
 
         try:
-            async for values in app.astream(
-                state,
-                {"configurable": {"thread_id": state.config.session_id}},
-                stream_mode="values",
-            ):
-                updated_state = ClaimSubstantiatorState(**values)
-
-                await upsert_workflow_run(
-                    session_id=state.config.session_id,
-                    status=WorkflowRunStatus.RUNNING,
-                    title=(
+            with llm_cache.bypass(state.config.bypass_llm_cache):
+                async for mode, chunk in app.astream(
+                    graph_input,
+                    thread_config,
+                    stream_mode=["values", "tasks", "custom"],
+                ):
+                    if mode != "values":
+                        await _handle_progress_event(mode, chunk, status_writer, events)
+                        continue
+
+                    updated_state = ClaimSubstantiatorState(**chunk)
+                    await chunk_results.write(updated_state.chunks)
+                    status_writer.set_title(
                         updated_state.main_document_summary.title
                         if updated_state.main_document_summary
-                        and updated_state.main_document_summary.title
                         else None
-                    ),
-                )
+                    )
+                    # Chunk errors are published with their chunk_completed event
+                    for error in updated_state.errors[errors_seen:]:
+                        if error.chunk_index is None:
+                            await events.publish(
+                                WorkflowRunEventType.ERROR,
+                                node=error.task_name,
+                                error=error.error,
+                            )
+                    errors_seen = len(updated_state.errors)
+        except asyncio.CancelledError:
+            # Interrupted (e.g. worker shutdown): the run stays RUNNING to be resumed
+            await status_writer.close(WorkflowRunStatus.RUNNING)
+            raise
         except Exception as e:
+            # The thread keeps its checkpoints, so the run can be resumed from the
+            # last completed node
             logger.error(f"Error streaming state: {e}", exc_info=True)
             updated_state.errors.append(WorkflowError(task_name="global", error=str(e)))
-        finally:
-            await upsert_workflow_run(
-                session_id=state.config.session_id,
-                status=WorkflowRunStatus.COMPLETED,
+            await status_writer.close(WorkflowRunStatus.FAILED)
+            await events.publish(
+                WorkflowRunEventType.ERROR, node="global", error=str(e)
             )
+            await events.publish(WorkflowRunEventType.COMPLETED)
+            return updated_state
+
+        # Before the run shows as completed, so that it is served from its summary
+        await _save_summary(workflow_run_id, updated_state)
+        await status_writer.close(WorkflowRunStatus.COMPLETED)
+        await events.publish(WorkflowRunEventType.COMPLETED)
+        await _clear_chunk_journal(state.config.session_id)
 
     return updated_state
 
 
+def _compile_graph(checkpointer, config: SubstantiationWorkflowConfig):
+    return get_compiled_graph(
+        checkpointer,
+        use_toulmin=config.use_toulmin,
+        run_literature_review=config.run_literature_review,
+        run_suggest_citations=config.run_suggest_citations,
+        use_rag=config.use_rag,
+        run_live_reports=config.run_live_reports,
+        run_reference_validation=config.run_reference_validation,
+        use_chunk_pipeline=config.execution_engine == ExecutionEngine.CHUNK_PIPELINE,
+    )
+
+
+async def _save_summary(workflow_run_id: str, state: ClaimSubstantiatorState) -> None:
+    # Otherwise materialized on the first read of the run
+    try:
+        await save_workflow_run_summary(workflow_run_id, state)
+    except Exception as e:
+        logger.warning(f"Failed to save the summary of {workflow_run_id}: {e}")
+
+
+async def _clear_chunk_journal(session_id: str) -> None:
+    # Chunk results are only needed to resume a node interrupted mid-way
+    try:
+        await clear_chunk_journal(session_id)
+    except Exception as e:
+        logger.warning(f"Failed to clear the chunk journal of {session_id}: {e}")
+
+
+async def _get_unfinished_snapshot(checkpointer, session_id: str):
+    thread_config = {"configurable": {"thread_id": session_id}}
+    checkpoint = await checkpointer.aget_tuple(thread_config)
+    if checkpoint is None or "config" not in checkpoint.checkpoint["channel_values"]:
+        return None
+
+    # The pending nodes depend on the graph the session was started with
+    config = SubstantiationWorkflowConfig.model_validate(
+        checkpoint.checkpoint["channel_values"]["config"]
+    )
+    snapshot = await _compile_graph(checkpointer, config).aget_state(thread_config)
+    return snapshot if snapshot.next else None
+
+
+async def has_unfinished_checkpoint(session_id: str) -> bool:
+    """Whether a session's graph stopped before finishing, see `get_unfinished_state`."""
+    async with get_checkpointer() as checkpointer:
+        return await _get_unfinished_snapshot(checkpointer, session_id) is not None
+
+
+async def get_unfinished_state(session_id: str) -> Optional[ClaimSubstantiatorState]:
+    """
+    Checkpointed state of a session whose graph stopped before finishing (crash,
+    error or shutdown), or None if the session finished or has no checkpoint.
+    """
+    async with get_checkpointer() as checkpointer:
+        snapshot = await _get_unfinished_snapshot(checkpointer, session_id)
+    if snapshot is None:
+        return None
+    return ClaimSubstantiatorState(**snapshot.values)
+
+
+async def resume_claim_substantiator(session_id: str) -> ClaimSubstantiatorState:
+    """
+    Continue an interrupted session from its last checkpoint. Nodes that completed
+    are not re-run, and a node interrupted mid-way reuses its completed chunks.
+    """
+    state = await get_unfinished_state(session_id)
+    if state is None:
+        raise ValueError(f"Session {session_id} has no unfinished checkpoint")
+    return await _execute(state, resume=True)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument(
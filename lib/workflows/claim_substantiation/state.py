@@ -1,3 +1,4 @@
+import asyncio
 from datetime import date
 from enum import StrEnum
 from operator import add
@@ -31,6 +32,15 @@ from lib.workflows.models import WorkflowError
 from lib.agents.addendum_report_generator import ReportOutput
 
 
+class ExecutionEngine(StrEnum):
+    """How the per-chunk stages of the workflow are scheduled."""
+
+    # One graph node per stage; each stage waits for all chunks of the previous one
+    GRAPH = "graph"
+    # One pipeline per chunk; stages only wait for the inputs they actually read
+    CHUNK_PIPELINE = "chunk_pipeline"
+
+
 class SubstantiationWorkflowConfig(BaseModel):
     """Configuration model for claim substantiation workflow"""
 
@@ -73,6 +83,22 @@ class SubstantiationWorkflowConfig(BaseModel):
     session_id: Optional[str] = Field(
         default=None, description="Session ID for Langfuse tracing"
     )
+    parallelize_claims: bool = Field(
+        default=True,
+        description="Run the per-claim agent calls of each chunk as concurrent tasks instead of one after another",
+    )
+    execution_engine: ExecutionEngine = Field(
+        default=ExecutionEngine.GRAPH,
+        description="Run stages as graph-wide nodes or stream each chunk through its own pipeline",
+    )
+    bypass_llm_cache: bool = Field(
+        default=False,
+        description="Skip LLM response cache lookups so every agent call hits the model",
+    )
+    previous_workflow_run_id: Optional[str] = Field(
+        default=None,
+        description="Workflow run of a previous revision of the document; results of unchanged chunks are carried over from it",
+    )
 
 
 class DocumentChunkSummary(ChunkWithIndex):
@@ -147,28 +173,67 @@ def conciliate_chunks(
             # If chunk doesn't exist in a, add it
             chunks_by_index[updated_chunk.chunk_index] = updated_chunk
         else:
-            # Merge the chunks by updating fields that have been updated in the updated chunk
-            merged_data = existing_chunk.model_dump()
-
-            # Update fields that have been updated in the updated chunk
-            for field, updated_value in updated_chunk.model_dump().items():
+            # Merge the fields updated in the updated chunk. Fields never set hold
+            # their defaults, and None and empty lists (the defaults) mean that no
+            # update has happened
+            update = {}
+            for field in updated_chunk.model_fields_set:
+                updated_value = getattr(updated_chunk, field)
                 if updated_value is None:
-                    # Skip None values - no update has happened
                     continue
-
                 if isinstance(updated_value, list) and not updated_value:
-                    # Skip empty lists - no update has happened (empty lists are used as default state values for some fields)
                     continue
+                update[field] = updated_value
+            if not update:
+                continue
 
-                merged_data[field] = updated_value
-
-            # Create the merged chunk
-            chunks_by_index[updated_chunk.chunk_index] = DocumentChunk(**merged_data)
+            # The merged chunk shares the unchanged results, values were already
+            # validated when the chunks were created
+            chunks_by_index[updated_chunk.chunk_index] = existing_chunk.model_copy(
+                update=update
+            )
 
     # Return chunks in order by chunk_index
     return [chunks_by_index[i] for i in sorted(chunks_by_index.keys())]
 
 
+class ChunkErrorsReplacement(BaseModel):
+    """Update of `errors` replacing the errors of a chunk, e.g. after re-evaluating it"""
+
+    chunk_index: int
+    errors: List[WorkflowError] = []
+
+
+def conciliate_errors(
+    a: List[WorkflowError], b: Union[List[WorkflowError], ChunkErrorsReplacement]
+) -> List[WorkflowError]:
+    """Reducer of `errors`: appends new errors, or replaces the errors of a chunk."""
+    if isinstance(b, ChunkErrorsReplacement):
+        return [error for error in a if error.chunk_index != b.chunk_index] + b.errors
+    return a + b
+
+
+class RevisionCarryOver(BaseModel):
+    """Results carried over from the run of a previous revision of the document"""
+
+    previous_workflow_run_id: str
+    reused_chunk_indices: List[int] = Field(
+        default_factory=list,
+        description="Chunks whose results were carried over from the previous run",
+    )
+    changed_chunk_indices: List[int] = Field(
+        default_factory=list,
+        description="Changed or new chunks, the only ones processed by the agents",
+    )
+    references_reused: bool = Field(
+        default=False,
+        description="Whether the references of the previous run were carried over",
+    )
+    llm_calls_saved: int = Field(
+        default=0, description="Agent calls whose results were carried over"
+    )
+
+
 class ClaimCommonKnowledgeResultChunk(BaseModel):
     """
     Wrapper for a list of claim common knowledge results for a single chunk.
@@ -237,7 +302,7 @@ class ClaimSubstantiatorState(BaseModel):
     references: Annotated[List[BibliographyItem], add] = []
     references_validated: Annotated[List[BibliographyItemValidation], add] = []
     chunks: Annotated[List[DocumentChunk], conciliate_chunks] = []
-    errors: Annotated[List[WorkflowError], add] = Field(
+    errors: Annotated[List[WorkflowError], conciliate_errors] = Field(
         default_factory=list,
         description="Errors that occurred during the processing of the document.",
     )
@@ -259,6 +324,17 @@ class ClaimSubstantiatorState(BaseModel):
         default_factory=list,
         description="Ranked list of document issues with severity levels",
     )
+    revision: Optional[RevisionCarryOver] = Field(
+        default=None,
+        description="Carry-over from the previous revision, when analyzing a revision",
+    )
+
+    async def load_documents(self) -> None:
+        """Load the stored markdown of the main and supporting files of a restored state."""
+        await asyncio.gather(
+            self.file.load_markdown(),
+            *(file.load_markdown() for file in self.supporting_files or []),
+        )
 
     def get_paragraph_chunks(self, paragraph_index: int) -> List[DocumentChunk]:
         return [
@@ -293,6 +369,7 @@ class ClaimSubstantiatorStateSummary(BaseModel):
     literature_review: Optional[LiteratureReviewResponse] = None
     addendum_report: Optional[ReportOutput] = None
     ranked_issues: List[DocumentIssue] = []
+    revision: Optional[RevisionCarryOver] = None
 
 
 class ChunkReevaluationRequest(BaseModel):
@@ -322,3 +399,26 @@ class ChunkReevaluationResponse(BaseModel):
     processing_time_ms: Optional[float] = Field(
         description="Time taken to process the chunk in milliseconds", default=None
     )
+
+
+class WorkflowRunChunkReevaluationRequest(BaseModel):
+    """Request model for re-evaluating a chunk of a stored workflow run"""
+
+    agents_to_run: List[str] = Field(
+        description="List of agent types to run on the chunk",
+    )
+
+
+class ChunkReevaluationDelta(BaseModel):
+    """Changes of a workflow run after re-evaluating one of its chunks"""
+
+    chunk: DocumentChunk = Field(description="The re-evaluated chunk")
+    errors: List[WorkflowError] = Field(
+        description="Errors of the chunk re-evaluation, replacing the previous errors of the chunk"
+    )
+    agents_run: List[str] = Field(
+        description="List of agents that were successfully run on the chunk"
+    )
+    processing_time_ms: Optional[float] = Field(
+        description="Time taken to process the chunk in milliseconds", default=None
+    )
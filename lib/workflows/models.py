@@ -1,4 +1,4 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -11,3 +11,18 @@ class WorkflowError(BaseModel):
     )
     task_name: str = Field(description="The name of the task that caused the error.")
     error: str = Field(description="The error message.")
+
+
+class ChunkProgress(BaseModel):
+    """Custom stream event reporting how many chunks a node has processed."""
+
+    type: Literal["chunk_progress"] = "chunk_progress"
+    node: Optional[str] = None
+    chunks_done: int
+    chunks_total: int
+    chunk_index: Optional[int] = Field(
+        default=None, description="The chunk that just completed, if any."
+    )
+    error: Optional[str] = Field(
+        default=None, description="The error of the completed chunk, if it failed."
+    )
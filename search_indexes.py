@@ -0,0 +1,33 @@
+"""
+Create the search indexes of the passage store, or rebuild its ANN index.
+
+    uv run python search_indexes.py            # create missing or invalid indexes
+    uv run python search_indexes.py --rebuild  # rebuild the ANN index
+
+Run once documents have been indexed, and after changing RAG_ANN_INDEX. Indexes are
+built concurrently, so the API and workers keep indexing and searching meanwhile,
+with exact searches until the ANN index is ready. Rebuild IVFFlat indexes as the
+corpus grows, since their lists are sized from the passages present at build time.
+"""
+
+import argparse
+import asyncio
+
+from lib.config.logger import setup_logger
+from lib.services.vector_store import get_vector_store_service
+
+
+async def main(rebuild: bool):
+    vector_store = get_vector_store_service()
+    if rebuild:
+        await vector_store.rebuild_ann_index()
+    else:
+        await vector_store.create_search_indexes()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+    setup_logger()
+    asyncio.run(main(args.rebuild))
@@ -0,0 +1,187 @@
+"""CPU cost of the `chunks` reducer on a synthetic document.
+
+Builds a state of `--chunks` chunks with claims, citations, categories and
+substantiations, and replays the updates of the per-chunk nodes through
+`conciliate_chunks`: each node returns a copy of every state chunk with its own
+result, as the graph nodes do. The previous reducer (model_dump of both chunks and
+revalidation of the merged chunk) runs on the same updates for comparison, and both
+must produce the same chunks.
+
+Usage:
+    python -m tests.benchmarks.bench_conciliate_chunks --chunks 1000 --repeat 5
+"""
+
+import argparse
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from lib.agents.citation_detector import Citation, CitationResponse, CitationType
+from lib.agents.claim_categorizer import ClaimCategorizationResponseWithClaimIndex
+from lib.agents.claim_extractor import Claim, ClaimResponse
+from lib.agents.claim_verifier import (
+    ClaimEvidenceSource,
+    ClaimSubstantiationResultWithClaimIndex,
+    EvidenceAlignmentLevel,
+)
+from lib.agents.models import ClaimCategory
+from lib.workflows.claim_substantiation.state import DocumentChunk, conciliate_chunks
+
+CLAIMS_PER_CHUNK = 5
+
+Reducer = Callable[[List[DocumentChunk], List[DocumentChunk]], List[DocumentChunk]]
+
+
+def _conciliate_chunks_model_dump(
+    a: List[DocumentChunk], b: List[DocumentChunk]
+) -> List[DocumentChunk]:
+    """The reducer before merging without model_dump round trips."""
+    chunks_by_index = {chunk.chunk_index: chunk for chunk in a}
+    for updated_chunk in b:
+        if updated_chunk is None:
+            continue
+        existing_chunk = chunks_by_index.get(updated_chunk.chunk_index)
+        if existing_chunk is None:
+            chunks_by_index[updated_chunk.chunk_index] = updated_chunk
+            continue
+        merged_data = existing_chunk.model_dump()
+        for field, updated_value in updated_chunk.model_dump().items():
+            if updated_value is None:
+                continue
+            if isinstance(updated_value, list) and not updated_value:
+                continue
+            merged_data[field] = updated_value
+        chunks_by_index[updated_chunk.chunk_index] = DocumentChunk(**merged_data)
+    return [chunks_by_index[i] for i in sorted(chunks_by_index.keys())]
+
+
+def _claims(chunk_index: int) -> ClaimResponse:
+    return ClaimResponse(
+        claims=[
+            Claim(
+                text=f"Sentence {claim_index} of chunk {chunk_index}.",
+                claim=f"Claim {claim_index} of chunk {chunk_index}",
+                rationale="The sentence states it directly.",
+            )
+            for claim_index in range(CLAIMS_PER_CHUNK)
+        ],
+        rationale="Claims extracted from the chunk.",
+    )
+
+
+def _citations(chunk_index: int) -> CitationResponse:
+    return CitationResponse(
+        citations=[
+            Citation(
+                text=f"[{chunk_index}]",
+                type=list(CitationType)[0],
+                format="[number]",
+                needs_bibliography=True,
+                associated_bibliography=f"Author {chunk_index}. A paper. 2020.",
+                index_of_associated_bibliography=chunk_index,
+                rationale="Numbered citation mark.",
+            )
+        ],
+        rationale="Citations detected in the chunk.",
+    )
+
+
+def _categories(chunk_index: int) -> List[ClaimCategorizationResponseWithClaimIndex]:
+    return [
+        ClaimCategorizationResponseWithClaimIndex(
+            claim=f"Claim {claim_index} of chunk {chunk_index}",
+            claim_category=ClaimCategory("empirical_analytical_results"),
+            rationale="Reports a measured result.",
+            needs_external_verification=True,
+            chunk_index=chunk_index,
+            claim_index=claim_index,
+        )
+        for claim_index in range(CLAIMS_PER_CHUNK)
+    ]
+
+
+def _substantiations(chunk_index: int) -> List[ClaimSubstantiationResultWithClaimIndex]:
+    return [
+        ClaimSubstantiationResultWithClaimIndex(
+            evidence_alignment=EvidenceAlignmentLevel.SUPPORTED,
+            rationale="The cited paper reports the same result.",
+            feedback="No changes needed.",
+            evidence_sources=[
+                ClaimEvidenceSource(
+                    quote=f"Quote supporting claim {claim_index}.",
+                    location="page 3",
+                    reference_file_name=f"reference_{chunk_index}.pdf",
+                )
+            ],
+            chunk_index=chunk_index,
+            claim_index=claim_index,
+        )
+        for claim_index in range(CLAIMS_PER_CHUNK)
+    ]
+
+
+def _node_updates() -> Dict[str, Callable[[DocumentChunk], dict]]:
+    return {
+        "extract_claims": lambda chunk: {"claims": _claims(chunk.chunk_index)},
+        "detect_citations": lambda chunk: {"citations": _citations(chunk.chunk_index)},
+        "categorize_claims": lambda chunk: {
+            "claim_categories": _categories(chunk.chunk_index)
+        },
+        "verify_claims": lambda chunk: {
+            "substantiations": _substantiations(chunk.chunk_index)
+        },
+    }
+
+
+def _replay(reducer: Reducer, chunk_count: int) -> tuple[float, List[DocumentChunk]]:
+    """Apply the node updates in order, returning the reducer time and final chunks."""
+    chunks = [
+        DocumentChunk(
+            content=f"Content of chunk {chunk_index}. " * 20,
+            chunk_index=chunk_index,
+            paragraph_index=chunk_index // 4,
+        )
+        for chunk_index in range(chunk_count)
+    ]
+    elapsed = 0.0
+    for update in _node_updates().values():
+        updated_chunks = [chunk.model_copy(update=update(chunk)) for chunk in chunks]
+        start = perf_counter()
+        chunks = reducer(chunks, updated_chunks)
+        elapsed += perf_counter() - start
+    return elapsed, chunks
+
+
+def run(chunk_count: int, repeat: int) -> None:
+    _, expected = _replay(_conciliate_chunks_model_dump, chunk_count)
+    _, actual = _replay(conciliate_chunks, chunk_count)
+    assert [chunk.model_dump() for chunk in actual] == [
+        chunk.model_dump() for chunk in expected
+    ], "reducers disagree"
+
+    updates = len(_node_updates())
+    results = {}
+    for name, reducer in (
+        ("model_dump + revalidate", _conciliate_chunks_model_dump),
+        ("conciliate_chunks", conciliate_chunks),
+    ):
+        best = min(_replay(reducer, chunk_count)[0] for _ in range(repeat))
+        results[name] = best * 1000 / updates
+        print(f"{name:24} {results[name]:9.2f} ms/update")
+
+    before, after = results.values()
+    print(
+        f"{chunk_count} chunks, {updates} node updates, best of {repeat}: "
+        f"{before / after:.0f}x faster"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.chunks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Per-request cost of building and compiling the workflow graph vs the registry.
+
+Mirrors what the workflow run endpoints do before `aget_state`: either build and
+compile the graph (previous behaviour) or fetch it from the compiled-graph registry
+and bind a checkpointer.
+
+Usage:
+    python -m tests.benchmarks.bench_graph_compile --requests 200
+"""
+
+import argparse
+from time import perf_counter
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from lib.workflows.claim_substantiation.graph import (
+    build_claim_substantiator_graph,
+    get_compiled_graph,
+)
+
+
+def _time_per_request(func, requests: int) -> float:
+    start = perf_counter()
+    for _ in range(requests):
+        func()
+    return (perf_counter() - start) * 1000 / requests
+
+
+def run(requests: int) -> None:
+    checkpointer = InMemorySaver()
+
+    def build_and_compile():
+        build_claim_substantiator_graph().compile(checkpointer=checkpointer)
+
+    def from_registry():
+        get_compiled_graph(checkpointer)
+
+    # Warm up imports and the registry entry
+    build_and_compile()
+    from_registry()
+
+    compile_ms = _time_per_request(build_and_compile, requests)
+    registry_ms = _time_per_request(from_registry, requests)
+
+    print(f"{requests} requests")
+    print(f"build + compile: {compile_ms:8.3f} ms/request")
+    print(f"registry:        {registry_ms:8.3f} ms/request")
+    print(
+        f"saving:          {compile_ms - registry_ms:8.3f} ms/request "
+        f"({compile_ms / registry_ms:.0f}x)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    run(args.requests)
+
+
+if __name__ == "__main__":
+    main()
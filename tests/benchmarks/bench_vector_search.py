@@ -0,0 +1,172 @@
+"""Recall/latency benchmark of exact vs ANN passage search.
+
+Indexes the supporting documents of `tests/data/rag_stress_tests` (real embeddings,
+so OPENAI_API_KEY and DATABASE_URL must be set) and runs the claims of the RAG stress
+test dataset as queries, once with an exact scan and once through the ANN index.
+`--replicas` copies the indexed passages into synthetic collections to grow the
+passage table, since latency differences only show on larger corpora.
+
+Usage:
+    python -m tests.benchmarks.bench_vector_search --replicas 200 --top-k 20
+"""
+
+import argparse
+import asyncio
+import statistics
+from pathlib import Path
+from time import perf_counter
+from typing import List
+
+from sqlalchemy import text
+from xxhash import xxh128
+
+from lib.services.document_indexer import DocumentToIndex, get_document_indexer
+from lib.services.vector_store import get_collection_id, get_vector_store_service
+from tests.datasets.loader import load_dataset
+
+TESTS_DIR = Path(__file__).parent.parent
+CORPUS_DIR = TESTS_DIR / "data" / "rag_stress_tests"
+DATASET_PATH = TESTS_DIR / "datasets" / "rag_stress_tests.yaml"
+REPLICA_PREFIX = "doc_passages_bench_replica_"
+
+
+async def _index_corpus() -> List[str]:
+    documents = []
+    for path in sorted(CORPUS_DIR.glob("*.md")):
+        content = path.read_bytes()
+        documents.append(
+            DocumentToIndex(
+                file_hash=xxh128(content).hexdigest(),
+                file_name=path.name,
+                markdown=content.decode("utf-8"),
+            )
+        )
+
+    report = await get_document_indexer().index_documents(documents)
+    if report.errors:
+        raise RuntimeError(f"Failed to index corpus: {report.errors}")
+    return [get_collection_id(document.file_hash) for document in documents]
+
+
+async def _create_replicas(collection_ids: List[str], replicas: int) -> None:
+    """Copy the corpus passages into `replicas` synthetic collections."""
+    vector_store = get_vector_store_service()
+    async with vector_store.async_engine.begin() as connection:
+        existing = (
+            await connection.execute(
+                text("SELECT count(*) FROM langchain_pg_collection WHERE name LIKE :p"),
+                {"p": f"{REPLICA_PREFIX}%"},
+            )
+        ).scalar_one()
+
+        for replica in range(existing, replicas):
+            replica_uuid = (
+                await connection.execute(
+                    text(
+                        "INSERT INTO langchain_pg_collection (uuid, name, cmetadata) "
+                        "VALUES (gen_random_uuid(), :name, '{}') RETURNING uuid"
+                    ),
+                    {"name": f"{REPLICA_PREFIX}{replica}"},
+                )
+            ).scalar_one()
+            await connection.execute(
+                text(
+                    "INSERT INTO langchain_pg_embedding "
+                    "(id, collection_id, embedding, document, cmetadata) "
+                    "SELECT gen_random_uuid()::text, :uuid, e.embedding, e.document, "
+                    "e.cmetadata "
+                    "FROM langchain_pg_embedding e "
+                    "JOIN langchain_pg_collection c ON c.uuid = e.collection_id "
+                    "WHERE c.name = ANY(:collection_ids)"
+                ),
+                {"uuid": replica_uuid, "collection_ids": collection_ids},
+            )
+
+
+async def _drop_replicas() -> None:
+    vector_store = get_vector_store_service()
+    async with vector_store.async_engine.begin() as connection:
+        # Passages are deleted by the collection foreign key cascade
+        await connection.execute(
+            text("DELETE FROM langchain_pg_collection WHERE name LIKE :p"),
+            {"p": f"{REPLICA_PREFIX}%"},
+        )
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile))]
+
+
+async def run(replicas: int, top_k: int, repeat: int, cleanup: bool) -> None:
+    vector_store = get_vector_store_service()
+    collection_ids = await _index_corpus()
+    await _create_replicas(collection_ids, replicas)
+    await vector_store.create_search_indexes()
+
+    queries = [
+        item.input["claim"]
+        for item in load_dataset(str(DATASET_PATH)).items
+        if item.input.get("claim")
+    ]
+    embeddings = [await vector_store.embed_query(query) for query in queries]
+
+    async with vector_store.async_engine.connect() as connection:
+        row_count = (
+            await connection.execute(
+                text("SELECT count(*) FROM langchain_pg_embedding")
+            )
+        ).scalar_one()
+        ann_available = await vector_store._prepare_ann_search(connection, top_k)
+    print(f"{len(queries)} queries over {row_count} passages, top_k={top_k}")
+    if not ann_available:
+        print("ANN index unavailable (RAG_ANN_INDEX=none or pgvector < 0.8)")
+
+    latencies = {"exact": [], "ann": []}
+    recalls = []
+    for query, embedding in zip(queries, embeddings):
+        results = {}
+        for mode in ("exact", "ann"):
+            for _ in range(repeat):
+                start = perf_counter()
+                passages = (
+                    await vector_store.retrieve_relevant_passages_from_collections(
+                        query,
+                        collection_ids,
+                        top_k=top_k,
+                        query_embedding=embedding,
+                        exact=mode == "exact",
+                    )
+                )
+                latencies[mode].append((perf_counter() - start) * 1000)
+            results[mode] = {(p.source_file, p.chunk_index) for p in passages}
+        if results["exact"]:
+            recalls.append(
+                len(results["exact"] & results["ann"]) / len(results["exact"])
+            )
+
+    for mode, values in latencies.items():
+        print(
+            f"{mode:>5}: p50 {statistics.median(values):7.1f} ms  "
+            f"p95 {_percentile(values, 0.95):7.1f} ms"
+        )
+    print(f"ANN recall@{top_k}: {statistics.mean(recalls):.3f}")
+
+    if cleanup:
+        await _drop_replicas()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=0)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--cleanup", action="store_true", help="Delete replica collections"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.replicas, args.top_k, args.repeat, args.cleanup))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,10 +18,9 @@ from lib.agents.formatting_utils import format_audience_context, format_domain_c
 from lib.agents.reference_extractor import BibliographyItem
 from lib.config.logger import setup_logger
 from lib.models.agent_test_case import AgentTestCase
+from lib.services.document_indexer import DocumentToIndex, get_document_indexer
 from lib.services.file import FileDocument
-from lib.workflows.claim_substantiation.nodes.index_supporting_documents import (
-    index_file_document,
-)
+from lib.services.vector_store import get_file_hash_from_path
 from lib.workflows.claim_substantiation.nodes.verify_claims import (
     format_evidence_explanation,
 )
@@ -76,9 +75,19 @@ async def _build_cases(dataset_file_name: str):
     supporting_docs_set = set()
     for test_case in dataset.items:
         supporting_docs_set.update(test_case.input.get("supporting_documents", []))
+    documents = []
     for supporting_doc in supporting_docs_set:
         file_doc = await create_test_file_document_from_path(supporting_doc)
-        await index_file_document(file_doc)
+        documents.append(
+            DocumentToIndex(
+                file_hash=get_file_hash_from_path(file_doc.file_path),
+                file_name=file_doc.file_name,
+                markdown=file_doc.markdown,
+            )
+        )
+    report = await get_document_indexer().index_documents(documents)
+    if report.errors:
+        raise RuntimeError(f"Failed to index supporting documents: {report.errors}")
 
     for test_case in dataset.items:
         # Load main document
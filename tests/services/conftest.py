@@ -0,0 +1,43 @@
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, Sequence
+
+import pytest
+from sqlalchemy import Table, create_engine, make_url, text
+from sqlmodel import SQLModel
+
+from lib.config.env import config
+
+
+@contextmanager
+def scratch_database(
+    prefix: str, tables: List[Table], extensions: Sequence[str] = ()
+) -> Iterator[str]:
+    """
+    Create a database next to the configured one with the given tables, and drop it
+    on exit. Skips the test when the Postgres server is unreachable.
+    """
+    url = make_url(config.DATABASE_URL)
+    name = f"{prefix}_{uuid.uuid4().hex[:12]}"
+    admin_engine = create_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        with admin_engine.connect() as connection:
+            connection.execute(text(f'CREATE DATABASE "{name}"'))
+    except Exception as e:
+        admin_engine.dispose()
+        pytest.skip(f"Postgres unavailable: {e}")
+
+    try:
+        test_url = url.set(database=name)
+        engine = create_engine(test_url)
+        with engine.begin() as connection:
+            for extension in extensions:
+                connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+        SQLModel.metadata.create_all(engine, tables=tables)
+        engine.dispose()
+
+        yield test_url.render_as_string(hide_password=False)
+    finally:
+        with admin_engine.connect() as connection:
+            connection.execute(text(f'DROP DATABASE "{name}" WITH (FORCE)'))
+        admin_engine.dispose()
@@ -0,0 +1,159 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from lib.config.database import get_async_database_url
+from lib.models.workflow_run import WorkflowRunStatus
+from lib.services import chunk_reevaluation
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    SubstantiationWorkflowConfig,
+)
+from lib.workflows.models import WorkflowError
+from tests.benchmarks.bench_conciliate_chunks import _claims
+from tests.services.conftest import scratch_database
+
+
+class _FakeChunkResultWriter:
+    written = []
+
+    def __init__(self, workflow_run_id: str):
+        self.workflow_run_id = workflow_run_id
+
+    async def write(self, chunks):
+        self.written.extend(chunks)
+
+
+def _state() -> ClaimSubstantiatorState:
+    return ClaimSubstantiatorState(
+        file=FileDocument(
+            file_name="paper.md",
+            file_path="/uploads/paper.md",
+            file_type="text/markdown",
+            markdown="Content.",
+            markdown_token_count=1,
+        ),
+        config=SubstantiationWorkflowConfig(),
+        chunks=[
+            DocumentChunk(
+                content=f"Chunk {index}.",
+                chunk_index=index,
+                paragraph_index=0,
+                claims=_claims(index),
+            )
+            for index in range(3)
+        ],
+        errors=[
+            WorkflowError(chunk_index=0, task_name="extract_claims", error="failed"),
+            WorkflowError(chunk_index=1, task_name="verify_claims", error="timeout"),
+        ],
+    )
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database("test_chunk_reevaluation", []) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def reevaluation(database_url, monkeypatch):
+    """Patches the run lookup and re-evaluation; returns the controls of the latter."""
+    run = SimpleNamespace(
+        id=uuid.uuid4(),
+        langgraph_thread_id="thread",
+        status=WorkflowRunStatus.COMPLETED,
+    )
+    controls = SimpleNamespace(
+        run=run, started=asyncio.Event(), release=None, summaries=[]
+    )
+
+    async def _get_owned_workflow_run(workflow_run_id, user):
+        return run
+
+    async def _reevaluate_checkpointed_chunk(thread_id, chunk_index, agents_to_run):
+        if chunk_index >= 3:
+            raise ValueError(f"Chunk {chunk_index} not found")
+        controls.started.set()
+        if controls.release is not None:
+            await controls.release.wait()
+        return _state()
+
+    async def _save_workflow_run_summary(workflow_run_id, state):
+        controls.summaries.append(workflow_run_id)
+
+    lock_engine = create_async_engine(
+        get_async_database_url(database_url), poolclass=NullPool
+    )
+    _FakeChunkResultWriter.written = []
+    for name, value in (
+        ("lock_engine", lock_engine),
+        ("get_owned_workflow_run", _get_owned_workflow_run),
+        ("reevaluate_checkpointed_chunk", _reevaluate_checkpointed_chunk),
+        ("save_workflow_run_summary", _save_workflow_run_summary),
+        ("ChunkResultWriter", _FakeChunkResultWriter),
+    ):
+        monkeypatch.setattr(chunk_reevaluation, name, value)
+    yield controls
+    await lock_engine.dispose()
+
+
+async def _reevaluate(chunk_index: int = 1):
+    return await chunk_reevaluation.reevaluate_workflow_run_chunk(
+        "run", chunk_index, ["substantiation"], user=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_the_reevaluated_chunk_is_returned_and_written(reevaluation):
+    delta = await _reevaluate(chunk_index=1)
+
+    assert delta.chunk.chunk_index == 1
+    assert [error.error for error in delta.errors] == ["timeout"]
+    assert delta.agents_run == ["substantiation"]
+    assert [chunk.chunk_index for chunk in _FakeChunkResultWriter.written] == [1]
+    assert reevaluation.summaries == [str(reevaluation.run.id)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reevaluation_of_a_run_is_rejected(reevaluation):
+    reevaluation.release = asyncio.Event()
+    first = asyncio.create_task(_reevaluate(chunk_index=1))
+    await reevaluation.started.wait()
+
+    with pytest.raises(HTTPException) as error:
+        await _reevaluate(chunk_index=2)
+    assert error.value.status_code == 409
+
+    reevaluation.release.set()
+    await first
+    # The lock is released with the first re-evaluation
+    assert (await _reevaluate(chunk_index=2)).chunk.chunk_index == 2
+
+
+@pytest.mark.asyncio
+async def test_unfinished_run_is_not_reevaluated(reevaluation):
+    reevaluation.run.status = WorkflowRunStatus.RUNNING
+
+    with pytest.raises(HTTPException) as error:
+        await _reevaluate()
+    assert error.value.status_code == 409
+    assert not reevaluation.started.is_set()
+
+
+@pytest.mark.asyncio
+async def test_missing_chunk_is_not_found(reevaluation):
+    with pytest.raises(HTTPException) as error:
+        await _reevaluate(chunk_index=5)
+    assert error.value.status_code == 404
+
+    # A failed re-evaluation releases the lock
+    assert (await _reevaluate(chunk_index=0)).chunk.chunk_index == 0
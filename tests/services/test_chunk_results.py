@@ -0,0 +1,135 @@
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.config.database import get_async_database_url
+from lib.models.chunk_result import ChunkResult
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun
+from lib.services import chunk_results
+from lib.services.chunk_results import ChunkResultWriter, get_chunk_result_json
+from lib.workflows.claim_substantiation.state import DocumentChunk
+from tests.benchmarks.bench_conciliate_chunks import _claims
+from tests.services.conftest import scratch_database
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_chunk_results",
+        [User.__table__, WorkflowRun.__table__, ChunkResult.__table__],
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def session_maker(database_url, monkeypatch):
+    engine = create_async_engine(get_async_database_url(database_url))
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def _get_async_db():
+        async with session_maker() as db:
+            yield db
+
+    monkeypatch.setattr(chunk_results, "get_async_db", _get_async_db)
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE chunk_results, workflow_runs"))
+
+    yield session_maker
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def workflow_run_id(session_maker) -> str:
+    run = WorkflowRun(id=uuid.uuid4(), langgraph_thread_id="thread", title="doc")
+    async with session_maker() as db:
+        db.add(run)
+        await db.commit()
+    return str(run.id)
+
+
+def _chunks(count: int):
+    return [
+        DocumentChunk(
+            content=f"Chunk {index}.",
+            chunk_index=index,
+            paragraph_index=0,
+            claims=_claims(index),
+        )
+        for index in range(count)
+    ]
+
+
+async def _updated_at(session_maker, workflow_run_id: str):
+    async with session_maker() as db:
+        rows = await db.exec(
+            select(ChunkResult.chunk_index, ChunkResult.updated_at).where(
+                ChunkResult.workflow_run_id == uuid.UUID(workflow_run_id)
+            )
+        )
+        return dict(rows.all())
+
+
+@pytest.mark.asyncio
+async def test_only_changed_chunks_are_written(session_maker, workflow_run_id):
+    writer = ChunkResultWriter(workflow_run_id)
+    chunks = _chunks(3)
+
+    await writer.write(chunks)
+    written = await _updated_at(session_maker, workflow_run_id)
+    assert sorted(written) == [0, 1, 2]
+
+    # Nothing changed: no write
+    await writer.write(_chunks(3))
+    assert await _updated_at(session_maker, workflow_run_id) == written
+
+    chunks[1] = chunks[1].model_copy(update={"claims": _claims(5)})
+    await writer.write(chunks)
+    rewritten = await _updated_at(session_maker, workflow_run_id)
+    assert rewritten[0] == written[0] and rewritten[2] == written[2]
+    assert rewritten[1] > written[1]
+
+    stored = await get_chunk_result_json(workflow_run_id, 1)
+    assert DocumentChunk.model_validate_json(stored) == chunks[1]
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched(session_maker, workflow_run_id, monkeypatch):
+    monkeypatch.setattr(chunk_results, "WRITE_BATCH_SIZE", 2)
+
+    await ChunkResultWriter(workflow_run_id).write(_chunks(5))
+
+    assert sorted(await _updated_at(session_maker, workflow_run_id)) == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_retried(session_maker, workflow_run_id, monkeypatch):
+    writer = ChunkResultWriter(workflow_run_id)
+
+    @asynccontextmanager
+    async def _unavailable_db():
+        raise ConnectionError("database unavailable")
+        yield
+
+    with monkeypatch.context() as patch:
+        patch.setattr(chunk_results, "get_async_db", _unavailable_db)
+        # Logged, not raised: chunk details fall back to the checkpoint
+        await writer.write(_chunks(2))
+
+    await writer.write(_chunks(2))
+
+    assert sorted(await _updated_at(session_maker, workflow_run_id)) == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_unwritten_chunks_are_not_found(session_maker, workflow_run_id):
+    assert await get_chunk_result_json(workflow_run_id, 0) is None
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from lib.services.conversion_cache import ConversionCache, DiskConversionCacheBackend
+
+
+class _FakeConverter:
+    def __init__(self, delay: float = 0.05, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, file_path: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"# Converted {self.calls}"
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF- content")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(
+        DiskConversionCacheBackend(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    )
+
+
+def _stats(cache: ConversionCache):
+    return [(stats.hits, stats.misses) for stats in cache.stats()]
+
+
+@pytest.mark.asyncio
+async def test_converted_files_are_served_from_the_cache(cache, file_path):
+    convert = _FakeConverter()
+
+    first = await cache.aconvert(file_path, "markitdown", {}, convert)
+    second = await cache.aconvert(file_path, "markitdown", {}, convert)
+
+    assert first == second == "# Converted 1"
+    assert convert.calls == 1
+    assert _stats(cache) == [(1, 1)]
+
+    # Other options are another conversion
+    await cache.aconvert(file_path, "markitdown", {"ocr": True}, convert)
+    assert convert.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_conversions_of_a_file_run_once(cache, file_path):
+    convert = _FakeConverter()
+
+    results = await asyncio.gather(
+        *[cache.aconvert(file_path, "markitdown", {}, convert) for _ in range(5)]
+    )
+
+    assert results == ["# Converted 1"] * 5
+    assert convert.calls == 1
+    assert _stats(cache) == [(4, 1)]
+
+
+@pytest.mark.asyncio
+async def test_waiting_conversions_get_the_conversion_error(cache, file_path):
+    convert = _FakeConverter(error=ValueError("Unsupported file"))
+
+    results = await asyncio.gather(
+        *[cache.aconvert(file_path, "markitdown", {}, convert) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert convert.calls == 1
+
+    # Failures are not cached
+    with pytest.raises(ValueError):
+        await cache.aconvert(file_path, "markitdown", {}, convert)
+    assert convert.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_waiting_conversion_takes_over_a_cancelled_one(cache, file_path):
+    convert = _FakeConverter(delay=0.2)
+
+    first = asyncio.create_task(cache.aconvert(file_path, "markitdown", {}, convert))
+    await asyncio.sleep(0.05)
+    second = asyncio.create_task(cache.aconvert(file_path, "markitdown", {}, convert))
+    await asyncio.sleep(0.05)
+    first.cancel()
+
+    assert await second == "# Converted 2"
+    assert first.cancelled()
+    assert convert.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_converts(file_path):
+    cache = ConversionCache()
+    convert = _FakeConverter()
+
+    await cache.aconvert(file_path, "markitdown", {}, convert)
+    await cache.aconvert(file_path, "markitdown", {}, convert)
+
+    assert convert.calls == 2
+    assert cache.stats() == []
@@ -0,0 +1,206 @@
+import asyncio
+from typing import List
+
+import pytest
+import pytest_asyncio
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from lib.config.database import get_async_database_url
+from lib.models.document_index import DocumentIndex
+from lib.services import document_indexer
+from lib.services.document_indexer import DocumentIndexer, DocumentToIndex
+from lib.services.vector_store import VectorStoreService
+from tests.services.conftest import scratch_database
+
+PARAGRAPH = "A sentence about the measured results of the study. " * 30
+
+
+class _FakeEmbeddings(Embeddings):
+    def __init__(self, fail_after: int = None, delay: float = 0.0):
+        self.embedded: List[str] = []
+        self.queries: List[str] = []
+        self.fail_after = fail_after
+        self.delay = delay
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[1.0, float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.queries.append(text)
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.delay)
+        if self.fail_after is not None and len(self.embedded) >= self.fail_after:
+            raise ConnectionError("embedding provider unavailable")
+        self.embedded.extend(texts)
+        return self.embed_documents(texts)
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_document_indexer", [DocumentIndex.__table__], extensions=["vector"]
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def engine(database_url, monkeypatch):
+    # Small batches, so that documents span several of them
+    monkeypatch.setattr(document_indexer, "EMBEDDING_BATCH_SIZE", 2)
+    # A single pooled connection: runs waiting for a document lock must not hold it
+    engine = create_async_engine(
+        get_async_database_url(database_url),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    yield engine
+    async with engine.begin() as connection:
+        await connection.execute(text("DELETE FROM document_index_manifest"))
+        await connection.execute(text("DELETE FROM langchain_pg_collection"))
+    await engine.dispose()
+
+
+def _indexer(engine, embeddings: _FakeEmbeddings) -> DocumentIndexer:
+    vector_store = VectorStoreService(engine)
+    vector_store.embeddings = embeddings
+    vector_store.ann_index = "none"
+    return DocumentIndexer(vector_store)
+
+
+def _document(file_hash: str, file_name: str = None, paragraphs: int = 6):
+    return DocumentToIndex(
+        file_hash=file_hash,
+        file_name=file_name or f"{file_hash}.pdf",
+        markdown="\n\n".join(f"{i}. {PARAGRAPH}" for i in range(paragraphs)),
+    )
+
+
+async def _stored_chunks(engine, file_hash: str) -> List[int]:
+    async with engine.connect() as connection:
+        rows = await connection.execute(
+            text(
+                "SELECT (e.cmetadata->>'chunk_index')::int "
+                "FROM langchain_pg_embedding e "
+                "JOIN langchain_pg_collection c ON c.uuid = e.collection_id "
+                "WHERE c.name = :name"
+            ),
+            {"name": f"doc_passages_{file_hash}"},
+        )
+        return sorted(rows.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_documents_are_indexed_once(engine):
+    embeddings = _FakeEmbeddings()
+    indexer = _indexer(engine, embeddings)
+
+    report = await indexer.index_documents([_document("a"), _document("b")])
+
+    assert report.errors == {}
+    assert report.documents_indexed == 2
+    chunk_count = len(await _stored_chunks(engine, "a"))
+    assert chunk_count > 2
+    assert report.chunks_indexed == 2 * chunk_count
+    manifest = await indexer.vector_store.get_index_manifest("a")
+    assert manifest.is_complete and manifest.chunk_count == chunk_count
+
+    report = await indexer.index_documents([_document("a")])
+
+    assert report.documents_skipped == 1
+    assert len(embeddings.embedded) == 2 * chunk_count
+
+
+@pytest.mark.asyncio
+async def test_interrupted_document_is_resumed(engine):
+    failing = _FakeEmbeddings(fail_after=2)
+
+    report = await _indexer(engine, failing).index_documents([_document("a")])
+
+    assert report.errors["a"].file_name == "a.pdf"
+    assert report.errors["a"].error == "embedding provider unavailable"
+    assert await _stored_chunks(engine, "a") == [0, 1]
+    indexer = _indexer(engine, _FakeEmbeddings())
+    assert not await indexer.vector_store.is_document_indexed("a")
+
+    report = await indexer.index_documents([_document("a")])
+
+    stored = await _stored_chunks(engine, "a")
+    assert stored == list(range(len(stored)))
+    assert report.chunks_resumed == 2
+    assert report.chunks_indexed == len(stored) - 2
+    assert len(indexer.vector_store.embeddings.embedded) == len(stored) - 2
+    assert await indexer.vector_store.is_document_indexed("a")
+
+
+@pytest.mark.asyncio
+async def test_errors_are_reported_per_file(engine):
+    documents = [_document("a", "report.pdf"), _document("b", "report.pdf")]
+
+    report = await _indexer(engine, _FakeEmbeddings(fail_after=0)).index_documents(
+        documents
+    )
+
+    # Same file name, different files: both failures are reported
+    assert sorted(report.errors) == ["a", "b"]
+    assert {error.file_name for error in report.errors.values()} == {"report.pdf"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_index_a_shared_document_once(engine):
+    embeddings = _FakeEmbeddings(delay=0.05)
+    runs = [
+        _indexer(engine, embeddings).index_documents(documents)
+        for documents in (
+            [_document("a"), _document("b")],
+            [_document("b"), _document("a")],
+            [_document("a")],
+        )
+    ]
+
+    # Waiting runs hold no pooled connection, so the run holding the locks can
+    # store its chunks through the engine's single one
+    reports = await asyncio.wait_for(asyncio.gather(*runs), timeout=30)
+
+    assert all(report.errors == {} for report in reports)
+    assert sum(report.documents_indexed for report in reports) == 2
+    chunk_count = len(await _stored_chunks(engine, "a"))
+    assert await _stored_chunks(engine, "b") == list(range(chunk_count))
+    assert len(embeddings.embedded) == 2 * chunk_count
+
+
+@pytest.mark.asyncio
+async def test_collections_are_searched_in_one_query(engine):
+    embeddings = _FakeEmbeddings()
+    indexer = _indexer(engine, embeddings)
+    await indexer.index_documents([_document("a"), _document("b", paragraphs=2)])
+    vector_store = indexer.vector_store
+
+    passages = await vector_store.retrieve_relevant_passages_from_collections(
+        "measured results", ["doc_passages_a", "doc_passages_b"], top_k=3
+    )
+
+    assert embeddings.queries == ["measured results"]
+    # The top-k applies per collection
+    source_files = [passage.source_file for passage in passages]
+    assert source_files.count("a.pdf") == 3
+    assert 0 < source_files.count("b.pdf") <= 3
+    distances = [passage.cosine_distance for passage in passages]
+    assert distances == sorted(distances)
+
+    # A query embedded beforehand is reused
+    query_embedding = await vector_store.embed_query("measured results")
+    reused = await vector_store.retrieve_relevant_passages_from_collections(
+        "measured results",
+        ["doc_passages_a", "doc_passages_b"],
+        top_k=3,
+        query_embedding=query_embedding,
+    )
+    assert len(embeddings.queries) == 2
+    assert [passage.content for passage in reused] == [
+        passage.content for passage in passages
+    ]
@@ -0,0 +1,133 @@
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from lib.services.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    MemoryEmbeddingCacheBackend,
+)
+
+
+class _FakeEmbeddings(Embeddings):
+    def __init__(self, offset: float = 0.0):
+        self.offset = offset
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)) + self.offset, 0.5] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_documents(texts)
+
+
+def _cache(max_entries: int = 100, dtype: str = "float32") -> EmbeddingCache:
+    return EmbeddingCache(MemoryEmbeddingCacheBackend(max_entries, dtype))
+
+
+@pytest.mark.asyncio
+async def test_only_missing_texts_are_embedded():
+    cache = _cache()
+    provider = _FakeEmbeddings()
+
+    first = await cache.aembed_documents(provider, "model", ["a", "bb"])
+    second = await cache.aembed_documents(provider, "model", ["bb", "ccc", "a"])
+
+    assert provider.embedded == ["a", "bb", "ccc"]
+    assert first == [[1.0, 0.5], [2.0, 0.5]]
+    assert second == [[2.0, 0.5], [3.0, 0.5], [1.0, 0.5]]
+    stats = cache.stats()[0]
+    assert (stats.hits, stats.misses) == (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_repeated_texts_are_embedded_once():
+    cache = _cache()
+    provider = _FakeEmbeddings()
+
+    embeddings = await cache.aembed_documents(provider, "model", ["a", "a", "bb", "a"])
+
+    assert provider.embedded == ["a", "bb"]
+    assert embeddings == [[1.0, 0.5], [1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+
+
+@pytest.mark.asyncio
+async def test_entries_are_keyed_by_model():
+    cache = _cache()
+    small, large = _FakeEmbeddings(), _FakeEmbeddings(offset=10.0)
+
+    await cache.aembed_documents(small, "text-embedding-3-small", ["a"])
+    embeddings = await cache.aembed_documents(large, "text-embedding-3-large", ["a"])
+
+    # Switching the embedding model must not serve vectors of the previous one
+    assert large.embedded == ["a"]
+    assert embeddings == [[11.0, 0.5]]
+
+
+@pytest.mark.asyncio
+async def test_changed_text_misses_the_cache():
+    cache = _cache()
+    provider = _FakeEmbeddings()
+
+    await cache.aembed_documents(provider, "model", ["Some passage."])
+    await cache.aembed_documents(provider, "model", ["Some passage!"])
+
+    assert provider.embedded == ["Some passage.", "Some passage!"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted():
+    cache = _cache(max_entries=2)
+    provider = _FakeEmbeddings()
+
+    await cache.aembed_documents(provider, "model", ["a", "bb"])
+    await cache.aembed_documents(provider, "model", ["a"])
+    await cache.aembed_documents(provider, "model", ["ccc"])
+    await cache.aembed_documents(provider, "model", ["a", "bb"])
+
+    assert provider.embedded == ["a", "bb", "ccc", "bb"]
+
+
+@pytest.mark.asyncio
+async def test_float16_vectors_round_trip_approximately():
+    cache = _cache(dtype="float16")
+    provider = _FakeEmbeddings(offset=0.123456)
+
+    fresh = await cache.aembed_documents(provider, "model", ["a"])
+    cached = await cache.aembed_documents(provider, "model", ["a"])
+
+    assert fresh == [[1.123456, 0.5]]
+    assert cached[0] == pytest.approx(fresh[0], rel=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_failing_backend_falls_back_to_the_provider():
+    class _BrokenBackend(MemoryEmbeddingCacheBackend):
+        def get_many(self, model, text_hashes):
+            raise ConnectionError("cache unavailable")
+
+    cache = EmbeddingCache(_BrokenBackend(100, "float32"))
+    provider = _FakeEmbeddings()
+
+    embeddings = await cache.aembed_documents(provider, "model", ["a"])
+
+    assert embeddings == [[1.0, 0.5]]
+    assert cache.stats()[0].errors == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_embeddings_share_query_and_document_entries():
+    cache = _cache()
+    provider = _FakeEmbeddings()
+    embeddings = CachedEmbeddings(provider, "model", cache)
+
+    await embeddings.aembed_documents(["a passage"])
+    query = await embeddings.aembed_query("a passage")
+
+    assert provider.embedded == ["a passage"]
+    assert query == [9.0, 0.5]
@@ -0,0 +1,88 @@
+import pytest
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from lib.services import document_store
+from lib.services.file import FileDocument, create_file_document
+
+MARKDOWN = "# Supporting document\n\n" + "Some content. " * 1000
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_store, "DOCUMENT_STORE_DIR", str(tmp_path))
+    document_store.get_document.cache_clear()
+    yield tmp_path
+    document_store.get_document.cache_clear()
+
+
+async def _file_document() -> FileDocument:
+    return await create_file_document(
+        "/uploads/doc.md", "doc.md", "text/markdown", MARKDOWN
+    )
+
+
+@pytest.mark.asyncio
+async def test_body_is_stored_once_by_content():
+    first = await _file_document()
+    second = await _file_document()
+
+    assert first.markdown_ref == second.markdown_ref
+    assert document_store.get_document(first.markdown_ref) == MARKDOWN
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_only_hold_the_reference():
+    file_document = await _file_document()
+    serializer = JsonPlusSerializer()
+
+    serialized = serializer.dumps_typed(file_document)
+    assert MARKDOWN.encode() not in serialized[1]
+    assert "markdown" not in file_document.model_dump()
+
+    restored = serializer.loads_typed(serialized)
+    assert restored.markdown_ref == file_document.markdown_ref
+    await restored.load_markdown()
+    assert restored.markdown == MARKDOWN
+
+
+@pytest.mark.asyncio
+async def test_json_dumps_include_the_body():
+    file_document = await _file_document()
+
+    dumped = file_document.model_dump(mode="json")
+
+    assert dumped["markdown"] == MARKDOWN
+    assert FileDocument.model_validate(dumped).markdown == MARKDOWN
+
+
+def test_markdown_is_loaded_lazily_from_the_store():
+    markdown_ref = document_store.put_document(MARKDOWN)
+
+    file_document = FileDocument.model_validate(
+        {
+            "file_name": "doc.md",
+            "file_path": "/uploads/doc.md",
+            "file_type": "text/markdown",
+            "markdown_ref": markdown_ref,
+            "markdown_token_count": 10,
+        }
+    )
+
+    assert file_document.markdown == MARKDOWN
+
+
+def test_documents_without_reference_keep_their_inline_markdown():
+    # As in checkpoints written before bodies were stored
+    file_document = FileDocument(
+        file_name="doc.md",
+        file_path="/uploads/doc.md",
+        file_type="text/markdown",
+        markdown=MARKDOWN,
+        markdown_token_count=10,
+    )
+
+    serializer = JsonPlusSerializer()
+    restored = serializer.loads_typed(serializer.dumps_typed(file_document))
+
+    assert restored.markdown_ref is None
+    assert restored.markdown == MARKDOWN
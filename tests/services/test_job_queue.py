@@ -0,0 +1,239 @@
+"""
+Queue semantics of `lib.services.job_queue` against a scratch Postgres database.
+
+Claiming relies on `FOR UPDATE SKIP LOCKED` and on the database clock, so the tests
+run against a database created next to the configured one, and skip when the
+server is unreachable.
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.config.database import get_async_database_url
+from lib.models.analysis_job import AnalysisJob, AnalysisJobStatus
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun
+from lib.services import job_queue
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.state import SubstantiationWorkflowConfig
+from tests.services.conftest import scratch_database
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_job_queue",
+        [User.__table__, WorkflowRun.__table__, AnalysisJob.__table__],
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def session_maker(database_url, monkeypatch):
+    engine = create_async_engine(get_async_database_url(database_url))
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def _get_async_db():
+        async with session_maker() as db:
+            yield db
+
+    monkeypatch.setattr(job_queue, "get_async_db", _get_async_db)
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE analysis_jobs, workflow_runs"))
+
+    yield session_maker
+    await engine.dispose()
+
+
+async def _enqueue(session_maker, **values) -> AnalysisJob:
+    session_id = str(uuid.uuid4())
+    run = WorkflowRun(id=uuid.uuid4(), langgraph_thread_id=session_id, title="doc")
+    async with session_maker() as db:
+        db.add(run)
+        await db.commit()
+
+    job = await job_queue.enqueue_analysis(
+        str(run.id),
+        FileDocument(
+            file_name="doc.md",
+            file_path="/uploads/doc.md",
+            file_type="text/markdown",
+            markdown="# Doc",
+            markdown_token_count=2,
+        ),
+        None,
+        SubstantiationWorkflowConfig(session_id=session_id),
+    )
+    if values:
+        await _set(session_maker, job, **values)
+    return job
+
+
+async def _set(session_maker, job: AnalysisJob, **values) -> None:
+    async with session_maker() as db:
+        await db.exec(
+            update(AnalysisJob).where(AnalysisJob.id == job.id).values(**values)
+        )
+        await db.commit()
+
+
+async def _get(session_maker, job: AnalysisJob) -> AnalysisJob:
+    async with session_maker() as db:
+        return (
+            await db.exec(select(AnalysisJob).where(AnalysisJob.id == job.id))
+        ).one()
+
+
+async def _expire_lease(session_maker, job: AnalysisJob) -> None:
+    await _set(session_maker, job, locked_until=func.now() - timedelta(seconds=1))
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_oldest_job(session_maker):
+    first = await _enqueue(session_maker)
+    second = await _enqueue(session_maker)
+
+    claimed = await job_queue.claim_job("worker-1")
+
+    assert claimed.id == first.id
+    assert claimed.status == AnalysisJobStatus.RUNNING
+    assert claimed.attempts == 1
+    assert claimed.locked_by == "worker-1"
+    assert claimed.locked_until > claimed.started_at
+
+    assert (await job_queue.claim_job("worker-2")).id == second.id
+    assert await job_queue.claim_job("worker-3") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_never_claim_a_job_twice(session_maker):
+    jobs = [await _enqueue(session_maker) for _ in range(5)]
+
+    claimed = await asyncio.gather(
+        *[job_queue.claim_job(f"worker-{i}") for i in range(8)]
+    )
+
+    claimed_ids = [job.id for job in claimed if job is not None]
+    assert sorted(claimed_ids) == sorted(job.id for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_not_claimed_before_they_are_available(session_maker):
+    await _enqueue(session_maker, available_at=func.now() + timedelta(seconds=60))
+
+    assert await job_queue.claim_job("worker-1") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_claimed_again(session_maker):
+    job = await _enqueue(session_maker)
+    claimed = await job_queue.claim_job("worker-1")
+
+    # Leased jobs are not claimable while the lease holds
+    assert await job_queue.claim_job("worker-2") is None
+
+    await _expire_lease(session_maker, job)
+    reclaimed = await job_queue.claim_job("worker-2")
+
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+    assert reclaimed.locked_by == "worker-2"
+    assert reclaimed.started_at == claimed.started_at
+    # The crashed worker lost the job
+    assert not await job_queue.extend_lease(claimed, "worker-1")
+
+
+@pytest.mark.asyncio
+async def test_extend_lease_keeps_the_job(session_maker):
+    job = await _enqueue(session_maker)
+    claimed = await job_queue.claim_job("worker-1")
+    await _set(session_maker, job, locked_until=func.now() + timedelta(seconds=1))
+
+    assert await job_queue.extend_lease(claimed, "worker-1")
+
+    extended = await _get(session_maker, job)
+    assert extended.locked_until > claimed.started_at + timedelta(seconds=1)
+    assert await job_queue.claim_job("worker-2") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_requeued_after_a_delay(session_maker):
+    job = await _enqueue(session_maker)
+    claimed = await job_queue.claim_job("worker-1")
+
+    await job_queue.fail_job(claimed, "provider error")
+
+    requeued = await _get(session_maker, job)
+    assert requeued.status == AnalysisJobStatus.QUEUED
+    assert requeued.last_error == "provider error"
+    assert requeued.locked_by is None
+    assert await job_queue.claim_job("worker-1") is None
+
+    await _set(session_maker, job, available_at=func.now())
+    assert (await job_queue.claim_job("worker-2")).attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_its_last_attempt(session_maker):
+    job = await _enqueue(session_maker, attempts=job_queue.JOB_MAX_ATTEMPTS - 1)
+    claimed = await job_queue.claim_job("worker-1")
+
+    await job_queue.fail_job(claimed, "provider error")
+
+    failed = await _get(session_maker, job)
+    assert failed.status == AnalysisJobStatus.FAILED
+    assert failed.finished_at is not None
+    assert await job_queue.claim_job("worker-2") is None
+
+
+@pytest.mark.asyncio
+async def test_released_job_is_requeued_without_counting_the_attempt(
+    session_maker,
+):
+    job = await _enqueue(session_maker)
+    claimed = await job_queue.claim_job("worker-1")
+
+    await job_queue.release_job(claimed)
+
+    reclaimed = await job_queue.claim_job("worker-2")
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_abandoned_job_on_last_attempt_is_failed(session_maker):
+    job = await _enqueue(session_maker, attempts=job_queue.JOB_MAX_ATTEMPTS - 1)
+    await job_queue.claim_job("worker-1")
+    await _expire_lease(session_maker, job)
+
+    # Not claimable again, its attempts are used up
+    assert await job_queue.claim_job("worker-2") is None
+    assert await job_queue.fail_abandoned_jobs() == 1
+
+    failed = await _get(session_maker, job)
+    assert failed.status == AnalysisJobStatus.FAILED
+    assert failed.last_error == "Lease expired on the last attempt"
+
+
+@pytest.mark.asyncio
+async def test_queue_stats(session_maker):
+    for _ in range(3):
+        await _enqueue(session_maker)
+    await job_queue.claim_job("worker-1")
+
+    stats = await job_queue.get_job_queue_stats()
+
+    assert (stats.queued, stats.running, stats.failed) == (2, 1, 0)
+    assert stats.depth == 3
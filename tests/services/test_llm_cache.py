@@ -0,0 +1,289 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from time import time
+from typing import Optional
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from lib.models.llm_cache_entry import LLMCacheEntry
+from lib.services import llm_cache
+from lib.services.llm_cache import (
+    LAST_ACCESS_RESOLUTION,
+    DiskCacheBackend,
+    LLMCache,
+    PostgresCacheBackend,
+    build_cache_key,
+    get_model_settings,
+)
+from tests.services.conftest import scratch_database
+
+
+class _Answer(BaseModel):
+    answer: str
+
+
+class _OtherAnswer(BaseModel):
+    answer: str
+    confidence: float
+
+
+class _FakeChatModel(BaseChatModel):
+    model_name: str = "gpt-5-mini"
+    temperature: Optional[float] = None
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(content=f'{{"answer": "{self.calls}"}}')
+                )
+            ]
+        )
+
+
+def _structured(model: _FakeChatModel):
+    # Same shape as `with_structured_output`: the chat model followed by a parser
+    return model | RunnableLambda(
+        lambda message: _Answer.model_validate_json(message.content)
+    )
+
+
+def _messages(text: str = "What is the answer?"):
+    return [SystemMessage(content="Answer the question."), HumanMessage(content=text)]
+
+
+@pytest.fixture
+def cache(tmp_path) -> LLMCache:
+    return LLMCache(
+        DiskCacheBackend(str(tmp_path), ttl_seconds=3600, max_bytes=1024 * 1024)
+    )
+
+
+def _key(**overrides) -> str:
+    arguments = {
+        "agent_name": "Claim Extractor",
+        "model": "gpt-5-mini",
+        "temperature": None,
+        "output_schema": _Answer,
+        "messages": _messages(),
+        **overrides,
+    }
+    return build_cache_key(**arguments)
+
+
+def test_cache_key_is_stable():
+    assert _key() == _key()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"agent_name": "Claim Verifier"},
+        {"model": "gpt-5"},
+        {"temperature": 0.2},
+        {"output_schema": _OtherAnswer},
+        {"messages": _messages("What is the question?")},
+    ],
+)
+def test_cache_key_changes_with_every_input(overrides):
+    assert _key(**overrides) != _key()
+
+
+def test_model_settings_are_read_from_the_chat_model():
+    llm = ChatOpenAI(model="gpt-4.1", temperature=0.2, api_key="test")
+
+    assert get_model_settings(llm.with_structured_output(_Answer)) == ("gpt-4.1", 0.2)
+    assert get_model_settings(_structured(_FakeChatModel(temperature=0.5))) == (
+        "gpt-5-mini",
+        0.5,
+    )
+
+
+def test_model_settings_require_a_chat_model():
+    with pytest.raises(TypeError):
+        get_model_settings(RunnableLambda(lambda x: x))
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_served_from_the_cache(cache):
+    model = _FakeChatModel()
+    llm = _structured(model)
+
+    first = await cache.ainvoke(
+        llm, _messages(), agent_name="Test Agent", output_schema=_Answer
+    )
+    second = await cache.ainvoke(
+        llm, _messages(), agent_name="Test Agent", output_schema=_Answer
+    )
+
+    assert first == second == _Answer(answer="1")
+    assert model.calls == 1
+    stats = cache.stats()[0]
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_changed_prompt_or_model_settings_miss_the_cache(cache):
+    model = _FakeChatModel()
+    await cache.ainvoke(
+        _structured(model), _messages(), agent_name="Test Agent", output_schema=_Answer
+    )
+
+    await cache.ainvoke(
+        _structured(model),
+        _messages("What is the question?"),
+        agent_name="Test Agent",
+        output_schema=_Answer,
+    )
+    assert model.calls == 2
+
+    # Changing the agent's model configuration invalidates its entries
+    retuned_model = _FakeChatModel(temperature=0.7)
+    response = await cache.ainvoke(
+        _structured(retuned_model),
+        _messages(),
+        agent_name="Test Agent",
+        output_schema=_Answer,
+    )
+    assert retuned_model.calls == 1
+    assert response == _Answer(answer="1")
+
+
+@pytest.mark.asyncio
+async def test_bypass_refreshes_the_entry(cache):
+    model = _FakeChatModel()
+    llm = _structured(model)
+    await cache.ainvoke(
+        llm, _messages(), agent_name="Test Agent", output_schema=_Answer
+    )
+
+    with cache.bypass():
+        refreshed = await cache.ainvoke(
+            llm, _messages(), agent_name="Test Agent", output_schema=_Answer
+        )
+    cached = await cache.ainvoke(
+        llm, _messages(), agent_name="Test Agent", output_schema=_Answer
+    )
+
+    assert model.calls == 2
+    assert refreshed == cached == _Answer(answer="2")
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_calls_the_model():
+    model = _FakeChatModel()
+    cache = LLMCache()
+
+    for _ in range(2):
+        await cache.ainvoke(
+            _structured(model),
+            _messages(),
+            agent_name="Test Agent",
+            output_schema=_Answer,
+        )
+
+    assert model.calls == 2
+    assert cache.stats() == []
+
+
+def test_disk_entries_expire_after_ttl(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), ttl_seconds=60, max_bytes=1024)
+    key = _key()
+    backend.set(key, "Test Agent", "gpt-5-mini", {"answer": "42"})
+    assert backend.get(key) == {"answer": "42"}
+
+    expired_at = time() - 120
+    os.utime(backend._path(key), (expired_at, expired_at))
+
+    assert backend.get(key) is None
+    assert not backend._path(key).exists()
+
+
+def test_concurrent_disk_writes_of_the_same_key(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), ttl_seconds=60, max_bytes=1024 * 1024)
+    key = _key()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [
+            executor.submit(
+                backend.set, key, "Test Agent", "gpt-5-mini", {"answer": str(i)}
+            )
+            for i in range(50)
+        ]:
+            future.result()
+
+    assert backend.get(key) is not None
+    assert [path.name for path in backend._path(key).parent.iterdir()] == [
+        backend._path(key).name
+    ]
+
+
+@pytest.fixture(scope="module")
+def postgres_url():
+    with scratch_database("test_llm_cache", [LLMCacheEntry.__table__]) as url:
+        yield url
+
+
+@pytest.fixture
+def postgres_backend(postgres_url, monkeypatch):
+    engine = create_engine(postgres_url)
+    session_maker = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def _get_db():
+        db = session_maker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(llm_cache, "get_db", _get_db)
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE llm_cache_entries"))
+
+    yield PostgresCacheBackend(ttl_seconds=3600, max_entries=100)
+    engine.dispose()
+
+
+def _set_last_accessed_at(key: str, last_accessed_at: datetime):
+    with llm_cache.get_db() as db:
+        db.get(LLMCacheEntry, key).last_accessed_at = last_accessed_at
+        db.commit()
+
+
+def _get_last_accessed_at(key: str) -> datetime:
+    with llm_cache.get_db() as db:
+        return db.get(LLMCacheEntry, key).last_accessed_at
+
+
+def test_postgres_hits_only_refresh_stale_access_times(postgres_backend):
+    key = _key()
+    postgres_backend.set(key, "Test Agent", "gpt-5-mini", {"answer": "42"})
+
+    # Recently accessed: a hit doesn't write
+    recent = datetime.now(timezone.utc) - LAST_ACCESS_RESOLUTION / 2
+    _set_last_accessed_at(key, recent)
+    assert postgres_backend.get(key) == {"answer": "42"}
+    assert _get_last_accessed_at(key) == recent
+
+    # Older than the resolution: the hit refreshes the access time
+    stale = datetime.now(timezone.utc) - LAST_ACCESS_RESOLUTION - timedelta(minutes=1)
+    _set_last_accessed_at(key, stale)
+    assert postgres_backend.get(key) == {"answer": "42"}
+    assert _get_last_accessed_at(key) > recent
@@ -0,0 +1,169 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from lib.services.llm_governor import (
+    LLMGovernor,
+    ModelLimiter,
+    ModelLimits,
+    is_rate_limit_error,
+)
+
+
+class _RateLimitError(Exception):
+    def __init__(self, retry_after: str = "0"):
+        super().__init__("Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+async def _call(limiter: ModelLimiter, error: BaseException = None) -> None:
+    await limiter.acquire()
+    await limiter.release(error=error)
+
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error(_RateLimitError())
+    # Clients that only expose the status code on the response
+    assert is_rate_limit_error(
+        SimpleNamespace(response=SimpleNamespace(status_code=429))
+    )
+    assert not is_rate_limit_error(ValueError("bad request"))
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_halves_concurrency_down_to_minimum():
+    limiter = ModelLimiter("gpt-5", ModelLimits(max_concurrency=8, min_concurrency=3))
+
+    await _call(limiter, _RateLimitError())
+    assert limiter.concurrency_limit == 4
+
+    await _call(limiter, _RateLimitError())
+    assert limiter.concurrency_limit == 3
+
+    await _call(limiter, _RateLimitError())
+    stats = limiter.stats()
+    assert stats.concurrency_limit == 3
+    assert stats.rate_limited_count == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_pauses_for_retry_after():
+    limiter = ModelLimiter("gpt-5", ModelLimits(max_concurrency=4))
+
+    await _call(limiter, _RateLimitError(retry_after="0.2"))
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await _call(limiter)
+    assert loop.time() - start >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_other_errors_do_not_back_off():
+    limiter = ModelLimiter("gpt-5", ModelLimits(max_concurrency=4))
+
+    await _call(limiter, ValueError("bad request"))
+
+    assert limiter.concurrency_limit == 4
+    assert limiter.stats().rate_limited_count == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_recovers_after_success_streak():
+    limiter = ModelLimiter("gpt-5", ModelLimits(max_concurrency=4))
+    await _call(limiter, _RateLimitError())
+    assert limiter.concurrency_limit == 2
+
+    # Grows by one after as many successes as the current limit
+    await _call(limiter)
+    assert limiter.concurrency_limit == 2
+    await _call(limiter)
+    assert limiter.concurrency_limit == 3
+
+    for _ in range(3):
+        await _call(limiter)
+    assert limiter.concurrency_limit == 4
+
+    # Never above the configured maximum
+    for _ in range(10):
+        await _call(limiter)
+    assert limiter.concurrency_limit == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_resets_success_streak():
+    limiter = ModelLimiter("gpt-5", ModelLimits(max_concurrency=8))
+    await _call(limiter, _RateLimitError())
+    assert limiter.concurrency_limit == 4
+
+    for _ in range(3):
+        await _call(limiter)
+    await _call(limiter, _RateLimitError())
+    await _call(limiter)
+
+    assert limiter.concurrency_limit == 2
+
+
+@pytest.mark.asyncio
+async def test_in_flight_calls_bounded_by_concurrency_limit():
+    governor = LLMGovernor({"test-model": ModelLimits(max_concurrency=3)})
+    in_flight = 0
+    peak = 0
+
+    async def _task():
+        nonlocal in_flight, peak
+        async with governor.limit("test-model"):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*[_task() for _ in range(12)])
+
+    assert peak == 3
+    stats = governor.get_limiter("test-model").stats()
+    assert stats.total_requests == 12
+    assert stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_releases_and_backs_off_when_the_call_raises():
+    governor = LLMGovernor({"test-model": ModelLimits(max_concurrency=4)})
+
+    with pytest.raises(_RateLimitError):
+        async with governor.limit("test-model"):
+            raise _RateLimitError()
+
+    limiter = governor.get_limiter("test-model")
+    assert limiter.stats().in_flight == 0
+    assert limiter.concurrency_limit == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_budget_delays_calls():
+    limiter = ModelLimiter(
+        "gpt-5", ModelLimits(max_concurrency=10, requests_per_minute=2)
+    )
+    await _call(limiter)
+    await _call(limiter)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(), timeout=0.1)
+    assert limiter.stats().requests_last_minute == 2
+
+
+@pytest.mark.asyncio
+async def test_tokens_per_minute_budget_delays_calls():
+    limiter = ModelLimiter(
+        "gpt-5", ModelLimits(max_concurrency=10, tokens_per_minute=1000)
+    )
+    await limiter.acquire(tokens=800)
+    await limiter.release()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(tokens=300), timeout=0.1)
+
+    # Calls that fit in the remaining budget still go through
+    await asyncio.wait_for(limiter.acquire(tokens=100), timeout=0.1)
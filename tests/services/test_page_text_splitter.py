@@ -0,0 +1,80 @@
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from lib.services.page_text_splitter import PageTextSplitter
+
+
+def _paragraphs(page: int, count: int) -> str:
+    return "\n\n".join(
+        f"Page {page} paragraph {index} " + "lorem ipsum dolor sit amet " * 4
+        for index in range(count)
+    )
+
+
+@pytest.fixture
+def splitter():
+    chunker = RecursiveCharacterTextSplitter(
+        chunk_size=200, chunk_overlap=20, separators=["\n\n", "\n", ". ", " ", ""]
+    )
+    return PageTextSplitter(chunker, window_chunks=4)
+
+
+@pytest.mark.parametrize("page_break", ["\f", "<!-- page-break -->"])
+def test_chunks_carry_their_page_and_offsets(splitter, page_break):
+    text = page_break.join(_paragraphs(page, 20) for page in range(1, 4))
+
+    documents = list(splitter.iter_documents(text, {"file_name": "doc.pdf"}))
+
+    assert [doc.metadata["chunk_index"] for doc in documents] == list(
+        range(len(documents))
+    )
+    for doc in documents:
+        start, end = doc.metadata["start_index"], doc.metadata["end_index"]
+        assert text[start:end] == doc.page_content
+        assert doc.metadata["file_name"] == "doc.pdf"
+        # Chunks never span pages
+        assert page_break not in doc.page_content
+        assert doc.page_content.startswith(f"Page {doc.metadata['page_number']} ")
+    assert {doc.metadata["page_number"] for doc in documents} == {"1", "2", "3"}
+
+
+def test_documents_without_page_breaks_have_no_page_number(splitter):
+    text = _paragraphs(1, 10)
+
+    documents = list(splitter.iter_documents(text))
+
+    assert all(doc.metadata["page_number"] is None for doc in documents)
+    assert all(
+        text[doc.metadata["start_index"] : doc.metadata["end_index"]]
+        == doc.page_content
+        for doc in documents
+    )
+
+
+def test_windows_cover_the_whole_document(splitter):
+    # Many windows of 4 chunks, no content is lost between them
+    text = _paragraphs(1, 100)
+
+    documents = list(splitter.iter_documents(text))
+
+    paragraphs = [f"Page 1 paragraph {index} " for index in range(100)]
+    assert all(any(p in doc.page_content for doc in documents) for p in paragraphs)
+    assert all(len(doc.page_content) <= 200 for doc in documents)
+
+
+def test_chunks_are_yielded_lazily(splitter, monkeypatch):
+    windows = []
+    split_text = splitter.chunker.split_text
+    monkeypatch.setattr(
+        splitter.chunker,
+        "split_text",
+        lambda text: windows.append(text) or split_text(text),
+    )
+    documents = splitter.iter_documents(_paragraphs(1, 1000))
+
+    first = next(documents)
+
+    # Only the first window was split
+    assert len(windows) == 1
+    assert first.metadata["chunk_index"] == 0
+    assert first.metadata["start_index"] == 0
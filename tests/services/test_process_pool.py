@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+
+from lib.services.converters.process_pool import ConversionPool
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def pool():
+    pool = ConversionPool(max_workers=2, timeout_seconds=5)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_is_usable_from_several_event_loops(pool):
+    async def _convert():
+        return await asyncio.gather(*[pool.run(_square, value) for value in range(4)])
+
+    # e.g. a worker process and the tests each run their own loops
+    assert asyncio.run(_convert()) == [0, 1, 4, 9]
+    assert asyncio.run(_convert()) == [0, 1, 4, 9]
+
+
+def test_conversion_timeout_terminates_the_pool(pool):
+    pool.timeout_seconds = 1
+
+    async def _convert():
+        with pytest.raises(TimeoutError):
+            await pool.run(_sleep, 10)
+        # The next conversion runs on a new pool
+        return await pool.run(_square, 3)
+
+    assert asyncio.run(_convert()) == 9
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.config.database import get_async_database_url
+from lib.models.document_index import DocumentIndex
+from lib.services.vector_store import (
+    COLLECTION_INDEX_NAME,
+    EMBEDDING_MODEL,
+    RAG_CHUNK_OVERLAP,
+    RAG_CHUNK_SIZE,
+    VectorStoreService,
+)
+from tests.services.conftest import scratch_database
+
+
+@pytest.fixture
+def database_url():
+    with scratch_database(
+        "test_vector_store", [DocumentIndex.__table__], extensions=["vector"]
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def vector_store(database_url):
+    engine = create_async_engine(get_async_database_url(database_url))
+    vector_store = VectorStoreService(engine)
+    vector_store.ann_index = "none"
+    yield vector_store
+    await engine.dispose()
+
+
+async def _index_validity(vector_store: VectorStoreService):
+    async with vector_store.async_engine.connect() as connection:
+        return await vector_store._is_index_valid(connection, COLLECTION_INDEX_NAME)
+
+
+@pytest.mark.asyncio
+async def test_search_indexes_wait_for_the_passage_table(vector_store):
+    await vector_store.create_search_indexes()
+
+    assert await _index_validity(vector_store) is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_index_is_rebuilt(vector_store):
+    await vector_store._get_vectorstore("doc_passages_a").acreate_collection()
+    await vector_store.create_search_indexes()
+    assert await _index_validity(vector_store) is True
+
+    # As left behind by a failed CREATE INDEX CONCURRENTLY
+    async with vector_store.async_engine.begin() as connection:
+        await connection.execute(
+            text(
+                "UPDATE pg_index SET indisvalid = false "
+                "WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": COLLECTION_INDEX_NAME},
+        )
+    assert await _index_validity(vector_store) is False
+
+    await vector_store.create_search_indexes()
+
+    assert await _index_validity(vector_store) is True
+
+
+async def _add_manifest(vector_store: VectorStoreService, **values) -> None:
+    manifest = DocumentIndex(
+        **{
+            "file_hash": "a",
+            "collection_id": "doc_passages_a",
+            "chunk_count": 3,
+            "embedding_model": EMBEDDING_MODEL,
+            "chunk_size": RAG_CHUNK_SIZE,
+            "chunk_overlap": RAG_CHUNK_OVERLAP,
+            "indexed_at": datetime.now(timezone.utc),
+            "is_complete": True,
+            **values,
+        }
+    )
+    async with AsyncSession(vector_store.async_engine) as session:
+        session.add(manifest)
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_complete_current_index_is_indexed(vector_store):
+    assert not await vector_store.is_document_indexed("a")
+
+    await _add_manifest(vector_store)
+
+    assert await vector_store.is_document_indexed("a")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values",
+    [
+        {"is_complete": False},
+        {"embedding_model": "text-embedding-ada-002"},
+        {"chunk_size": RAG_CHUNK_SIZE * 2},
+        {"chunk_overlap": RAG_CHUNK_OVERLAP + 1},
+    ],
+)
+async def test_partial_or_stale_index_is_not_indexed(vector_store, values):
+    await _add_manifest(vector_store, **values)
+
+    assert not await vector_store.is_document_indexed("a")
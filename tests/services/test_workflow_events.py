@@ -0,0 +1,128 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.config.database import get_async_database_url
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.services import workflow_events
+from lib.services.workflow_events import (
+    MAX_ERROR_LENGTH,
+    WorkflowEventPublisher,
+    WorkflowRunEventType,
+    format_sse,
+    iter_workflow_run_events,
+    workflow_event_listener,
+)
+from tests.services.conftest import scratch_database
+
+
+def test_multiline_data_is_sent_as_several_data_lines():
+    assert format_sse("snapshot", "a\nb", id="3") == (
+        "event: snapshot\nid: 3\ndata: a\ndata: b\n\n"
+    )
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_workflow_events", [User.__table__, WorkflowRun.__table__]
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def session_maker(database_url, monkeypatch):
+    engine = create_async_engine(get_async_database_url(database_url))
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def _get_async_db():
+        async with session_maker() as db:
+            yield db
+
+    monkeypatch.setattr(workflow_events, "get_async_db", _get_async_db)
+    monkeypatch.setattr(workflow_events, "async_engine", engine)
+    monkeypatch.setattr(workflow_events.config, "DATABASE_URL", database_url)
+
+    yield session_maker
+    await workflow_event_listener.close()
+    await engine.dispose()
+
+
+async def _create_run(session_maker, status: WorkflowRunStatus) -> str:
+    session_id = str(uuid.uuid4())
+    async with session_maker() as db:
+        db.add(
+            WorkflowRun(
+                id=uuid.uuid4(),
+                langgraph_thread_id=session_id,
+                title="Paper",
+                status=status,
+            )
+        )
+        await db.commit()
+    return session_id
+
+
+def _parse(message: str):
+    lines = message.strip().split("\n")
+    event = lines[0].removeprefix("event: ")
+    data = "\n".join(
+        line.removeprefix("data: ") for line in lines if line.startswith("data: ")
+    )
+    return event, json.loads(data)
+
+
+@pytest.mark.asyncio
+async def test_events_of_a_run_are_streamed_until_it_completes(session_maker):
+    session_id = await _create_run(session_maker, WorkflowRunStatus.RUNNING)
+    other_session_id = await _create_run(session_maker, WorkflowRunStatus.RUNNING)
+    messages = iter_workflow_run_events(session_id)
+
+    event, snapshot = _parse(await anext(messages))
+    assert event == "snapshot"
+    assert snapshot["status"] == WorkflowRunStatus.RUNNING
+
+    publisher = WorkflowEventPublisher(session_id)
+    await WorkflowEventPublisher(other_session_id).publish(
+        WorkflowRunEventType.NODE_STARTED, node="extract_claims"
+    )
+    await publisher.publish(WorkflowRunEventType.NODE_STARTED, node="extract_claims")
+    await publisher.publish(WorkflowRunEventType.ERROR, error="x" * 10000)
+    await publisher.publish(WorkflowRunEventType.COMPLETED)
+
+    async def _receive():
+        return [_parse(message) async for message in messages]
+
+    received = await asyncio.wait_for(_receive(), timeout=5)
+
+    assert [(event, data["sequence"]) for event, data in received] == [
+        ("node_started", 1),
+        ("error", 2),
+        ("completed", 3),
+    ]
+    assert received[0][1]["session_id"] == session_id
+    assert len(received[1][1]["error"]) == MAX_ERROR_LENGTH
+
+
+@pytest.mark.asyncio
+async def test_finished_runs_only_send_their_snapshot(session_maker):
+    session_id = await _create_run(session_maker, WorkflowRunStatus.COMPLETED)
+
+    messages = [message async for message in iter_workflow_run_events(session_id)]
+
+    assert [_parse(message)[0] for message in messages] == ["snapshot"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_runs_send_nothing(session_maker):
+    assert [message async for message in iter_workflow_run_events("unknown")] == []
@@ -0,0 +1,118 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.config.database import get_async_database_url
+from lib.models.analysis_job import AnalysisJob, AnalysisJobStatus
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.services import workflow_resume
+from tests.services.conftest import scratch_database
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_workflow_resume",
+        [User.__table__, WorkflowRun.__table__, AnalysisJob.__table__],
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def session_maker(database_url, monkeypatch):
+    engine = create_async_engine(get_async_database_url(database_url))
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def _get_async_db():
+        async with session_maker() as db:
+            yield db
+
+    monkeypatch.setattr(workflow_resume, "get_async_db", _get_async_db)
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE analysis_jobs, workflow_runs, users"))
+
+    yield session_maker
+    await engine.dispose()
+
+
+async def _add(session_maker, *rows) -> None:
+    async with session_maker() as db:
+        for row in rows:
+            db.add(row)
+            await db.flush()
+        await db.commit()
+
+
+def _run(user: User, title: str, status: WorkflowRunStatus, age: int) -> WorkflowRun:
+    return WorkflowRun(
+        id=uuid.uuid4(),
+        langgraph_thread_id=title,
+        title=title,
+        user_id=user.id,
+        status=status,
+        created_at=datetime.now(timezone.utc) - timedelta(minutes=age),
+    )
+
+
+@pytest.mark.asyncio
+async def test_unfinished_runs_are_checked_concurrently(session_maker, monkeypatch):
+    user = User(id=uuid.uuid4(), email="user@example.com", name="User")
+    runs = [
+        _run(user, f"failed-{i}", WorkflowRunStatus.FAILED, age=i) for i in range(12)
+    ]
+    queued = _run(user, "queued", WorkflowRunStatus.FAILED, age=20)
+    await _add(
+        session_maker,
+        user,
+        *runs,
+        queued,
+        _run(user, "completed", WorkflowRunStatus.COMPLETED, age=30),
+        AnalysisJob(
+            workflow_run_id=queued.id,
+            session_id="queued",
+            status=AnalysisJobStatus.QUEUED,
+            payload={},
+            max_attempts=3,
+            available_at=datetime.now(timezone.utc),
+            created_at=datetime.now(timezone.utc),
+        ),
+    )
+
+    checked, in_flight, peak = [], 0, 0
+
+    async def _has_unfinished_checkpoint(session_id: str) -> bool:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        checked.append(session_id)
+        if session_id == "failed-3":
+            raise ValueError("corrupt checkpoint")
+        # Runs that finished after all, e.g. a status write that was lost
+        return session_id != "failed-5"
+
+    monkeypatch.setattr(
+        workflow_resume, "has_unfinished_checkpoint", _has_unfinished_checkpoint
+    )
+    monkeypatch.setattr(workflow_resume, "UNFINISHED_RUN_CHECKS_MAX_CONCURRENCY", 4)
+
+    unfinished = await workflow_resume.get_unfinished_workflow_runs(user)
+
+    # Completed runs and runs already queued are filtered out in SQL
+    assert sorted(checked) == sorted(run.title for run in runs)
+    assert peak == 4
+    assert [run.title for run in unfinished] == [
+        f"failed-{i}" for i in range(12) if i not in (3, 5)
+    ]
@@ -0,0 +1,108 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from lib.models.workflow_run import WorkflowRunStatus
+from lib.services import workflow_runs
+from lib.services.workflow_runs import WorkflowRunStatusWriter
+
+
+class _FakeDb:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.updates = []
+
+    async def exec(self, statement):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        params = statement.compile().params
+        self.updates.append(
+            {
+                field: value
+                for field, value in params.items()
+                if field in ("status", "title", "progress")
+            }
+        )
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = _FakeDb()
+
+    @asynccontextmanager
+    async def _get_async_db():
+        yield db
+
+    monkeypatch.setattr(workflow_runs, "get_async_db", _get_async_db)
+    return db
+
+
+def _writer(flush_interval: float = 0.05) -> WorkflowRunStatusWriter:
+    return WorkflowRunStatusWriter(
+        "session", WorkflowRunStatus.RUNNING, "Doc", flush_interval=flush_interval
+    )
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced(db):
+    writer = _writer()
+
+    for chunks_done in range(1, 51):
+        writer.set_chunk_progress("extract_claims", chunks_done, 50)
+    await asyncio.sleep(0.1)
+
+    assert writer.writes == 1
+    progress = db.updates[0]["progress"]
+    assert progress["current_node"] == "extract_claims"
+    assert progress["nodes"]["extract_claims"]["chunks_done"] == 50
+
+
+@pytest.mark.asyncio
+async def test_unchanged_values_are_not_written(db):
+    writer = _writer()
+
+    writer.set_status(WorkflowRunStatus.RUNNING)
+    writer.set_title("Doc")
+    # No node yet
+    writer.set_chunk_progress(None, 1, 10)
+    await asyncio.sleep(0.1)
+
+    assert db.updates == []
+
+    # Changed and changed back before the flush
+    writer.set_title("Other")
+    writer.set_title("Doc")
+    await asyncio.sleep(0.1)
+
+    assert db.updates == []
+
+
+@pytest.mark.asyncio
+async def test_close_writes_pending_changes_at_once(db):
+    writer = _writer(flush_interval=60)
+
+    writer.set_node_completed("extract_claims")
+    await writer.close(WorkflowRunStatus.COMPLETED)
+
+    assert writer.writes == 1
+    assert db.updates[0]["status"] == WorkflowRunStatus.COMPLETED
+    assert db.updates[0]["progress"]["nodes"]["extract_claims"]["completed"]
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_retried(db):
+    writer = _writer(flush_interval=60)
+    writer.set_title("Renamed")
+
+    db.fail = True
+    await writer.flush()
+    assert writer.writes == 0
+
+    db.fail = False
+    await writer.close(WorkflowRunStatus.COMPLETED)
+
+    assert db.updates == [{"status": WorkflowRunStatus.COMPLETED, "title": "Renamed"}]
@@ -0,0 +1,165 @@
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lib.agents.claim_verifier import EvidenceAlignmentLevel
+from lib.config.database import get_async_database_url
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.models.workflow_run_summary import WorkflowRunSummary
+from lib.services import workflow_runs
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.nodes.rank_issues import rank_issues
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    SeverityEnum,
+    SubstantiationWorkflowConfig,
+)
+from tests.benchmarks.bench_conciliate_chunks import _claims, _substantiations
+from tests.services.conftest import scratch_database
+
+
+def _state() -> ClaimSubstantiatorState:
+    substantiations = _substantiations(0)
+    substantiations[1].evidence_alignment = EvidenceAlignmentLevel.UNSUPPORTED
+    substantiations[3].evidence_alignment = EvidenceAlignmentLevel.PARTIALLY_SUPPORTED
+    return ClaimSubstantiatorState(
+        file=FileDocument(
+            file_name="paper.md",
+            file_path="/uploads/paper.md",
+            file_type="text/markdown",
+            markdown="Content.",
+            markdown_token_count=1,
+        ),
+        config=SubstantiationWorkflowConfig(),
+        chunks=[
+            DocumentChunk(
+                content="Chunk 0.",
+                chunk_index=0,
+                paragraph_index=0,
+                claims=_claims(0),
+                substantiations=substantiations,
+            )
+        ],
+    )
+
+
+def test_issues_are_ranked_by_severity():
+    ranked_issues = rank_issues(_state())["ranked_issues"]
+
+    assert [(issue.claim_index, issue.severity) for issue in ranked_issues] == [
+        (1, SeverityEnum.HIGH),
+        (3, SeverityEnum.MEDIUM),
+    ]
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_workflow_run_summary",
+        [User.__table__, WorkflowRun.__table__, WorkflowRunSummary.__table__],
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def session_maker(database_url, monkeypatch):
+    engine = create_async_engine(get_async_database_url(database_url))
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def _get_async_db():
+        async with session_maker() as db:
+            yield db
+
+    monkeypatch.setattr(workflow_runs, "get_async_db", _get_async_db)
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("TRUNCATE workflow_run_summaries, workflow_runs, users CASCADE")
+        )
+
+    yield session_maker
+    await engine.dispose()
+
+
+@pytest.fixture
+def checkpoint_loads(monkeypatch):
+    """Patches loading the state from the checkpoint, recording the loaded runs."""
+    loads = []
+
+    async def _load_full_state(run):
+        loads.append(run.id)
+        full_state = _state()
+        full_state.ranked_issues = rank_issues(full_state)["ranked_issues"]
+        return full_state
+
+    monkeypatch.setattr(workflow_runs, "_load_full_state", _load_full_state)
+    return loads
+
+
+async def _create_run(session_maker, status: WorkflowRunStatus):
+    user = User(id=uuid.uuid4(), email="user@example.com", name="User")
+    run = WorkflowRun(
+        id=uuid.uuid4(),
+        langgraph_thread_id=str(uuid.uuid4()),
+        title="Paper",
+        user_id=user.id,
+        status=status,
+    )
+    async with session_maker() as db:
+        db.add(user)
+        await db.commit()
+        db.add(run)
+        await db.commit()
+    return user, run
+
+
+@pytest.mark.asyncio
+async def test_completed_runs_are_served_from_the_stored_summary(
+    session_maker, checkpoint_loads
+):
+    user, run = await _create_run(session_maker, WorkflowRunStatus.COMPLETED)
+    await workflow_runs.save_workflow_run_summary(str(run.id), _state())
+
+    detailed = json.loads(
+        await workflow_runs.get_workflow_run_detailed(str(run.id), user)
+    )
+
+    assert checkpoint_loads == []
+    assert detailed["run"]["id"] == str(run.id)
+    assert [chunk["chunk_index"] for chunk in detailed["state"]["chunks"]] == [0]
+
+
+@pytest.mark.asyncio
+async def test_summary_of_older_completed_runs_is_materialized_once(
+    session_maker, checkpoint_loads
+):
+    user, run = await _create_run(session_maker, WorkflowRunStatus.COMPLETED)
+
+    first = await workflow_runs.get_workflow_run_detailed(str(run.id), user)
+    second = await workflow_runs.get_workflow_run_detailed(str(run.id), user)
+
+    assert checkpoint_loads == [run.id]
+    assert json.loads(first) == json.loads(second)
+    assert len(json.loads(first)["state"]["ranked_issues"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_running_runs_are_read_from_the_checkpoint(
+    session_maker, checkpoint_loads
+):
+    user, run = await _create_run(session_maker, WorkflowRunStatus.RUNNING)
+
+    await workflow_runs.get_workflow_run_detailed(str(run.id), user)
+    await workflow_runs.get_workflow_run_detailed(str(run.id), user)
+
+    assert checkpoint_loads == [run.id, run.id]
@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from lib.config import database
+from lib.config.database import get_async_database_url
+from lib.models.user import User
+from lib.models.workflow_run import WorkflowRun, WorkflowRunStatus
+from lib.services.users import get_or_create_user_by_email
+from lib.services.workflow_runs import (
+    UpdateWorkflowRunRequest,
+    get_workflow_run_id_by_session,
+    get_workflow_runs,
+    update_workflow_run,
+    upsert_workflow_run,
+)
+from tests.services.conftest import scratch_database
+
+
+def test_async_driver_is_used_for_postgres_urls():
+    assert (
+        get_async_database_url("postgresql://user:pass@db:5432/app")
+        == "postgresql+psycopg://user:pass@db:5432/app"
+    )
+    assert (
+        get_async_database_url("postgresql+psycopg://db/app")
+        == "postgresql+psycopg://db/app"
+    )
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database(
+        "test_workflow_runs", [User.__table__, WorkflowRun.__table__]
+    ) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def async_db(database_url):
+    """Binds the shared async session factory to the scratch database."""
+    engine = create_async_engine(get_async_database_url(database_url))
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE workflow_runs, users CASCADE"))
+    database.AsyncSessionLocal.configure(bind=engine)
+
+    yield
+    database.AsyncSessionLocal.configure(bind=database.async_engine)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_users_are_created_once(async_db):
+    user = await get_or_create_user_by_email("user@example.com", "User")
+    again = await get_or_create_user_by_email("user@example.com", "Other")
+
+    # Readable after their session closed
+    assert again.id == user.id
+    assert again.name == "User"
+
+
+@pytest.mark.asyncio
+async def test_upsert_creates_then_updates_the_run(async_db):
+    user = await get_or_create_user_by_email("user@example.com", "User")
+    session_id = str(uuid.uuid4())
+
+    run_id = await upsert_workflow_run(
+        session_id, WorkflowRunStatus.RUNNING, title="Paper", user=user
+    )
+    assert await upsert_workflow_run(session_id, WorkflowRunStatus.COMPLETED) == run_id
+
+    assert await get_workflow_run_id_by_session(session_id) == run_id
+    [run] = await get_workflow_runs(user)
+    assert (run.title, run.status) == ("Paper", WorkflowRunStatus.COMPLETED)
+
+    updated = await update_workflow_run(
+        run_id, UpdateWorkflowRunRequest(title="Renamed"), user
+    )
+    assert updated.title == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_unknown_sessions_have_no_run(async_db):
+    assert await get_workflow_run_id_by_session(str(uuid.uuid4())) is None
+    assert await upsert_workflow_run("", WorkflowRunStatus.RUNNING) is None
@@ -0,0 +1,86 @@
+import asyncio
+from typing import TypedDict
+
+import pytest
+import pytest_asyncio
+from langgraph.graph import StateGraph
+
+from lib.workflows.claim_substantiation import checkpointer
+from lib.workflows.claim_substantiation.checkpointer import (
+    close_checkpointer_pool,
+    get_checkpointer,
+    get_checkpointer_pool_stats,
+)
+from tests.services.conftest import scratch_database
+
+
+class _CounterState(TypedDict):
+    count: int
+
+
+def _counter_graph():
+    graph = StateGraph(_CounterState)
+    graph.add_node("increment", lambda state: {"count": state["count"] + 1})
+    graph.set_entry_point("increment")
+    graph.set_finish_point("increment")
+    return graph
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    with scratch_database("test_checkpointer", []) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def checkpointer_pool(database_url, monkeypatch):
+    monkeypatch.setattr(checkpointer.config, "DATABASE_URL", database_url)
+    monkeypatch.setattr(checkpointer, "CHECKPOINTER_POOL_MIN_SIZE", 1)
+    monkeypatch.setattr(checkpointer, "CHECKPOINTER_POOL_MAX_SIZE", 2)
+    monkeypatch.setattr(
+        checkpointer, "_checkpointer_pool", checkpointer._CheckpointerPool()
+    )
+    yield
+    await close_checkpointer_pool()
+
+
+@pytest.mark.asyncio
+async def test_savers_share_one_pool(checkpointer_pool):
+    assert get_checkpointer_pool_stats() is None
+
+    async def _get_saver():
+        async with get_checkpointer() as saver:
+            return saver
+
+    savers = await asyncio.gather(*[_get_saver() for _ in range(5)])
+
+    # One saver per caller, all on the same pool
+    assert len({id(saver) for saver in savers}) == 5
+    assert len({id(saver.conn) for saver in savers}) == 1
+    stats = get_checkpointer_pool_stats()
+    assert (stats.pool_min, stats.pool_max) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_read_back_by_other_savers(checkpointer_pool):
+    config = {"configurable": {"thread_id": "thread"}}
+
+    async with get_checkpointer() as saver:
+        await _counter_graph().compile(checkpointer=saver).ainvoke({"count": 1}, config)
+
+    async with get_checkpointer() as saver:
+        state = await _counter_graph().compile(checkpointer=saver).aget_state(config)
+
+    assert state.values == {"count": 2}
+
+
+@pytest.mark.asyncio
+async def test_closed_pool_is_reopened(checkpointer_pool):
+    async with get_checkpointer():
+        pass
+    await close_checkpointer_pool()
+    assert get_checkpointer_pool_stats() is None
+
+    async with get_checkpointer() as saver:
+        assert await saver.aget_tuple({"configurable": {"thread_id": "none"}}) is None
+    assert get_checkpointer_pool_stats() is not None
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from lib.services.file import FileDocument
+from lib.workflows.chunk_iterator import iterate_claims
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    SubstantiationWorkflowConfig,
+)
+from tests.benchmarks.bench_conciliate_chunks import CLAIMS_PER_CHUNK, _claims
+
+
+def _state(parallelize_claims: bool) -> ClaimSubstantiatorState:
+    return ClaimSubstantiatorState(
+        file=FileDocument(
+            file_name="paper.md",
+            file_path="/uploads/paper.md",
+            file_type="text/markdown",
+            markdown="Content.",
+            markdown_token_count=1,
+        ),
+        config=SubstantiationWorkflowConfig(parallelize_claims=parallelize_claims),
+        chunks=[
+            DocumentChunk(
+                content="Chunk 0.",
+                chunk_index=0,
+                paragraph_index=0,
+                claims=_claims(0),
+            )
+        ],
+    )
+
+
+class _FakeClaimTask:
+    """Records how many claims run at once; later claims finish first."""
+
+    def __init__(self, fail_index: int = None):
+        self.fail_index = fail_index
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = 0
+
+    async def __call__(self, claim_index: int, claim):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01 * (CLAIMS_PER_CHUNK - claim_index))
+            if claim_index == self.fail_index:
+                raise ValueError(f"Claim {claim_index} failed")
+            # Claims without a result are skipped
+            return None if claim_index == 2 else claim_index
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parallelize_claims", [False, True])
+async def test_results_are_in_claim_order(parallelize_claims):
+    state = _state(parallelize_claims)
+    task = _FakeClaimTask()
+
+    results = await iterate_claims(state, state.chunks[0], task)
+
+    assert results == [0, 1, 3, 4]
+    assert task.max_running == (CLAIMS_PER_CHUNK if parallelize_claims else 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_claim_cancels_the_other_claims():
+    state = _state(parallelize_claims=True)
+    task = _FakeClaimTask(fail_index=CLAIMS_PER_CHUNK - 1)
+
+    with pytest.raises(ValueError, match="failed"):
+        await iterate_claims(state, state.chunks[0], task)
+
+    # The last claim fails first, while the others are still running
+    await asyncio.sleep(0)
+    assert task.cancelled == CLAIMS_PER_CHUNK - 1
+    assert task.running == 0
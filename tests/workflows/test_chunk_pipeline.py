@@ -0,0 +1,144 @@
+import pytest
+
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation import chunk_pipeline
+from lib.workflows.claim_substantiation.chunk_pipeline import _ChunkPipelineRun
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    SubstantiationWorkflowConfig,
+    conciliate_chunks,
+)
+from tests.benchmarks.bench_conciliate_chunks import (
+    _categories,
+    _claims,
+    _substantiations,
+)
+
+
+def _state(*chunks: DocumentChunk, **config) -> ClaimSubstantiatorState:
+    return ClaimSubstantiatorState(
+        file=FileDocument(
+            file_name="paper.md",
+            file_path="/uploads/paper.md",
+            file_type="text/markdown",
+            markdown="Content.",
+            markdown_token_count=1,
+        ),
+        config=SubstantiationWorkflowConfig(**config),
+        chunks=list(chunks),
+    )
+
+
+def _chunk(chunk_index: int = 0, **results) -> DocumentChunk:
+    return DocumentChunk(
+        content=f"Content of chunk {chunk_index}.",
+        chunk_index=chunk_index,
+        paragraph_index=0,
+        **results,
+    )
+
+
+def _stage(**update):
+    async def _extract_chunk_claims(state, chunk):
+        return chunk.model_copy(update=update)
+
+    return _extract_chunk_claims
+
+
+@pytest.mark.asyncio
+async def test_stage_result_is_merged_like_conciliate_chunks():
+    chunk = _chunk(claims=_claims(0))
+    run = _ChunkPipelineRun(_state(chunk))
+    stage = _stage(claim_categories=_categories(0))
+
+    await run.run_stage(stage, 0, "claim_categories")
+
+    [expected] = conciliate_chunks([chunk], [await stage(None, chunk)])
+    assert run.chunks[0].model_dump() == expected.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_empty_stage_result_does_not_overwrite():
+    run = _ChunkPipelineRun(_state(_chunk(claim_categories=_categories(0))))
+
+    await run.run_stage(_stage(claim_categories=[]), 0, "claim_categories")
+
+    assert run.chunks[0].claim_categories == _categories(0)
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_is_recorded_as_chunk_error():
+    chunk = _chunk(claims=_claims(0))
+    run = _ChunkPipelineRun(_state(chunk))
+
+    async def _extract_chunk_claims(state, chunk):
+        raise ValueError("bad response")
+
+    await run.run_stage(_extract_chunk_claims, 0, "claims")
+
+    assert run.chunks[0] is chunk
+    [error] = run.errors
+    assert (error.chunk_index, error.task_name, error.error) == (
+        0,
+        "_extract_chunk_claims",
+        "bad response",
+    )
+
+
+@pytest.mark.asyncio
+async def test_journaled_stage_result_is_not_recomputed():
+    run = _ChunkPipelineRun(_state(_chunk()))
+    run.committed[("_extract_chunk_claims", 0)] = _chunk(claims=_claims(0))
+
+    async def _extract_chunk_claims(state, chunk):
+        raise AssertionError("stage already done")
+
+    await run.run_stage(_extract_chunk_claims, 0, "claims")
+
+    assert run.chunks[0].claims == _claims(0)
+    assert run.errors == []
+
+
+@pytest.mark.asyncio
+async def test_failed_document_stages_keep_the_chunk_results(monkeypatch):
+    async def extract_references(state):
+        raise ConnectionError("provider unavailable")
+
+    async def index_supporting_documents(state):
+        raise TimeoutError("QueuePool limit reached")
+
+    async def _unchanged(state, chunk):
+        return chunk
+
+    for name in (
+        "_categorize_chunk_claims",
+        "_validate_chunk_inferences",
+        "_detect_chunk_citations",
+    ):
+        monkeypatch.setattr(chunk_pipeline, name, _unchanged)
+    monkeypatch.setattr(chunk_pipeline, "extract_references", extract_references)
+    monkeypatch.setattr(
+        chunk_pipeline, "index_supporting_documents", index_supporting_documents
+    )
+    monkeypatch.setattr(
+        chunk_pipeline,
+        "_extract_chunk_claims",
+        _stage(claims=_claims(0)),
+    )
+    monkeypatch.setattr(
+        chunk_pipeline,
+        "_verify_chunk_claims_rag",
+        _stage(substantiations=_substantiations(0)),
+    )
+
+    update = await chunk_pipeline.run_chunk_pipeline(_state(_chunk(), use_rag=True))
+
+    [chunk] = update["chunks"]
+    assert chunk.claims == _claims(0)
+    # Verification still ran, on whatever passages were indexed
+    assert chunk.substantiations == _substantiations(0)
+    assert {(error.task_name, error.error) for error in update["errors"]} == {
+        ("extract_references", "provider unavailable"),
+        ("index_supporting_documents", "QueuePool limit reached"),
+    }
@@ -0,0 +1,168 @@
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.graph import get_compiled_graph
+from lib.workflows.claim_substantiation.state import (
+    ChunkErrorsReplacement,
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    SubstantiationWorkflowConfig,
+    conciliate_chunks,
+    conciliate_errors,
+)
+from lib.workflows.models import WorkflowError
+from tests.benchmarks.bench_conciliate_chunks import (
+    _categories,
+    _citations,
+    _claims,
+    _conciliate_chunks_model_dump,
+    _replay,
+    _substantiations,
+)
+
+
+def _chunk(chunk_index: int, **results) -> DocumentChunk:
+    return DocumentChunk(
+        content=f"Content of chunk {chunk_index}.",
+        chunk_index=chunk_index,
+        paragraph_index=chunk_index,
+        **results,
+    )
+
+
+def _dump(chunks):
+    return [chunk.model_dump() for chunk in chunks]
+
+
+def _both(a, b):
+    """Merge with the current and the previous reducer, which must agree."""
+    merged = conciliate_chunks(a, b)
+    assert _dump(merged) == _dump(_conciliate_chunks_model_dump(a, b))
+    return merged
+
+
+def test_node_updates_merge_like_the_model_dump_reducer():
+    _, expected = _replay(_conciliate_chunks_model_dump, 20)
+    _, actual = _replay(conciliate_chunks, 20)
+
+    assert _dump(actual) == _dump(expected)
+
+
+def test_results_are_merged_into_existing_chunks():
+    existing = _chunk(0, claims=_claims(0))
+    update = existing.model_copy(update={"citations": _citations(0)})
+
+    [merged] = _both([existing], [update])
+
+    assert merged.claims == _claims(0)
+    assert merged.citations == _citations(0)
+
+
+def test_none_and_empty_results_do_not_overwrite():
+    existing = _chunk(0, claims=_claims(0), substantiations=_substantiations(0))
+    update = _chunk(0, claims=None, substantiations=[])
+
+    [merged] = _both([existing], [update])
+
+    assert merged.claims == _claims(0)
+    assert merged.substantiations == _substantiations(0)
+
+
+def test_non_empty_results_replace_previous_ones():
+    existing = _chunk(0, claim_categories=_categories(0))
+    update = _chunk(0, claim_categories=_categories(0)[:1])
+
+    [merged] = _both([existing], [update])
+
+    assert merged.claim_categories == _categories(0)[:1]
+
+
+def test_failed_chunks_are_skipped():
+    existing = [_chunk(0, claims=_claims(0))]
+
+    assert _dump(_both(existing, [None])) == _dump(existing)
+
+
+def test_new_chunks_are_added_in_index_order():
+    existing = [_chunk(1), _chunk(3)]
+
+    merged = _both(existing, [_chunk(2), _chunk(0, claims=_claims(0))])
+
+    assert [chunk.chunk_index for chunk in merged] == [0, 1, 2, 3]
+    assert merged[0].claims == _claims(0)
+
+
+def test_untouched_chunks_and_results_are_shared():
+    existing = [_chunk(0, claims=_claims(0)), _chunk(1)]
+    update = existing[0].model_copy(update={"citations": _citations(0)})
+
+    merged = conciliate_chunks(existing, [update])
+
+    # No copies of chunks or results the update leaves untouched
+    assert merged[0].claims is existing[0].claims
+    assert merged[1] is existing[1]
+
+
+def test_errors_are_appended():
+    first = WorkflowError(chunk_index=0, task_name="extract_claims", error="failed")
+    second = WorkflowError(chunk_index=1, task_name="verify_claims", error="failed")
+
+    assert conciliate_errors([first], [second]) == [first, second]
+
+
+def test_errors_of_a_chunk_are_replaced():
+    errors = [
+        WorkflowError(chunk_index=0, task_name="extract_claims", error="failed"),
+        WorkflowError(chunk_index=1, task_name="extract_claims", error="failed"),
+        WorkflowError(chunk_index=1, task_name="verify_claims", error="failed"),
+    ]
+    retry_error = WorkflowError(chunk_index=1, task_name="verify_claims", error="again")
+
+    assert conciliate_errors(
+        errors, ChunkErrorsReplacement(chunk_index=1, errors=[retry_error])
+    ) == [errors[0], retry_error]
+    # Re-evaluating without errors clears the chunk's errors
+    assert (
+        conciliate_errors(errors, ChunkErrorsReplacement(chunk_index=0)) == errors[1:]
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunk_delta_goes_through_the_checkpointed_reducers():
+    # As the update of a re-evaluated chunk written by the runner
+    app = get_compiled_graph(InMemorySaver())
+    thread_config = {"configurable": {"thread_id": "thread"}}
+    chunks = [_chunk(0, claims=_claims(0)), _chunk(1, claims=_claims(1))]
+    errors = [
+        WorkflowError(chunk_index=0, task_name="verify_claims", error="timeout"),
+        WorkflowError(chunk_index=1, task_name="verify_claims", error="timeout"),
+    ]
+    state = ClaimSubstantiatorState(
+        file=FileDocument(
+            file_name="paper.md",
+            file_path="/uploads/paper.md",
+            file_type="text/markdown",
+            markdown="Content.",
+            markdown_token_count=1,
+        ),
+        config=SubstantiationWorkflowConfig(),
+        chunks=chunks,
+        errors=errors,
+    )
+    await app.aupdate_state(thread_config, state, as_node="rank_issues")
+
+    reevaluated = _chunk(1, claims=_claims(1), substantiations=_substantiations(1))
+    await app.aupdate_state(
+        thread_config,
+        {
+            "chunks": [reevaluated],
+            "errors": ChunkErrorsReplacement(chunk_index=1),
+        },
+        as_node="rank_issues",
+    )
+
+    snapshot = await app.aget_state(thread_config)
+    assert snapshot.next == ()
+    assert _dump(snapshot.values["chunks"]) == _dump([chunks[0], reevaluated])
+    assert snapshot.values["errors"] == errors[:1]
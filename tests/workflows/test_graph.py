@@ -0,0 +1,36 @@
+from langgraph.checkpoint.memory import InMemorySaver
+
+from lib.workflows.claim_substantiation.graph import (
+    _compile_graph,
+    build_claim_substantiator_graph,
+    get_compiled_graph,
+)
+
+
+def test_graphs_are_compiled_once_per_flags():
+    _compile_graph.cache_clear()
+    first_checkpointer, second_checkpointer = InMemorySaver(), InMemorySaver()
+
+    first = get_compiled_graph(first_checkpointer)
+    second = get_compiled_graph(second_checkpointer)
+
+    assert _compile_graph.cache_info().misses == 1
+    assert first.checkpointer is first_checkpointer
+    assert second.checkpointer is second_checkpointer
+    # Bound copies share the compiled nodes
+    assert all(first.nodes[name] is second.nodes[name] for name in first.nodes)
+
+
+def test_flags_select_the_compiled_graph():
+    checkpointer = InMemorySaver()
+
+    for flags in [
+        {},
+        {"run_live_reports": True},
+        {"run_literature_review": False, "run_suggest_citations": False},
+        {"use_chunk_pipeline": True},
+    ]:
+        compiled = get_compiled_graph(checkpointer, **flags)
+        built = build_claim_substantiator_graph(**flags).compile()
+
+        assert set(compiled.nodes) == set(built.nodes)
@@ -0,0 +1,44 @@
+import pytest
+
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.nodes import index_supporting_documents
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    SubstantiationWorkflowConfig,
+)
+
+
+class _FailingIndexer:
+    async def index_documents(self, documents):
+        raise TimeoutError("QueuePool limit reached")
+
+
+def _file(name: str, file_hash: str) -> FileDocument:
+    return FileDocument(
+        file_name=name,
+        file_path=f"/uploads/{file_hash}",
+        file_type="text/markdown",
+        markdown=f"Content of {name}.",
+        markdown_token_count=3,
+    )
+
+
+def _state() -> ClaimSubstantiatorState:
+    return ClaimSubstantiatorState(
+        file=_file("paper.md", "main"),
+        supporting_files=[_file("smith.md", "hash-1")],
+        config=SubstantiationWorkflowConfig(use_rag=True),
+    )
+
+
+@pytest.mark.asyncio
+async def test_indexing_failure_is_reported_as_workflow_error(monkeypatch):
+    monkeypatch.setattr(
+        index_supporting_documents, "get_document_indexer", lambda: _FailingIndexer()
+    )
+
+    update = await index_supporting_documents.index_supporting_documents(_state())
+
+    [error] = update["errors"]
+    assert error.task_name == "index_supporting_documents"
+    assert error.error == "QueuePool limit reached"
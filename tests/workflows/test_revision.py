@@ -0,0 +1,172 @@
+from typing import List, Optional, Tuple
+
+from lib.agents.reference_extractor import BibliographyItem
+from lib.services.file import FileDocument
+from lib.workflows.claim_substantiation.revision import align_revision
+from lib.workflows.claim_substantiation.state import (
+    ClaimSubstantiatorState,
+    DocumentChunk,
+    SubstantiationWorkflowConfig,
+)
+from tests.benchmarks.bench_conciliate_chunks import (
+    CLAIMS_PER_CHUNK,
+    _claims,
+    _substantiations,
+)
+
+BIBLIOGRAPHY = ["[1] Smith. A paper. 2020.", "[2] Doe. Another paper. 2021."]
+
+# Claim extraction plus one verification per claim
+LLM_CALLS_PER_CHUNK = 1 + CLAIMS_PER_CHUNK
+
+
+def _file(name: str, markdown: str) -> FileDocument:
+    return FileDocument(
+        file_name=name,
+        file_path=f"/uploads/{name}",
+        file_type="text/markdown",
+        markdown=markdown,
+        markdown_token_count=len(markdown.split()),
+    )
+
+
+def _chunks(paragraphs: List[Tuple[int, str]]) -> List[DocumentChunk]:
+    return [
+        DocumentChunk(content=content, chunk_index=index, paragraph_index=paragraph)
+        for index, (paragraph, content) in enumerate(paragraphs)
+    ]
+
+
+def _state(
+    paragraphs: List[Tuple[int, str]],
+    bibliography: List[str] = BIBLIOGRAPHY,
+    supporting_files: Optional[List[FileDocument]] = None,
+    **config,
+) -> ClaimSubstantiatorState:
+    markdown = "\n\n".join(content for _, content in paragraphs)
+    markdown += "\n\n## References\n\n" + "\n\n".join(bibliography)
+    return ClaimSubstantiatorState(
+        file=_file("paper.md", markdown),
+        supporting_files=supporting_files,
+        config=SubstantiationWorkflowConfig(
+            previous_workflow_run_id="previous-run", **config
+        ),
+    )
+
+
+def _analyzed(paragraphs: List[Tuple[int, str]], **kwargs) -> ClaimSubstantiatorState:
+    """State of a finished run, with the results of every chunk."""
+    state = _state(paragraphs, **kwargs)
+    state.chunks = [
+        chunk.model_copy(
+            update={
+                "claims": _claims(chunk.chunk_index),
+                "substantiations": _substantiations(chunk.chunk_index),
+            }
+        )
+        for chunk in _chunks(paragraphs)
+    ]
+    state.references = [
+        BibliographyItem(
+            text=text,
+            has_associated_supporting_document=False,
+            index_of_associated_supporting_document=-1,
+            name_of_associated_supporting_document="",
+        )
+        for text in BIBLIOGRAPHY
+    ]
+    return state
+
+
+PREVIOUS = [(0, "Intro."), (1, "First claim."), (1, "Second claim."), (2, "End.")]
+
+
+def _align(previous: ClaimSubstantiatorState, paragraphs, **kwargs) -> dict:
+    return align_revision(previous, _state(paragraphs, **kwargs), _chunks(paragraphs))
+
+
+def test_unchanged_chunks_are_carried_over_to_their_new_position():
+    previous = _analyzed(PREVIOUS)
+    revised = [
+        (0, "Intro."),
+        (1, "A new paragraph."),
+        *[(p + 1, c) for p, c in PREVIOUS[1:]],
+    ]
+
+    update = _align(previous, revised)
+
+    revision = update["revision"]
+    assert revision.reused_chunk_indices == [0, 2, 3, 4]
+    assert revision.changed_chunk_indices == [1]
+    assert revision.references_reused
+    # Chunk results and the reference extraction
+    assert revision.llm_calls_saved == 4 * LLM_CALLS_PER_CHUNK + 1
+    assert update["references"] == previous.references
+
+    chunks = update["chunks"]
+    assert chunks[1].claims is None
+    moved = chunks[2]
+    assert (moved.chunk_index, moved.paragraph_index) == (2, 2)
+    assert moved.claims == previous.chunks[1].claims
+    assert [result.chunk_index for result in moved.substantiations] == [
+        2
+    ] * CLAIMS_PER_CHUNK
+    # The previous state is left untouched
+    assert previous.chunks[1].substantiations[0].chunk_index == 1
+
+
+def test_chunks_of_an_edited_paragraph_are_reanalyzed():
+    previous = _analyzed(PREVIOUS)
+    revised = [
+        (0, "Intro."),
+        (1, "First claim."),
+        (1, "Second claim, edited."),
+        (2, "End."),
+    ]
+
+    revision = _align(previous, revised)["revision"]
+
+    # The unchanged chunk's context changed with its paragraph
+    assert revision.reused_chunk_indices == [0, 3]
+    assert revision.changed_chunk_indices == [1, 2]
+
+
+def _assert_nothing_reused(update: dict, paragraphs) -> None:
+    assert update["revision"].reused_chunk_indices == []
+    assert update["revision"].changed_chunk_indices == list(range(len(paragraphs)))
+    assert not update["revision"].references_reused
+    assert "references" not in update
+    assert all(chunk.claims is None for chunk in update["chunks"])
+
+
+def test_different_configuration_falls_back_to_a_full_run():
+    update = _align(_analyzed(PREVIOUS), PREVIOUS, use_toulmin=True)
+
+    _assert_nothing_reused(update, PREVIOUS)
+
+
+def test_edited_bibliography_falls_back_to_a_full_run():
+    bibliography = [BIBLIOGRAPHY[0], "[2] Doe. A different paper. 2022."]
+
+    update = _align(_analyzed(PREVIOUS), PREVIOUS, bibliography=bibliography)
+
+    _assert_nothing_reused(update, PREVIOUS)
+
+
+def test_changed_supporting_files_fall_back_to_a_full_run():
+    previous = _analyzed(PREVIOUS, supporting_files=[_file("smith.md", "Results.")])
+
+    update = _align(
+        previous, PREVIOUS, supporting_files=[_file("smith.md", "Other results.")]
+    )
+
+    _assert_nothing_reused(update, PREVIOUS)
+
+
+def test_previous_run_without_references_falls_back_to_a_full_run():
+    previous = _analyzed(PREVIOUS)
+    previous.references = []
+
+    update = _align(previous, PREVIOUS)
+
+    _assert_nothing_reused(update, PREVIOUS)
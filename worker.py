@@ -0,0 +1,39 @@
+"""
+Standalone analysis worker: claims queued analysis jobs and runs them.
+
+    uv run python worker.py
+
+Concurrency is set by ANALYSIS_WORKER_CONCURRENCY. On SIGTERM/SIGINT running analyses
+are handed back to the queue and resumed from their last checkpoint by another worker.
+"""
+
+import asyncio
+import signal
+
+from lib.config.logger import setup_logger
+from lib.services.analysis_worker import AnalysisWorker
+from lib.services.converters.process_pool import conversion_pool
+from lib.workflows.claim_substantiation.checkpointer import (
+    close_checkpointer_pool,
+    open_checkpointer_pool,
+)
+
+
+async def main():
+    await open_checkpointer_pool()
+    worker = AnalysisWorker()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await close_checkpointer_pool()
+        conversion_pool.shutdown()
+
+
+if __name__ == "__main__":
+    setup_logger()
+    asyncio.run(main())